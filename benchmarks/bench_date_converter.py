@@ -0,0 +1,64 @@
+"""
+Benchmark parsing of RFC3339 datetimes returned by the API.
+
+Compares the previous ``strptime``-based implementation of
+``datatypes._date_converter`` with the current one, for unique values
+(as in location histories) and repeated values (as in tracker status).
+
+Run with::
+
+    python benchmarks/bench_date_converter.py
+"""
+
+import time
+from datetime import datetime
+from typing import List
+
+from gps_tracker.client.datatypes import _date_converter
+
+COUNT = 100_000
+
+
+def legacy_date_converter(val):
+    """Previous implementation of datatypes._date_converter."""
+    if val is None:
+        return None
+    try:
+        return datetime.strptime(val, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except ValueError:
+        return datetime.strptime(f"{val}Z", "%Y-%m-%dT%H:%M:%S.%f%z")
+
+
+def make_values(count: int, offset: str, unique: bool) -> List[str]:
+    """Generate RFC3339 datetimes, either all different or cycling over 10 values."""
+    keys = range(count) if unique else [idx % 10 for idx in range(count)]
+    return [
+        f"2021-11-{1 + key % 28:02d}T{key % 24:02d}:{key % 60:02d}:00.{key:06d}{offset}"
+        for key in keys
+    ]
+
+
+def bench(func, values: List[str]) -> float:
+    """Return the count of values parsed per second by func."""
+    start = time.perf_counter()
+    for val in values:
+        func(val)
+    return len(values) / (time.perf_counter() - start)
+
+
+def main():
+    """Run the benchmark and print results."""
+    for offset, label in (("Z", "'Z' offset"), ("", "no offset"), ("+02:00", "+02:00")):
+        for unique in (True, False):
+            values = make_values(COUNT, offset, unique)
+            before = bench(legacy_date_converter, values)
+            after = bench(_date_converter, values)
+            print(
+                f"{label:10} | {'unique' if unique else 'repeated':8} | "
+                f"before: {before:>11,.0f} values/s | "
+                f"after: {after:>11,.0f} values/s | speedup: x{after / before:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
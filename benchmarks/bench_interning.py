@@ -0,0 +1,124 @@
+"""
+Benchmark memory retained by trackers of a large ``get_devices`` answer.
+
+Decodes a synthetic answer of 10k trackers sharing a few distinct values
+of timezone, network, region, board, operator and states, and a few
+distinct configurations. Compares the previous converters (one string
+per tracker and field, one ``TrackerConfig`` per tracker) with the
+current ones (interned strings, ``TrackerConfig`` shared by trackers
+configured identically).
+
+Run with::
+
+    python benchmarks/bench_interning.py
+"""
+
+import json
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import attrs
+
+from gps_tracker.client.datatypes import (
+    Device,
+    Tracker01,
+    TrackerConfig,
+    _intern_str,
+    _tracker_config_converter,
+    form,
+)
+
+COUNT = 10_000
+
+
+def legacy_class(cls: type, converters: Dict[Callable, Callable]) -> type:
+    """Form an equivalent of an attrs class with replaced converters."""
+    fields = {
+        field.name: attrs.field(
+            converter=converters.get(field.converter, field.converter),
+            default=field.default,
+        )
+        for field in attrs.fields(cls)
+    }
+    return attrs.make_class(f"Legacy{cls.__name__}", fields, slots=True)
+
+
+LegacyTrackerConfig = legacy_class(TrackerConfig, {_intern_str: str})
+LegacyTracker01 = legacy_class(
+    Tracker01,
+    {
+        _intern_str: str,
+        _tracker_config_converter: lambda val: form(LegacyTrackerConfig, val),
+    },
+)
+
+
+def devices_answer(count: int) -> str:
+    """Generate the body of a get_devices answer listing trackers."""
+    devices = []
+    for idx in range(count):
+        devices.append(
+            {
+                "id": idx,
+                "name": f"Tracker {idx}",
+                "type": "tracker_01",
+                "serial": f"{idx:016x}",
+                "created": "2020-05-11T16:15:40.175649Z",
+                "version_build": "8d2ce7f",
+                "timezone": ("Europe/Paris", "Europe/Berlin", "UTC")[idx % 3],
+                "version": "tracker_LWTv2-9.34.0-LoRa+Sigfox",
+                "tracker_config": {
+                    "mode": ("1", "6", "7")[idx % 3],
+                    "color": idx % 4,
+                    "icon": 19,
+                    "notify_position": True,
+                    "notify_long_walk": True,
+                    "network": ("lora", "sigfox")[idx % 2],
+                    "network_region": "EU",
+                    "network_config": 1,
+                    "firmware_path": "http://developer.invoxia.com/update.pup",
+                    "board_name": "LWT1v2",
+                    "usage": "vehicle",
+                },
+                "tracker_status": {
+                    "battery": idx % 100,
+                    "begin_date": "2019-04-19T19:43:32.197349Z",
+                    "last_event": "2021-12-24T11:42:06.012000Z",
+                    "state": ("online", "offline")[idx % 2],
+                    "sub_end_date": "2023-02-28",
+                    "sub_state": "normal",
+                    "network_operator": ("parrot", "orange", "swisscom")[idx % 3],
+                    "stationary": idx % 60,
+                },
+            }
+        )
+    return json.dumps(devices)
+
+
+def retained_bytes(answer: str, decode: Callable[[Dict[str, Any]], Any]) -> int:
+    """Return the bytes retained by the trackers decoded from an answer."""
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    rows: List[Dict[str, Any]] = json.loads(answer)
+    trackers = [decode(row) for row in rows]
+    del rows
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(trackers) == COUNT
+    return end - start
+
+
+def main():
+    """Run the benchmark and print results."""
+    answer = devices_answer(COUNT)
+    before = retained_bytes(answer, lambda row: form(LegacyTracker01, row))
+    after = retained_bytes(answer, Device.get)
+    print(
+        f"{COUNT} trackers | before: {before / COUNT:7.1f} B/tracker | "
+        f"after: {after / COUNT:7.1f} B/tracker | "
+        f"saved: {(before - after) / before:.0%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
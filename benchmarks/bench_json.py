@@ -0,0 +1,73 @@
+"""
+Benchmark decoding of recorded API answers with each JSON backend.
+
+Decodes the answers recorded in the test fixtures (a page of locations
+and the list of devices) with every installed backend of
+``gps_tracker.client.decoding``, as UTF-8 bytes like the clients receive
+them. The page of locations is also repeated to match the size of long
+histories.
+
+Run with::
+
+    python benchmarks/bench_json.py
+"""
+
+import json
+import pathlib
+import time
+from typing import Dict
+
+from gps_tracker.client.decoding import JSON_BACKENDS, get_json_decoder
+
+FIXTURES = pathlib.Path(__file__).parent.parent.joinpath("tests", "fixtures")
+DURATION = 0.5
+
+
+def load_payloads() -> Dict[str, bytes]:
+    """Return the recorded payloads to decode, by name."""
+    payloads = {}
+    for name, fixture in (
+        ("locations page", "200_tracker_data_deviceid-878858.json"),
+        ("devices", "200_devices.json"),
+    ):
+        with FIXTURES.joinpath(fixture).open("r", encoding="utf-8") as fp:
+            payloads[name] = json.load(fp)["content"].encode()
+
+    rows = json.loads(payloads["locations page"])
+    payloads["1000 locations"] = json.dumps(rows * (1000 // len(rows))).encode()
+    return payloads
+
+
+def bench(decoder, payload: bytes) -> float:
+    """Return the count of payloads decoded per second."""
+    count = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < DURATION:
+        for _ in range(100):
+            decoder(payload)
+        count += 100
+    return count / elapsed
+
+
+def main():
+    """Run the benchmark and print results."""
+    for name, payload in load_payloads().items():
+        reference = None
+        for backend in JSON_BACKENDS[::-1]:
+            try:
+                decoder = get_json_decoder(backend)
+            except ModuleNotFoundError:
+                print(
+                    f"{name:>14} ({len(payload):>7,} B) | {backend:>6}: not installed"
+                )
+                continue
+            rate = bench(decoder, payload)
+            reference = reference or rate
+            print(
+                f"{name:>14} ({len(payload):>7,} B) | {backend:>6}: "
+                f"{rate:>9,.0f} decodes/s | speedup: x{rate / reference:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark decoding of locations into eager and lazy TrackerData.
+
+Decodes location rows with ``TrackerData`` and ``LazyTrackerData`` then
+reads a subset of their fields: only the coordinates (map plotting), the
+coordinates and date-time, or all fields.
+
+Run with::
+
+    python benchmarks/bench_lazy.py
+"""
+
+import time
+from operator import attrgetter
+
+from bench_form import make_rows
+
+from gps_tracker.client.datatypes import LazyTrackerData, TrackerData, form_list
+
+ROWS = 100_000
+REPEAT = 3
+ACCESSES = {
+    "lat, lng": attrgetter("lat", "lng"),
+    "lat, lng, datetime": attrgetter("lat", "lng", "datetime"),
+    "all fields": attrgetter(
+        "datetime", "lat", "lng", "method", "pkt_drop", "precision", "uuid"
+    ),
+}
+
+
+def bench(cls, rows, access) -> float:
+    """Return the best count of rows decoded and read per second."""
+    best = 0.0
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for location in form_list(cls, rows):
+            access(location)
+        best = max(best, len(rows) / (time.perf_counter() - start))
+    return best
+
+
+def main():
+    """Run the benchmark and print results."""
+    rows = make_rows(ROWS, extra_field=False)
+    for name, access in ACCESSES.items():
+        eager = bench(TrackerData, rows, access)
+        lazy = bench(LazyTrackerData, rows, access)
+        print(
+            f"read {name:>18} | eager: {eager:>9,.0f} rows/s | "
+            f"lazy: {lazy:>9,.0f} rows/s | speedup: x{lazy / eager:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
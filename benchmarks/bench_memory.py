@@ -0,0 +1,107 @@
+"""
+Benchmark memory used by datatype instances.
+
+Reports the bytes allocated per ``TrackerData`` and per ``Tracker01``
+instance (including converted attribute values), compared with
+equivalent classes storing their attributes in a ``__dict__``.
+
+Run with::
+
+    python benchmarks/bench_memory.py
+"""
+
+import copy
+import json
+import pathlib
+import tracemalloc
+import uuid
+from typing import Any, Callable, Dict, List
+
+import attrs
+
+from gps_tracker.client.datatypes import Tracker, Tracker01, TrackerData, form
+
+COUNT = 10_000
+FIXTURES = pathlib.Path(__file__).parents[1].joinpath("tests", "fixtures")
+
+
+def dict_based(cls: type, base: type = object) -> type:
+    """Form an equivalent of an attrs class without __slots__."""
+    fields = {
+        field.name: attrs.field(converter=field.converter, default=field.default)
+        for field in attrs.fields(cls)
+        if not field.inherited
+    }
+    return attrs.make_class(
+        f"DictBased{cls.__name__}", fields, bases=(base,), slots=False
+    )
+
+
+def location_rows(count: int) -> List[Dict[str, Any]]:
+    """Generate location rows as returned by the API."""
+    return [
+        {
+            "uuid": str(uuid.uuid4()),
+            "datetime": f"2021-11-{1 + idx % 28:02d}T13:{idx % 60:02d}:00.{idx:06d}Z",
+            "lat": "48.858370",
+            "lng": "2.294481",
+            "precision": 75,
+            "method": 2,
+            "pkt_drop": 0,
+        }
+        for idx in range(count)
+    ]
+
+
+def tracker_rows(count: int) -> List[Dict[str, Any]]:
+    """Generate tracker devices as returned by the API."""
+    with FIXTURES.joinpath("200_devices_type-tracker.json").open("r") as fp:
+        tracker = json.loads(json.load(fp)["content"])[0]
+    del tracker["type"]
+    rows = []
+    for idx in range(count):
+        row = copy.deepcopy(tracker)
+        row["id"] = idx
+        rows.append(row)
+    return rows
+
+
+def bytes_per_instance(cls: type, rows: List[Dict[str, Any]]) -> float:
+    """Return the bytes allocated per instance of cls formed from rows."""
+    instances = []
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    for row in rows:
+        instances.append(form(cls, row))
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (end - start) / len(rows)
+
+
+def report(name: str, before: Callable[[], float], after: Callable[[], float]):
+    """Print memory usage before and after."""
+    before_bytes, after_bytes = before(), after()
+    print(
+        f"{name:11} | with __dict__: {before_bytes:7.1f} B | "
+        f"slotted: {after_bytes:7.1f} B | saved: {before_bytes - after_bytes:6.1f} B"
+    )
+
+
+def main():
+    """Run the benchmark and print results."""
+    locations = location_rows(COUNT)
+    report(
+        "TrackerData",
+        lambda: bytes_per_instance(dict_based(TrackerData), locations),
+        lambda: bytes_per_instance(TrackerData, locations),
+    )
+    trackers = tracker_rows(COUNT)
+    report(
+        "Tracker01",
+        lambda: bytes_per_instance(dict_based(Tracker01, Tracker), trackers),
+        lambda: bytes_per_instance(Tracker01, trackers),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark forming of the API urls queried by a polling cycle.
+
+Each cycle queries the status and the new locations of every tracker of a
+fleet, as done by ``PollingScheduler``. Compares the previous
+implementation of ``UrlProvider`` (forming each URL from scratch) with
+the current one (device id and query arguments appended to prefixes
+formed once), with and without the conversion of URLs to ``yarl.URL``
+done by aiohttp.
+
+Run with::
+
+    python benchmarks/bench_url_provider.py
+"""
+
+import time
+from typing import Callable, Optional
+
+import yarl
+
+from gps_tracker.client.url_provider import UrlProvider
+
+FLEET_SIZES = (1_000, 10_000)
+CYCLES = 20
+REPEAT = 5
+NOT_BEFORE = 1572602400
+
+
+class LegacyUrlProvider:
+    """Previous implementation of UrlProvider."""
+
+    def __init__(self, api_url: str = "https://labs.invoxia.io"):
+        """Initialize provider with the API domain."""
+        self.api_url = api_url
+
+    def _form_url(self, path: str) -> str:
+        """Form the full url from the base api and the given path."""
+        return f"{self.api_url}/{path}"
+
+    def locations(
+        self,
+        device_id: int,
+        not_before: Optional[int] = None,
+        not_after: Optional[int] = None,
+    ) -> str:
+        """Form the URL to access tracker locations in a given time-range."""
+        args = []
+        if not_before is not None:
+            args.append(f"timestamp={not_before}")
+        if not_after is not None:
+            args.append(f"timestamp_max={not_after}")
+        args_str = f"?{'&'.join(args)}" if args else ""
+
+        return self._form_url(f"devices/{device_id}/tracker_data/{args_str}")
+
+    def tracker_status(self, device_id: int) -> str:
+        """Form the URL to get the current tracker status."""
+        return self._form_url(f"devices/{device_id}/tracker_status/")
+
+
+def bench(provider, fleet_size: int, convert: Callable = str) -> float:
+    """Return the best count of urls formed per second."""
+    best = 0.0
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for cycle in range(CYCLES):
+            for device_id in range(fleet_size):
+                convert(provider.tracker_status(device_id))
+                convert(provider.locations(device_id, not_before=NOT_BEFORE + cycle))
+        best = max(best, 2 * CYCLES * fleet_size / (time.perf_counter() - start))
+    return best
+
+
+def report(name: str, before: float, after: float):
+    """Print rates before and after."""
+    print(
+        f"{name:28} | before: {before:>10,.0f} urls/s | "
+        f"after: {after:>10,.0f} urls/s | speedup: x{after / before:.2f}"
+    )
+
+
+def main():
+    """Run the benchmark and print results."""
+    for fleet_size in FLEET_SIZES:
+        report(
+            f"{fleet_size} trackers",
+            bench(LegacyUrlProvider(), fleet_size),
+            bench(UrlProvider(), fleet_size),
+        )
+        report(
+            f"{fleet_size} trackers, yarl.URL",
+            bench(LegacyUrlProvider(), fleet_size, yarl.URL),
+            bench(
+                UrlProvider(),
+                fleet_size,
+                UrlProvider.as_yarl,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,28 +3,75 @@
 
 from __future__ import annotations
 
+import asyncio
 import datetime
-import json
-from typing import TYPE_CHECKING, Any, List, Optional
+import itertools
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import aiohttp
 
+from .backfill import merge_shards, split_time_range
+from .batch import TrackerDataBatch
+from .cache import _entry_key, cached
 from .datatypes import (
     Device,
+    LazyTrackerData,
     Tracker,
     TrackerConfig,
     TrackerData,
     TrackerStatus,
     User,
     form,
+    form_list,
+)
+from .exceptions import (
+    ApiConnectionError,
+    GpsTrackerException,
+    HttpException,
+    _copy_exception,
 )
-from .exceptions import ApiConnectionError, HttpException
+from .pagination import LocationPages
+from .rate_limit import parse_retry_after
+from .raw import RawAnswer
+from .snapshot import FleetSnapshot, TrackerSnapshot
+from .tail import MemoryWatermarkStore, Watermark, WatermarkStore
 from .url_provider import UrlProvider
 
+try:
+    import attrs
+except ModuleNotFoundError:
+    # Handle attrs<21.3.0
+    import attr as attrs  # type: ignore[no-redef]
+
 if TYPE_CHECKING:
     from .config import Config
 
 
+@attrs.define
+class QueryStats:
+    """Counters of the API queries performed by an asynchronous client."""
+
+    requests: int = 0
+    """Count of HTTP requests sent to the API."""
+
+    coalesced: int = 0
+    """Count of queries served by an identical request already in progress."""
+
+
 class AsyncClient:
     """Asynchronous client for Invoxia API."""
 
@@ -37,6 +84,17 @@ class AsyncClient:
         self._session: Optional[aiohttp.ClientSession] = session
         self._external_session = session is not None
 
+        self._cache_pending: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self._inflight: Dict[Tuple[str, bool], asyncio.Future] = {}
+        self._watermarks: WatermarkStore = (
+            MemoryWatermarkStore()
+            if config.watermark_store is None
+            else config.watermark_store
+        )
+
+        self.stats: QueryStats = QueryStats()
+        """Counters of the API queries performed by the client."""
+
     async def __aenter__(self):
         """Enter context manager"""
         await self._get_session()
@@ -49,8 +107,11 @@ class AsyncClient:
     async def _get_session(self) -> aiohttp.ClientSession:
         """Open the session if needed and return it."""
         if self._session is None:
-            auth = self.get_auth(self._cfg)
-            self._session = aiohttp.ClientSession(auth=auth)
+            self._session = aiohttp.ClientSession(
+                auth=self.get_auth(self._cfg),
+                connector=self.get_connector(self._cfg),
+                timeout=self.get_timeout(self._cfg),
+            )
         return self._session
 
     @classmethod
@@ -58,21 +119,111 @@ class AsyncClient:
         """Form the authentication instance associated to a config."""
         return aiohttp.BasicAuth(login=config.username, password=config.password)
 
-    async def _query(self, url: str) -> Any:
-        """Query the API asynchronously and return the decoded JSON response."""
+    @classmethod
+    def get_connector(cls, config: Config) -> aiohttp.TCPConnector:
+        """Form the connection pool associated to a config."""
+        if config.keepalive > 0:
+            keepalive: Dict[str, Any] = {"keepalive_timeout": config.keepalive}
+        else:
+            keepalive = {"force_close": True}
+        return aiohttp.TCPConnector(
+            limit=config.pool_size,
+            limit_per_host=config.pool_per_host,
+            ttl_dns_cache=config.dns_cache_ttl,
+            **keepalive,
+        )
+
+    @classmethod
+    def get_timeout(cls, config: Config) -> aiohttp.ClientTimeout:
+        """Form the timeouts associated to a config."""
+        return aiohttp.ClientTimeout(
+            sock_connect=config.connect_timeout, sock_read=config.read_timeout
+        )
+
+    async def _query(self, url: str, raw: bool = False) -> Any:
+        """
+        Query the API asynchronously and return the decoded JSON response.
+
+        In raw mode, the undecoded answer is returned as a RawAnswer.
+
+        Concurrent queries of the same URL are coalesced: a single request
+        is sent and all callers get its decoded answer (or its exception).
+        The decoded answer is thus shared and must not be modified.
+        """
+        key = (url, raw)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats.coalesced += 1
+        else:
+            pending = asyncio.ensure_future(self._request(url, raw))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shield the shared request from the cancellation of a single caller.
+        return await asyncio.shield(pending)
+
+    async def _request(self, url: str, raw: bool = False) -> Any:
+        """
+        Send requests to the API until an answer is decoded.
+
+        Queries failing with a transient error are attempted again
+        according to the retry policy of the configuration, if any.
+        """
+        policy = self._cfg.retry
+        if policy is None:
+            return await self._send(url, raw)
+
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return await self._send(url, raw)
+            except GpsTrackerException as err:
+                delay = policy.next_delay(err, attempt, time.monotonic() - start)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send(self, url: str, raw: bool = False) -> Any:
+        """Send a request to the API and return the decoded JSON response."""
+        # Make the request conditional if a previous answer is cached
+        cached = None
+        if self._cfg.response_cache is not None and not raw:
+            cached = self._cfg.response_cache.get(url, account=self._cfg.username)
+        headers = None if cached is None else cached.conditional_headers()
+
         # Run the request
+        limiter = self._cfg.rate_limiter
+        if limiter is not None:
+            await limiter.acquire_async()
+        self.stats.requests += 1
         session = await self._get_session()
         try:
-            async with session.get(url) as resp:
-                # Extract JSON answer if possible
+            async with session.get(
+                self._url_provider.as_yarl(url), headers=headers
+            ) as resp:
+                if limiter is not None:
+                    limiter.feedback(
+                        resp.status,
+                        retry_after=parse_retry_after(resp.headers.get("Retry-After")),
+                    )
+
+                # Reuse cached answer if unchanged
+                if cached is not None and resp.status == 304:
+                    return cached.json_answer
+
+                # Extract JSON answer if possible, only for errors in raw mode
+                exception = HttpException.get(resp.status)
                 json_answer = None
-                try:
-                    json_answer = await resp.json()
-                except (aiohttp.ContentTypeError, json.decoder.JSONDecodeError):
-                    pass
+                if not raw or exception is not None or not resp.ok:
+                    try:
+                        json_answer = await resp.json(loads=self._cfg.json_decoder)
+                    except (aiohttp.ContentTypeError, ValueError):
+                        # ValueError is the parent of JSONDecodeError of all backends
+                        pass
 
                 # Raise known exception if required
-                exception = HttpException.get(resp.status)
                 if exception is not None:
                     raise exception(json_answer=json_answer)
 
@@ -85,8 +236,19 @@ class AsyncClient:
                         raise exception_class(json_answer=json_answer) from err
                     raise err
 
+                if raw:
+                    return RawAnswer(resp.status, await resp.read())
+
+                if self._cfg.response_cache is not None:
+                    self._cfg.response_cache.store(
+                        url,
+                        json_answer,
+                        etag=resp.headers.get("ETag"),
+                        last_modified=resp.headers.get("Last-Modified"),
+                        account=self._cfg.username,
+                    )
             return json_answer
-        except aiohttp.ClientConnectionError as err:
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
             raise ApiConnectionError() from err
 
     async def close(self):
@@ -121,6 +283,7 @@ class AsyncClient:
         data = await self._query(self._url_provider.users())
         return [form(User, item) for item in data]
 
+    @cached("device", key=lambda device_id: device_id)
     async def get_device(self, device_id: int) -> Device:
         """
         Return a device referenced by its id.
@@ -135,6 +298,7 @@ class AsyncClient:
         data = await self._query(self._url_provider.device(device_id))
         return Device.get(data)
 
+    @cached("devices", key=lambda kind=None: kind)
     async def get_devices(self, kind: Optional[str] = None) -> List[Device]:
         """
         Return devices associated to credentials.
@@ -152,6 +316,7 @@ class AsyncClient:
         data = await self._query(self._url_provider.devices(kind=kind))
         return [Device.get(item) for item in data]
 
+    @cached("trackers", key=lambda: None)
     async def get_trackers(self) -> List[Tracker]:
         """
         Query API for the list of trackers associated to credentials.
@@ -169,6 +334,8 @@ class AsyncClient:
         not_before: Optional[datetime.datetime] = None,
         not_after: Optional[datetime.datetime] = None,
         max_count: int = 20,
+        prefetch: bool = False,
+        lazy: bool = False,
     ) -> List[TrackerData]:
         """
         Extract the list of tracker locations.
@@ -186,45 +353,551 @@ class AsyncClient:
             one API query yields 20 locations.
         :type max_count: int, optional
 
+        :param prefetch: Query the next page of locations while the current
+            one is being decoded.
+        :type prefetch: bool, optional
+
+        :param lazy: Return LazyTrackerData, whose date-time, method and uuid
+            are only converted when first read.
+        :type lazy: bool, optional
+
         :return: List of extracted locations
         :rtype: List[TrackerData]
+
+        :raises GpsTrackerException: If a query fails. The locations extracted
+            so far are stored in its `partial_locations` attribute and the
+            extraction can be resumed by passing its `resume_not_after`
+            attribute as `not_after`.
+        """
+        locations: List[TrackerData] = []
+        try:
+            async for location in self.iter_locations(
+                device,
+                not_before=not_before,
+                not_after=not_after,
+                max_count=max_count,
+                prefetch=prefetch,
+                lazy=lazy,
+            ):
+                locations.append(location)
+        except GpsTrackerException as err:
+            raise _copy_exception(err, partial_locations=locations) from err
+        return locations
+
+    async def iter_locations(
+        self,
+        device: Tracker,
+        not_before: Optional[datetime.datetime] = None,
+        not_after: Optional[datetime.datetime] = None,
+        max_count: Optional[int] = None,
+        prefetch: bool = False,
+        lazy: bool = False,
+    ) -> AsyncIterator[TrackerData]:
+        """
+        Iterate over tracker locations, from the most recent to the oldest.
+
+        Locations are retrieved page by page: a new API query is only
+        performed once all locations of the previous page have been consumed.
+        Stopping the iteration early thus avoids querying unused pages.
+
+        :param device: The tracker instance whose locations must be extracted.
+        :type device: Tracker
+
+        :param not_before: Minimum date-time of the locations to extract.
+        :type not_before: datetime.datetime, optional
+
+        :param not_after: Maximum date-time of the locations to extract.
+        :type not_after: datetime.datetime, optional
+
+        :param max_count: Maximum count of position to extract. All available
+            locations are extracted if not provided.
+        :type max_count: int, optional
+
+        :param prefetch: Query the next page of locations while the current
+            one is being decoded. The next page is then queried even if the
+            iteration is stopped before the end of the current page.
+        :type prefetch: bool, optional
+
+        :param lazy: Yield LazyTrackerData, whose date-time, method and uuid
+            are only converted when first read.
+        :type lazy: bool, optional
+
+        :return: Asynchronous iterator over extracted locations
+        :rtype: AsyncIterator[TrackerData]
+        """
+        cls = LazyTrackerData if lazy else TrackerData
+        async for page in self._iter_location_pages(
+            device,
+            not_before=not_before,
+            not_after=not_after,
+            max_count=max_count,
+            prefetch=prefetch,
+        ):
+            for item in form_list(cls, page):
+                yield item
+
+    async def iter_raw_locations(
+        self,
+        device: Tracker,
+        not_before: Optional[datetime.datetime] = None,
+        not_after: Optional[datetime.datetime] = None,
+        max_count: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> AsyncIterator[RawAnswer]:
+        """
+        Iterate over the undecoded pages of tracker locations.
+
+        Pages are retrieved as with :meth:`iter_locations` but are not decoded:
+        only the date-time of their last location is read to query the next
+        page. This avoids decoding pages which are only forwarded, e.g. to a
+        message queue or an object storage. As pages are not truncated, the
+        last page may hold more locations than `max_count`.
+
+        :param device: The tracker instance whose locations must be extracted.
+        :type device: Tracker
+
+        :param not_before: Minimum date-time of the locations to extract.
+        :type not_before: datetime.datetime, optional
+
+        :param not_after: Maximum date-time of the locations to extract.
+        :type not_after: datetime.datetime, optional
+
+        :param max_count: Minimum count of position to extract. All available
+            locations are extracted if not provided.
+        :type max_count: int, optional
+
+        :param prefetch: Query the next page of locations while the current
+            one is being processed.
+        :type prefetch: bool, optional
+
+        :return: Asynchronous iterator over the undecoded pages, with their
+            status code
+        :rtype: AsyncIterator[RawAnswer]
+        """
+        async for page in self._iter_location_pages(
+            device,
+            not_before=not_before,
+            not_after=not_after,
+            max_count=max_count,
+            prefetch=prefetch,
+            raw=True,
+        ):
+            yield page
+
+    async def get_locations_batch(
+        self,
+        device: Tracker,
+        not_before: Optional[datetime.datetime] = None,
+        not_after: Optional[datetime.datetime] = None,
+        max_count: int = 20,
+        prefetch: bool = False,
+    ) -> TrackerDataBatch:
+        """
+        Extract tracker locations as a columnar batch.
+
+        Locations are stored as numpy arrays instead of
+        :class:`TrackerData <gps_tracker.client.datatypes.TrackerData>` instances,
+        which is faster and lighter for large location histories.
+        Requires numpy to be installed.
+
+        :param device: The tracker instance whose locations must be extracted.
+        :type device: Tracker
+
+        :param not_before: Minimum date-time of the locations to extract.
+        :type not_before: datetime.datetime, optional
+
+        :param not_after: Maximum date-time of the locations to extract.
+        :type not_after: datetime.datetime, optional
+
+        :param max_count: Maximum count of position to extract.
+        :type max_count: int, optional
+
+        :param prefetch: Query the next page of locations while the current
+            one is being decoded.
+        :type prefetch: bool, optional
+
+        :return: Batch of extracted locations
+        :rtype: TrackerDataBatch
         """
-        not_before_ts: Optional[int] = (
-            None if not_before is None else not_before.timestamp().__ceil__()
+        return TrackerDataBatch.concatenate(
+            [
+                TrackerDataBatch.from_rows(page)
+                async for page in self._iter_location_pages(
+                    device,
+                    not_before=not_before,
+                    not_after=not_after,
+                    max_count=max_count,
+                    prefetch=prefetch,
+                )
+            ]
         )
 
-        not_after_ts: Optional[int] = (
-            None if not_after is None else not_after.timestamp().__floor__()
+    async def sync_locations(self, device: Tracker) -> int:
+        """
+        Download tracker locations missing from the configured location store.
+
+        Only the locations more recent than the newest stored location
+        are queried. They are stored at once when all of them are received,
+        so that a failed synchronization can simply be run again. Stored
+        locations can then be read without any API call with
+        :meth:`gps_tracker.client.store.LocationStore.get_locations`.
+
+        :param device: The tracker instance whose locations must be synchronized.
+        :type device: Tracker
+
+        :return: Count of new locations added to the store
+        :rtype: int
+        """
+        store = self._cfg.location_store
+        if store is None:
+            raise ValueError("No location store defined in client configuration.")
+
+        newest = store.newest(device.id)
+        # Store the locations only once all pages are received: storing the
+        # most recent pages of a failed walk would skip the older locations
+        # at the next synchronization, which starts from the newest one.
+        pages = [
+            page
+            async for page in self._iter_location_pages(
+                device,
+                not_before=None if newest is None else newest.replace(microsecond=0),
+            )
+        ]
+        return store.add(device.id, itertools.chain.from_iterable(pages))
+
+    async def backfill_locations(
+        self,
+        device: Tracker,
+        not_before: datetime.datetime,
+        not_after: datetime.datetime,
+        shards: int = 10,
+        max_concurrency: int = 10,
+    ) -> List[TrackerData]:
+        """
+        Extract all tracker locations of a long time range concurrently.
+
+        Locations are retrieved backward page by page: each query depends on
+        the previous one. To retrieve long histories faster, the time range
+        is split into `shards` contiguous shards whose pages are queried
+        concurrently, `max_concurrency` shards at a time. Locations are
+        merged in time order and duplicates at shard bounds are dropped.
+
+        :param device: The tracker instance whose locations must be extracted.
+        :type device: Tracker
+
+        :param not_before: Minimum date-time of the locations to extract.
+        :type not_before: datetime.datetime
+
+        :param not_after: Maximum date-time of the locations to extract.
+        :type not_after: datetime.datetime
+
+        :param shards: Count of shards the time range is split into.
+        :type shards: int, optional
+
+        :param max_concurrency: Maximum count of shards queried simultaneously.
+        :type max_concurrency: int, optional
+
+        :return: Extracted locations, from the most recent to the oldest
+        :rtype: List[TrackerData]
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer.")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _get_shard(bounds: Tuple[datetime.datetime, datetime.datetime]):
+            async with semaphore:
+                return [
+                    location
+                    async for location in self.iter_locations(
+                        device, not_before=bounds[0], not_after=bounds[1]
+                    )
+                ]
+
+        time_shards = split_time_range(not_before, not_after, shards)
+        return merge_shards(
+            await asyncio.gather(*[_get_shard(bounds) for bounds in time_shards])
         )
 
-        res = []
-        while max_count > 0:
-            data = await self._query(
-                self._url_provider.locations(
-                    device_id=device.id,
-                    not_after=not_after_ts,
-                    not_before=not_before_ts,
-                )
-            )  # Seems to return between 0 and 20 locations.
+    async def tail_locations(
+        self, device: Tracker, initial_count: int = 20
+    ) -> List[TrackerData]:
+        """
+        Return the locations received since the previous call for a tracker.
+
+        The newest location returned for each tracker is remembered in the
+        watermark store of the configuration (in memory if not defined).
+        Only the locations more recent than this watermark are then queried,
+        and locations of the same second already returned are dropped.
 
-            # Stop if not result returned.
-            if len(data) == 0:
-                break
+        :param device: The tracker instance whose new locations are queried.
+        :type device: Tracker
 
-            # Pop returned results one by one and stop if max_count is reached.
-            while len(data) > 0:
-                tracker_data = data.pop(0)
-                res.append(form(TrackerData, tracker_data))
+        :param initial_count: Count of most recent locations returned when no
+            watermark is known for the tracker.
+        :type initial_count: int, optional
 
-                max_count -= 1
-                if max_count <= 0:
+        :return: New locations, from the most recent to the oldest
+        :rtype: List[TrackerData]
+        """
+        watermark = self._watermarks.get(device.id)
+        if watermark is None:
+            locations = await self.get_locations(device, max_count=initial_count)
+        else:
+            locations = []
+            async for location in self.iter_locations(
+                device, not_before=watermark.not_before
+            ):
+                # Locations are received from the most recent one: stop at
+                # older ones, skipping those of the watermark date-time which
+                # were already returned.
+                if location.datetime < watermark.datetime:
                     break
+                if watermark.is_new(location):
+                    locations.append(location)
+
+        new_watermark = Watermark.from_locations(locations, previous=watermark)
+        if new_watermark is not None and new_watermark != watermark:
+            self._watermarks.set(device.id, new_watermark)
+        return locations
+
+    async def _iter_location_pages(
+        self,
+        device: Tracker,
+        not_before: Optional[datetime.datetime] = None,
+        not_after: Optional[datetime.datetime] = None,
+        max_count: Optional[int] = None,
+        prefetch: bool = False,
+        raw: bool = False,
+    ) -> AsyncIterator[Any]:
+        """
+        Iterate over the pages of tracker locations answered by the API.
+
+        Pages are lists of locations as decoded JSON, or RawAnswer in raw mode.
+        """
+        pages = LocationPages(
+            self._url_provider, device.id, not_before, not_after, max_count
+        )
+        next_page: Optional[asyncio.Future] = None
+        try:
+            while not pages.done:
+                try:
+                    if next_page is None:
+                        # Seems to return between 0 and 20 locations.
+                        data = await self._query(pages.url(), raw)
+                    else:
+                        data = await next_page
+                        next_page = None
+                except GpsTrackerException as err:
+                    # Let the caller resume the extraction from the failed page.
+                    raise _copy_exception(
+                        err, resume_not_after=pages.resume_not_after
+                    ) from err
+
+                if raw:
+                    if not pages.advance_raw(data):
+                        break
+                else:
+                    data = pages.advance(data)
+                    if not data:
+                        break
+
+                # Start querying the next page before decoding the current one.
+                if prefetch and not pages.done:
+                    next_page = asyncio.ensure_future(self._query(pages.url(), raw))
+                    # Let the query be sent before decoding starts.
+                    await asyncio.sleep(0)
+
+                yield data
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def get_multiple_locations(
+        self,
+        devices: Iterable[Tracker],
+        not_before: Optional[datetime.datetime] = None,
+        not_after: Optional[datetime.datetime] = None,
+        max_count: int = 20,
+        max_concurrency: int = 10,
+    ) -> Dict[int, Union[List[TrackerData], GpsTrackerException]]:
+        """
+        Extract the locations of several trackers concurrently.
+
+        Locations of each tracker are retrieved with
+        :meth:`get_locations` using the current session. At most
+        `max_concurrency` trackers are queried at the same time.
+        A failure on one tracker does not interrupt the other ones: the
+        raised exception is returned in place of its locations.
+
+        :param devices: The tracker instances whose locations must be extracted.
+        :type devices: Iterable[Tracker]
+
+        :param not_before: Minimum date-time of the locations to extract.
+        :type not_before: datetime.datetime, optional
+
+        :param not_after: Maximum date-time of the locations to extract.
+        :type not_after: datetime.datetime, optional
+
+        :param max_count: Maximum count of position to extract per tracker.
+        :type max_count: int, optional
+
+        :param max_concurrency: Maximum count of trackers queried simultaneously.
+        :type max_concurrency: int, optional
+
+        :return: Extracted locations (or raised exception) by device id
+        :rtype: Dict[int, Union[List[TrackerData], GpsTrackerException]]
+
+        :raise ValueError: A tracker is given several times
+        """
+        return await self._for_each_device(
+            self.get_locations,
+            devices,
+            max_concurrency,
+            not_before=not_before,
+            not_after=not_after,
+            max_count=max_count,
+        )
+
+    async def get_multiple_tracker_status(
+        self, devices: Iterable[Tracker], max_concurrency: int = 10
+    ) -> Dict[int, Union[TrackerStatus, GpsTrackerException]]:
+        """
+        Get the current status of several trackers concurrently.
 
-            # Update not_after to match the currently oldest location.
-            not_after_ts = res[-1].datetime.timestamp().__floor__()
+        :param devices: The tracker instances whose status is queried.
+        :type devices: Iterable[Tracker]
+
+        :param max_concurrency: Maximum count of trackers queried simultaneously.
+        :type max_concurrency: int, optional
+
+        :return: Current status (or raised exception) by device id
+        :rtype: Dict[int, Union[TrackerStatus, GpsTrackerException]]
+
+        :raise ValueError: A tracker is given several times
+        """
+        return await self._for_each_device(
+            self.get_tracker_status, devices, max_concurrency
+        )
+
+    async def get_multiple_tracker_config(
+        self, devices: Iterable[Tracker], max_concurrency: int = 10
+    ) -> Dict[int, Union[TrackerConfig, GpsTrackerException]]:
+        """
+        Get the current configuration of several trackers concurrently.
+
+        :param devices: The tracker instances whose configuration is queried.
+        :type devices: Iterable[Tracker]
+
+        :param max_concurrency: Maximum count of trackers queried simultaneously.
+        :type max_concurrency: int, optional
+
+        :return: Current config (or raised exception) by device id
+        :rtype: Dict[int, Union[TrackerConfig, GpsTrackerException]]
+
+        :raise ValueError: A tracker is given several times
+        """
+        return await self._for_each_device(
+            self.get_tracker_config, devices, max_concurrency
+        )
+
+    async def get_fleet_snapshot(
+        self, status_max_age: Optional[float] = 60.0, max_concurrency: int = 10
+    ) -> FleetSnapshot:
+        """
+        Get the trackers of the account with their status and last location.
+
+        Trackers are retrieved once, then the status and most recent location
+        of each tracker are queried concurrently. The status embedded in the
+        devices payload is used instead of querying it again if this payload
+        is at most `status_max_age` seconds old, which is always the case
+        unless it is served by the configured cache.
+        A failure on one tracker is stored in its snapshot instead of
+        interrupting the other queries.
+
+        :param status_max_age: Maximum age of the devices payload for its
+            embedded status to be used, in seconds. Status are always queried
+            if None.
+        :type status_max_age: float, optional
+
+        :param max_concurrency: Maximum count of trackers queried simultaneously.
+        :type max_concurrency: int, optional
+
+        :return: Snapshot of all trackers
+        :rtype: FleetSnapshot
+        """
+        trackers = await self.get_trackers()
+        age = None
+        if self._cfg.cache is not None:
+            age = self._cfg.cache.age("trackers", _entry_key(self, None))
+        age = age or 0.0
+        taken_at = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+            seconds=age
+        )
+
+        snapshots = await self._for_each_device(
+            self._get_tracker_snapshot,
+            trackers,
+            max_concurrency,
+            embedded_status=status_max_age is not None and age <= status_max_age,
+        )
+        return FleetSnapshot(taken_at=taken_at, trackers=snapshots)
+
+    async def _get_tracker_snapshot(
+        self, device: Tracker, embedded_status: bool
+    ) -> TrackerSnapshot:
+        """Get the status and last location of a tracker."""
+        snapshot = TrackerSnapshot(tracker=device)
+        if embedded_status:
+            snapshot.status = getattr(device, "tracker_status", None)
+            snapshot.status_embedded = snapshot.status is not None
+
+        async def _get_status():
+            if snapshot.status is None:
+                snapshot.status = await self.get_tracker_status(device)
+
+        async def _get_location():
+            locations = await self.get_locations(device, max_count=1)
+            if locations:
+                snapshot.location = locations[0]
+
+        results = await asyncio.gather(
+            _get_status(), _get_location(), return_exceptions=True
+        )
+        for res in results:
+            if isinstance(res, GpsTrackerException):
+                snapshot.errors.append(res)
+            elif isinstance(res, BaseException):
+                raise res
+        return snapshot
+
+    async def _for_each_device(
+        self,
+        method: Callable[..., Awaitable[Any]],
+        devices: Iterable[Tracker],
+        max_concurrency: int,
+        **kwargs: Any,
+    ) -> Dict[int, Any]:
+        """Call a method on several trackers concurrently, capturing failures."""
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer.")
+        devices = list(devices)
+        if len({device.id for device in devices}) < len(devices):
+            # Results are returned by device id: reject duplicates, which
+            # would silently be merged.
+            raise ValueError("Each tracker must be given only once.")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _call(device: Tracker) -> Any:
+            async with semaphore:
+                try:
+                    return await method(device, **kwargs)
+                except GpsTrackerException as err:
+                    return err
 
-        return res
+        results = await asyncio.gather(*[_call(dev) for dev in devices])
+        return {device.id: res for device, res in zip(devices, results)}
 
+    @cached("tracker_status", key=lambda device: device.id)
     async def get_tracker_status(self, device: Tracker) -> TrackerStatus:
         """
         Get the current status of a given tracker.
@@ -238,6 +911,7 @@ class AsyncClient:
         data = await self._query(self._url_provider.tracker_status(device_id=device.id))
         return form(TrackerStatus, data)
 
+    @cached("tracker_config", key=lambda device: device.id)
     async def get_tracker_config(self, device: Tracker) -> TrackerConfig:
         """
         Get the current configuration of a given tracker.
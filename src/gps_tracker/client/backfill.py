@@ -0,0 +1,74 @@
+"""Splitting of long time ranges into shards of locations queried in parallel."""
+
+from __future__ import annotations
+
+import datetime
+import itertools
+import operator
+import uuid
+from typing import Iterable, List, Set, Tuple
+
+from .datatypes import TrackerData
+
+
+def split_time_range(
+    not_before: datetime.datetime, not_after: datetime.datetime, shards: int
+) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+    """
+    Split a time range into contiguous shards, from the most recent one.
+
+    Shard bounds are whole seconds, as expected by the API. Two consecutive
+    shards share their bound so that no location is missed, whatever the
+    API considers bounds as inclusive or not.
+
+    :param not_before: Minimum date-time of the range
+    :type not_before: datetime.datetime
+
+    :param not_after: Maximum date-time of the range
+    :type not_after: datetime.datetime
+
+    :param shards: Count of shards to form, reduced for ranges shorter than
+        this count of seconds
+    :type shards: int
+
+    :return: Bounds (not_before, not_after) of each shard
+    :rtype: List[Tuple[datetime.datetime, datetime.datetime]]
+    """
+    if shards < 1:
+        raise ValueError("shards must be a positive integer.")
+    start = not_before.timestamp().__ceil__()
+    end = not_after.timestamp().__floor__()
+    if end < start:
+        return []
+
+    count = max(1, min(shards, end - start))
+    bounds = [
+        datetime.datetime.fromtimestamp(
+            start + (end - start) * idx // count, tz=datetime.timezone.utc
+        )
+        for idx in range(count + 1)
+    ]
+    return [(bounds[idx], bounds[idx + 1]) for idx in reversed(range(count))]
+
+
+def merge_shards(shards: Iterable[List[TrackerData]]) -> List[TrackerData]:
+    """
+    Merge the locations of several shards, dropping duplicates by uuid.
+
+    :param shards: Locations of each shard
+    :type shards: Iterable[List[TrackerData]]
+
+    :return: Unique locations, from the most recent to the oldest
+    :rtype: List[TrackerData]
+    """
+    seen: Set[uuid.UUID] = set()
+    merged: List[TrackerData] = []
+    for location in sorted(
+        itertools.chain.from_iterable(shards),
+        key=operator.attrgetter("datetime"),
+        reverse=True,
+    ):
+        if location.uuid not in seen:
+            seen.add(location.uuid)
+            merged.append(location)
+    return merged
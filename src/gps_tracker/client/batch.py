@@ -0,0 +1,216 @@
+"""Columnar representation of tracker locations backed by numpy arrays."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    Union,
+    overload,
+)
+
+from .datatypes import TrackerData, _parse_rfc3339
+from .exceptions import UnknownAnswerScheme
+
+try:
+    import attrs
+except ModuleNotFoundError:
+    # Handle attrs<21.3.0
+    import attr as attrs  # type: ignore[no-redef]
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _require_numpy() -> None:
+    """Raise an explicit error if numpy is not installed."""
+    if np is None:  # pragma: no cover
+        raise ModuleNotFoundError(
+            "numpy is required to use TrackerDataBatch. "
+            "Install it with `pip install gps_tracker[numpy]`."
+        )
+
+
+def _array(val: Any, dtype: str) -> npt.NDArray:
+    """Cast values to a numpy array of given dtype."""
+    _require_numpy()
+    return np.asarray(val, dtype=dtype)
+
+
+def _int64_array(val: Any) -> npt.NDArray:
+    """Cast values to a numpy array of 64-bit integers."""
+    return _array(val, "int64")
+
+
+def _int32_array(val: Any) -> npt.NDArray:
+    """Cast values to a numpy array of 32-bit integers."""
+    return _array(val, "int32")
+
+
+def _uint8_array(val: Any) -> npt.NDArray:
+    """Cast values to a numpy array of unsigned bytes."""
+    return _array(val, "uint8")
+
+
+def _float64_array(val: Any) -> npt.NDArray:
+    """Cast values to a numpy array of double precision floats."""
+    return _array(val, "float64")
+
+
+def _uuid_array(val: Any) -> npt.NDArray:
+    """Cast values to a numpy array of 16 raw bytes."""
+    return _array(val, "V16")
+
+
+def _epoch_us(val: str) -> int:
+    """Convert a RFC3339 datetime to microseconds since epoch."""
+    return (_parse_rfc3339(val) - _EPOCH) // _MICROSECOND
+
+
+@attrs.define(eq=False)
+class TrackerDataBatch:
+    """
+    Batch of tracker locations stored column by column.
+
+    Each attribute is a numpy array holding one field of
+    :class:`TrackerData <gps_tracker.client.datatypes.TrackerData>`
+    for all locations of the batch. Rows are only converted to
+    :class:`TrackerData <gps_tracker.client.datatypes.TrackerData>`
+    instances when accessed by index or iterated over.
+    """
+
+    datetime: npt.NDArray = attrs.field(converter=_int64_array)
+    """Datetime of location measurements, in microseconds since epoch."""
+
+    lat: npt.NDArray = attrs.field(converter=_float64_array)
+    """Device latitudes."""
+
+    lng: npt.NDArray = attrs.field(converter=_float64_array)
+    """Device longitudes."""
+
+    method: npt.NDArray = attrs.field(converter=_uint8_array)
+    """Values of the methods used for location acquisition."""
+
+    pkt_drop: npt.NDArray = attrs.field(converter=_int32_array)
+    """To be determined. (Probably number of packet drop since last location)."""
+
+    precision: npt.NDArray = attrs.field(converter=_int32_array)
+    """Precision of location measurements (To be confirmed)."""
+
+    uuid: npt.NDArray = attrs.field(converter=_uuid_array)
+    """Universally unique identifiers of location data, as 16 raw bytes."""
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Mapping[str, Any]]) -> TrackerDataBatch:
+        """
+        Form a batch from locations as returned by the API.
+
+        :param rows: JSON representations of tracker locations
+        :type rows: Sequence[Mapping[str, Any]]
+
+        :return: Batch holding all given locations
+        :rtype: TrackerDataBatch
+
+        :raise UnknownAnswerScheme: A location misses a field
+        """
+        _require_numpy()
+        try:
+            return cls(
+                datetime=np.fromiter(
+                    (_epoch_us(row["datetime"]) for row in rows),
+                    dtype="int64",
+                    count=len(rows),
+                ),
+                lat=[row["lat"] for row in rows],
+                lng=[row["lng"] for row in rows],
+                method=[row["method"] for row in rows],
+                pkt_drop=[row["pkt_drop"] for row in rows],
+                precision=[row["precision"] for row in rows],
+                uuid=np.frombuffer(
+                    b"".join(uuid.UUID(row["uuid"]).bytes for row in rows),
+                    dtype="V16",
+                ),
+            )
+        except KeyError as err:
+            row = next(row for row in rows if err.args[0] not in row)
+            raise UnknownAnswerScheme(
+                row, f"Missing field {err.args[0]!r}.", cls
+            ) from err
+
+    @classmethod
+    def concatenate(cls, batches: Iterable[TrackerDataBatch]) -> TrackerDataBatch:
+        """
+        Join several batches into a single one.
+
+        :param batches: Batches to join, in order
+        :type batches: Iterable[TrackerDataBatch]
+
+        :return: Batch holding the locations of all given batches
+        :rtype: TrackerDataBatch
+        """
+        batches = list(batches)
+        if not batches:
+            return cls.from_rows([])
+        return cls(
+            **{
+                field.name: np.concatenate(
+                    [getattr(batch, field.name) for batch in batches]
+                )
+                for field in attrs.fields(cls)
+            }
+        )
+
+    def __len__(self) -> int:
+        """Return the count of locations in the batch."""
+        return len(self.datetime)
+
+    @overload
+    def __getitem__(self, key: int) -> TrackerData:
+        ...
+
+    @overload
+    def __getitem__(self, key: Union[slice, npt.NDArray]) -> TrackerDataBatch:
+        ...
+
+    def __getitem__(self, key):
+        """Return a single location by index or a sub-batch by slice or mask."""
+        if isinstance(key, (int, np.integer)):
+            return TrackerData(
+                datetime=_EPOCH + timedelta(microseconds=int(self.datetime[key])),
+                lat=self.lat[key],
+                lng=self.lng[key],
+                method=int(self.method[key]),
+                pkt_drop=self.pkt_drop[key],
+                precision=self.precision[key],
+                uuid=uuid.UUID(bytes=self.uuid[key].tobytes()),
+            )
+        return self.__class__(
+            **{
+                field.name: getattr(self, field.name)[key]
+                for field in attrs.fields(self.__class__)
+            }
+        )
+
+    def __iter__(self) -> Iterator[TrackerData]:
+        """Iterate over locations converted to TrackerData."""
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def to_list(self) -> List[TrackerData]:
+        """Convert all locations of the batch to TrackerData."""
+        return list(self)
@@ -0,0 +1,392 @@
+"""Caches of API answers shared by synchronous and asynchronous clients."""
+# pylint: disable=protected-access  # Decorator accesses client configuration
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+try:
+    import attrs
+except ModuleNotFoundError:
+    # Handle attrs<21.3.0
+    import attr as attrs  # type: ignore[no-redef]
+
+MISSING = object()
+"""Sentinel returned by :meth:`TTLCache.get` when no valid entry exists."""
+
+
+@attrs.frozen
+class CachedResponse:
+    """Decoded API answer stored with its validators."""
+
+    json_answer: Any
+    """Decoded JSON answer."""
+
+    etag: Optional[str] = None
+    """Value of the ``ETag`` header of the answer."""
+
+    last_modified: Optional[str] = None
+    """Value of the ``Last-Modified`` header of the answer."""
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Return the headers making a request conditional to this answer."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class TTLCache:
+    """
+    Bounded cache with time-to-live per endpoint and LRU eviction.
+
+    Entries are stored by endpoint name (e.g. ``"devices"`` or
+    ``"tracker_status"``) and key. Each endpoint may define its own
+    time-to-live. When the cache is full, the least recently used entry
+    is evicted. A cache instance is thread-safe and can be shared by
+    several clients.
+
+    Values are stored and returned as is, without copy: all callers get
+    the same instances, which must not be modified.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        endpoint_ttl: Optional[Mapping[str, float]] = None,
+        maxsize: int = 256,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize an empty cache.
+
+        :param ttl: Default time-to-live of entries, in seconds
+        :type ttl: float
+
+        :param endpoint_ttl: Time-to-live of entries by endpoint name, in seconds.
+            A time-to-live of 0 disables caching for the endpoint.
+        :type endpoint_ttl: Mapping[str, float], optional
+
+        :param maxsize: Maximum count of entries
+        :type maxsize: int
+
+        :param timer: Function returning the current time in seconds
+        :type timer: Callable[[], float]
+        """
+        self.ttl: float = ttl
+        self.endpoint_ttl: Dict[str, float] = dict(endpoint_ttl or {})
+        self.maxsize: int = maxsize
+        self._timer = timer
+        self._entries: OrderedDict[Tuple[str, Hashable], Tuple[float, float, Any]]
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Represent the cache with its settings."""
+        return (
+            f"{self.__class__.__name__}(ttl={self.ttl!r}, "
+            f"endpoint_ttl={self.endpoint_ttl!r}, maxsize={self.maxsize!r})"
+        )
+
+    def __len__(self) -> int:
+        """Return the count of entries, including expired ones."""
+        return len(self._entries)
+
+    def get_ttl(self, endpoint: str) -> float:
+        """Return the time-to-live of entries of an endpoint."""
+        return self.endpoint_ttl.get(endpoint, self.ttl)
+
+    def get(self, endpoint: str, key: Hashable) -> Any:
+        """
+        Return the cached value, or MISSING if absent or expired.
+
+        :param endpoint: Name of the endpoint
+        :type endpoint: str
+
+        :param key: Key of the entry within the endpoint
+        :type key: Hashable
+
+        :return: Cached value or MISSING
+        :rtype: Any
+        """
+        with self._lock:
+            entry = self._entries.get((endpoint, key))
+            if entry is None:
+                return MISSING
+            if entry[0] <= self._timer():
+                del self._entries[(endpoint, key)]
+                return MISSING
+            self._entries.move_to_end((endpoint, key))
+            return entry[2]
+
+    def age(self, endpoint: str, key: Hashable) -> Optional[float]:
+        """
+        Return the time elapsed since a valid entry was stored.
+
+        :param endpoint: Name of the endpoint
+        :type endpoint: str
+
+        :param key: Key of the entry within the endpoint
+        :type key: Hashable
+
+        :return: Age of the entry in seconds, None if absent or expired
+        :rtype: float, optional
+        """
+        with self._lock:
+            entry = self._entries.get((endpoint, key))
+            now = self._timer()
+            if entry is None or entry[0] <= now:
+                return None
+            return now - entry[1]
+
+    def set(self, endpoint: str, key: Hashable, value: Any):
+        """
+        Store a value, evicting the least recently used entries if needed.
+
+        :param endpoint: Name of the endpoint
+        :type endpoint: str
+
+        :param key: Key of the entry within the endpoint
+        :type key: Hashable
+
+        :param value: Value to store
+        :type value: Any
+        """
+        ttl = self.get_ttl(endpoint)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            now = self._timer()
+            self._entries[(endpoint, key)] = (now + ttl, now, value)
+            self._entries.move_to_end((endpoint, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint: Optional[str] = None):
+        """
+        Remove all entries, or only those of a given endpoint.
+
+        :param endpoint: Name of the endpoint to invalidate
+        :type endpoint: str, optional
+        """
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+            else:
+                for entry_key in [k for k in self._entries if k[0] == endpoint]:
+                    del self._entries[entry_key]
+
+
+class ResponseCache:
+    """
+    Bounded cache of API answers used to send conditional requests.
+
+    The decoded answer of each URL is stored along with its ``ETag`` and
+    ``Last-Modified`` headers. These are sent back in the ``If-None-Match``
+    and ``If-Modified-Since`` headers of the next request to the same URL,
+    and the stored answer is reused if the API answers ``304 Not Modified``.
+    Answers are kept by account, so that a cache shared by clients of
+    different accounts never serves the answers of one account to another.
+
+    When a path is given, entries are loaded from this file on creation and
+    written to it by :meth:`save`. The file holds, in plain text JSON, the
+    usernames and the full answers of the API (devices, tracker status,
+    tracker config and locations): it should be protected accordingly.
+    """
+
+    def __init__(self, maxsize: int = 128, path: Optional[str] = None):
+        """
+        Initialize the cache, loading persisted entries if any.
+
+        :param maxsize: Maximum count of stored answers
+        :type maxsize: int
+
+        :param path: Path of the JSON file where answers are persisted
+        :type path: str, optional
+        """
+        self.maxsize: int = maxsize
+        self.path: Optional[str] = path
+        self._entries: OrderedDict[Tuple[str, str], CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as fp:
+                for account, entries in json.load(fp).items():
+                    for url, entry in entries.items():
+                        self.store(url, account=account, **entry)
+
+    def __repr__(self) -> str:
+        """Represent the cache with its settings."""
+        return (
+            f"{self.__class__.__name__}(maxsize={self.maxsize!r}, path={self.path!r})"
+        )
+
+    def __len__(self) -> int:
+        """Return the count of stored answers."""
+        return len(self._entries)
+
+    def get(self, url: str, account: str = "") -> Optional[CachedResponse]:
+        """
+        Return the answer stored for a URL, if any.
+
+        :param url: Queried URL
+        :type url: str
+
+        :param account: Username of the account which queried the URL
+        :type account: str
+
+        :return: Stored answer with its validators
+        :rtype: CachedResponse, optional
+        """
+        with self._lock:
+            entry = self._entries.get((account, url))
+            if entry is not None:
+                self._entries.move_to_end((account, url))
+            return entry
+
+    def store(
+        self,
+        url: str,
+        json_answer: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        account: str = "",
+    ):
+        """
+        Store the answer to a URL if it defines at least one validator.
+
+        :param url: Queried URL
+        :type url: str
+
+        :param json_answer: Decoded answer
+        :type json_answer: Any
+
+        :param etag: Value of the ``ETag`` header of the answer
+        :type etag: str, optional
+
+        :param last_modified: Value of the ``Last-Modified`` header of the answer
+        :type last_modified: str, optional
+
+        :param account: Username of the account which queried the URL
+        :type account: str
+        """
+        if (etag is None and last_modified is None) or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[(account, url)] = CachedResponse(
+                json_answer, etag, last_modified
+            )
+            self._entries.move_to_end((account, url))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def save(self):
+        """
+        Write stored answers to the file defined by path.
+
+        Answers are written by account in plain text JSON, with their
+        validators.
+        """
+        if self.path is None:
+            raise ValueError("No path defined to persist the response cache.")
+        data: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for (account, url), entry in self._entries.items():
+                data.setdefault(account, {})[url] = attrs.asdict(entry)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fp:
+            json.dump(data, fp)
+        os.replace(tmp_path, self.path)
+
+
+def _entry_key(client, key: Hashable) -> Hashable:
+    """Form the key of a cache entry, specific to the account of the client."""
+    return (client._cfg.username, client._cfg.api_url, key)
+
+
+def cached(endpoint: str, key: Callable[..., Hashable]):
+    """
+    Cache the result of a client method in the TTLCache of its configuration.
+
+    Nothing is cached if no cache is defined in the client configuration.
+    Entries are keyed by the account and API url of the client along with
+    the key formed from the arguments, so that clients of different
+    accounts sharing a cache never get each other's answers. Cached
+    results are returned to all callers without copy and must not be
+    modified. For coroutine methods, concurrent calls with the same key share a single
+    pending call instead of querying the API several times.
+
+    :param endpoint: Name of the endpoint used to define the entries time-to-live
+    :type endpoint: str
+
+    :param key: Function forming the entry key from the method arguments
+    :type key: Callable[..., Hashable]
+    """
+
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(client, *args, **kwargs):
+                cache: Optional[TTLCache] = client._cfg.cache
+                if cache is None:
+                    return await method(client, *args, **kwargs)
+
+                entry_key = _entry_key(client, key(*args, **kwargs))
+                value = cache.get(endpoint, entry_key)
+                if value is not MISSING:
+                    return value
+
+                pending: Dict[Tuple[str, Hashable], asyncio.Future]
+                pending = client._cache_pending
+                if (endpoint, entry_key) not in pending:
+
+                    async def fetch():
+                        try:
+                            result = await method(client, *args, **kwargs)
+                            cache.set(endpoint, entry_key, result)
+                            return result
+                        finally:
+                            del pending[(endpoint, entry_key)]
+
+                    pending[(endpoint, entry_key)] = asyncio.ensure_future(fetch())
+
+                # Shield the shared call from the cancellation of a single caller.
+                return await asyncio.shield(pending[(endpoint, entry_key)])
+
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(client, *args, **kwargs):
+            cache: Optional[TTLCache] = client._cfg.cache
+            if cache is None:
+                return method(client, *args, **kwargs)
+
+            entry_key = _entry_key(client, key(*args, **kwargs))
+            value = cache.get(endpoint, entry_key)
+            if value is MISSING:
+                value = method(client, *args, **kwargs)
+                cache.set(endpoint, entry_key, value)
+            return value
+
+        return wrapper
+
+    return decorator
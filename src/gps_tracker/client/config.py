@@ -3,6 +3,14 @@
 from __future__ import annotations
 
 import urllib.parse
+from typing import Optional
+
+from .cache import ResponseCache, TTLCache
+from .decoding import JsonDecoder, get_json_decoder
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .store import LocationStore
+from .tail import WatermarkStore
 
 try:
     import attrs
@@ -11,6 +19,12 @@ except ModuleNotFoundError:
     import attr as attrs  # type: ignore[no-redef]
 
 
+# Typed defaults of optional fields, for mypy to infer their optional type.
+_DNS_CACHE_TTL: Optional[int] = 10
+_CONNECT_TIMEOUT: Optional[float] = 10.0
+_READ_TIMEOUT: Optional[float] = 30.0
+
+
 def _api_url_converter(val: str) -> str:
     """
     Convert the API URL to expected format.
@@ -51,6 +65,86 @@ class Config:  # pylint: disable=too-few-public-methods
     )
     """Invoxia API URL."""
 
+    location_store: Optional[LocationStore] = attrs.field(
+        validator=attrs.validators.optional(
+            attrs.validators.instance_of(LocationStore)
+        ),
+        default=None,
+    )
+    """Local storage of tracker locations used by ``sync_locations``."""
+
+    watermark_store: Optional[WatermarkStore] = attrs.field(
+        validator=attrs.validators.optional(
+            attrs.validators.instance_of(WatermarkStore)  # type: ignore[type-abstract]
+        ),
+        default=None,
+    )
+    """Storage of the newest locations received by ``tail_locations``."""
+
+    cache: Optional[TTLCache] = attrs.field(
+        validator=attrs.validators.optional(attrs.validators.instance_of(TTLCache)),
+        default=None,
+    )
+    """Cache of devices, tracker status and tracker config (disabled by default)."""
+
+    response_cache: Optional[ResponseCache] = attrs.field(
+        validator=attrs.validators.optional(
+            attrs.validators.instance_of(ResponseCache)
+        ),
+        default=None,
+    )
+    """Cache of answers used to send conditional requests (disabled by default)."""
+
+    rate_limiter: Optional[RateLimiter] = attrs.field(
+        validator=attrs.validators.optional(attrs.validators.instance_of(RateLimiter)),
+        default=None,
+    )
+    """Limiter of the request rate, possibly shared with other clients."""
+
+    retry: Optional[RetryPolicy] = attrs.field(
+        validator=attrs.validators.optional(attrs.validators.instance_of(RetryPolicy)),
+        default=None,
+    )
+    """Policy retrying queries failing with transient errors (disabled by default)."""
+
+    pool_size: int = attrs.field(
+        validator=attrs.validators.instance_of(int), default=100
+    )
+    """Maximum count of simultaneous connections to the API."""
+
+    pool_per_host: int = attrs.field(
+        validator=attrs.validators.instance_of(int), default=0
+    )
+    """Maximum count of simultaneous connections per host (0 for pool_size)."""
+
+    keepalive: float = attrs.field(
+        validator=attrs.validators.instance_of((int, float)), default=15.0
+    )
+    """Time idle connections are kept open, in seconds (0 disables keep-alive)."""
+
+    dns_cache_ttl: Optional[int] = attrs.field(
+        validator=attrs.validators.optional(attrs.validators.instance_of(int)),
+        default=_DNS_CACHE_TTL,
+    )
+    """Time DNS lookups are cached by AsyncClient, in seconds (forever if None)."""
+
+    connect_timeout: Optional[float] = attrs.field(
+        validator=attrs.validators.optional(attrs.validators.instance_of((int, float))),
+        default=_CONNECT_TIMEOUT,
+    )
+    """Maximum time to establish a connection to the API, in seconds."""
+
+    read_timeout: Optional[float] = attrs.field(
+        validator=attrs.validators.optional(attrs.validators.instance_of((int, float))),
+        default=_READ_TIMEOUT,
+    )
+    """Maximum time waiting for data from the API, in seconds."""
+
+    json_decoder: JsonDecoder = attrs.field(
+        validator=attrs.validators.is_callable(), factory=get_json_decoder, repr=False
+    )
+    """Function decoding JSON answers (fastest of orjson, ujson and json)."""
+
     @classmethod
     def default_api_url(cls) -> str:
         """Return the default API URL."""
@@ -5,19 +5,28 @@
 
 from __future__ import annotations
 
+import calendar
 import enum
+import functools
+import re
+import sys
 import uuid
-from datetime import datetime
+import weakref
+from datetime import datetime, timedelta, timezone
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     Dict,
+    Hashable,
     Iterable,
     List,
     Mapping,
     Optional,
     Type,
     TypeVar,
+    Union,
+    cast,
 )
 
 from .exceptions import UnknownAnswerScheme, UnknownDeviceType
@@ -32,34 +41,122 @@ if TYPE_CHECKING:
     T = TypeVar("T")  # pylint: disable=invalid-name
 
 
+@functools.lru_cache(maxsize=None)
+def _decoder(cls: Type[T]) -> Callable[[Mapping[str, Any]], T]:
+    """
+    Build the decoder of an attrs class.
+
+    The decoder only keeps the keys matching an argument of the class
+    initializer so that fields added to the API answers are ignored.
+    It is built once per class and cached.
+    """
+    names = frozenset(attr.name.lstrip("_") for attr in attrs.fields(cls))
+
+    def decoder(data: Mapping[str, Any]) -> T:
+        if names.issuperset(data):
+            return cls(**data)
+        return cls(**{key: val for key, val in data.items() if key in names})
+
+    return decoder
+
+
 def form(cls: Type[T], data: Mapping[str, Any]) -> T:
     """Form an object based on arguments given in mapping."""
     try:
-        obj = cls(**data)
+        return _decoder(cast(Hashable, cls))(data)
     except TypeError as err:
-        if "unexpected keyword argument" in str(err):
-            attributes = attrs.fields(cls)
-            subdata = {
-                key: data[key]
-                for key in [attr.name for attr in attributes]
-                if key in data
-            }
-            return form(cls, subdata)
-
         raise UnknownAnswerScheme(data, err.args[0], cls) from err
-    return obj
 
 
-def _date_converter(val: Optional[str]) -> Optional[datetime]:
+def form_list(cls: Type[T], data: Iterable[Mapping[str, Any]]) -> List[T]:
+    """Form a list of objects based on arguments given in mappings."""
+    decoder = _decoder(cast(Hashable, cls))
+    result = []
+    for item in data:
+        try:
+            result.append(decoder(item))
+        except TypeError as err:
+            raise UnknownAnswerScheme(item, err.args[0], cls) from err
+    return result
+
+
+_RFC3339_PATTERN = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})\.(\d{1,6})"
+    r"(?:Z|([+-])(\d{2}):?(\d{2}))?"
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _utc_offset(sign: str, hours: str, minutes: str) -> timezone:
+    """Return the timezone associated to a RFC3339 UTC offset."""
+    delta = timedelta(hours=int(hours), minutes=int(minutes))
+    return timezone(-delta if sign == "-" else delta)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_rfc3339(val: str) -> datetime:
+    """
+    Parse a datetime in RFC3339 format.
+
+    Datetimes without UTC offset are considered as UTC. The most recently
+    parsed values are cached since identical dates are often repeated
+    in API answers.
+    """
+    match = _RFC3339_PATTERN.fullmatch(val)
+    if match is None:
+        raise ValueError(f"time data {val!r} does not match RFC3339 format")
+    year, month, day, hour, minute, second, fraction, sign, hours, minutes = (
+        match.groups()
+    )
+    return datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour),
+        int(minute),
+        int(second),
+        int(fraction.ljust(6, "0")),
+        tzinfo=timezone.utc if sign is None else _utc_offset(sign, hours, minutes),
+    )
+
+
+def _epoch_seconds(val: str) -> int:
+    """
+    Return the whole seconds elapsed since epoch at a RFC3339 datetime.
+
+    The timestamp is computed from the datetime fields without building
+    a datetime object.
+    """
+    match = _RFC3339_PATTERN.fullmatch(val)
+    if match is None:
+        raise ValueError(f"time data {val!r} does not match RFC3339 format")
+    year, month, day, hour, minute, second, _, sign, hours, minutes = match.groups()
+    epoch = calendar.timegm(
+        (int(year), int(month), int(day), int(hour), int(minute), int(second))
+    )
+    if sign is not None:
+        offset = int(hours) * 3600 + int(minutes) * 60
+        epoch += -offset if sign == "+" else offset
+    return epoch
+
+
+def _date_converter(val: Union[str, datetime, None]) -> Optional[datetime]:
     """Converts a datetime in RFC3339 format to datetime object."""
-    if val is None:
-        return None
-    try:
-        return datetime.strptime(val, "%Y-%m-%dT%H:%M:%S.%f%z")
-    except ValueError:
-        # Error will be raised if value does not match format
-        # This mainly happens if date does not contain UTC offset
-        return datetime.strptime(f"{val}Z", "%Y-%m-%dT%H:%M:%S.%f%z")
+    if val is None or isinstance(val, datetime):
+        return val
+    return _parse_rfc3339(val)
+
+
+def _uuid_converter(val: Union[str, uuid.UUID]) -> uuid.UUID:
+    """Converts a string representation of an UUID to UUID object."""
+    if isinstance(val, uuid.UUID):
+        return val
+    return uuid.UUID(val)
+
+
+def _intern_str(val: Any) -> str:
+    """Converts a value repeated across answers to an interned string."""
+    return sys.intern(str(val))
 
 
 def _date_repr(val: Optional[datetime]) -> str:
@@ -88,6 +185,7 @@ class Device:
     """Base class for devices."""
 
     _registry: Dict[str, Type[Device]] = {}
+    _dtype: Optional[str] = None
 
     id: int = attrs.field(converter=int)
     """Device unique identifier."""
@@ -98,7 +196,7 @@ class Device:
     name: str = attrs.field(converter=str)
     """Device name."""
 
-    timezone: str = attrs.field(converter=str)
+    timezone: str = attrs.field(converter=_intern_str)
     """Timezone associated to device."""
 
     version: str = attrs.field(converter=str)
@@ -106,6 +204,11 @@ class Device:
 
     def __init_subclass__(cls, dtype: Optional[str] = None):
         """Register subclasses with their given type."""
+        if dtype is not None:
+            cls._dtype = dtype
+        # Slotted attrs classes are re-created without the class keywords:
+        # the type is thus retrieved from the class namespace.
+        dtype = cls.__dict__.get("_dtype")
         if dtype is not None:
             Device._registry[dtype] = cls
 
@@ -115,7 +218,8 @@ class Device:
         if device_data["type"] not in Device._registry:
             raise UnknownDeviceType(device_data)
 
-        return form(Device._registry[device_data.pop("type")], device_data)
+        # The type is not an attribute and will be ignored by the decoder.
+        return form(Device._registry[device_data["type"]], device_data)
 
     @classmethod
     def get_types(cls) -> Iterable[str]:
@@ -123,19 +227,19 @@ class Device:
         return cls._registry.keys()
 
 
-@attrs.define(slots=False)
+@attrs.define
 class Android(Device, dtype="android"):
     """Definition of devices of type 'android'."""
 
-    serial: uuid.UUID = attrs.field(converter=uuid.UUID)
+    serial: uuid.UUID = attrs.field(converter=_uuid_converter)
     """Device Universally Unique Identifier"""
 
 
-@attrs.define(slots=False)
+@attrs.define
 class Iphone(Device, dtype="iphone"):
     """Definition of devices of type 'iphone'."""
 
-    serial: uuid.UUID = attrs.field(converter=uuid.UUID)
+    serial: uuid.UUID = attrs.field(converter=_uuid_converter)
     """Device Universally Unique Identifier"""
 
 
@@ -216,11 +320,16 @@ class TrackerUsage(enum.Enum):
     VEHICLE = "vehicle"
 
 
-@attrs.define(auto_attribs=True)
+@attrs.frozen(auto_attribs=True)
 class TrackerConfig:
-    """Definition of tracker config data."""
+    """
+    Definition of tracker config data.
 
-    board_name: str = attrs.field(converter=str)
+    Instances are immutable: trackers configured identically share the same
+    instance of their `tracker_config`.
+    """
+
+    board_name: str = attrs.field(converter=_intern_str)
     """Tracker board-model reference."""
 
     color: int = attrs.field(converter=int)
@@ -235,13 +344,13 @@ class TrackerConfig:
     mode: TrackerMode = attrs.field(converter=lambda val: TrackerMode(int(val)))
     """Operating mode of the tracker."""
 
-    network: str = attrs.field(converter=str)
+    network: str = attrs.field(converter=_intern_str)
     """Network used by tracker (LoRa/SigFox)."""
 
     network_config: int = attrs.field(converter=int)
     """To be determined."""
 
-    network_region: str = attrs.field(converter=str)
+    network_region: str = attrs.field(converter=_intern_str)
     """Region configured for the network (To be confirmed)."""
 
     notify_position: bool = attrs.field(converter=bool)
@@ -273,11 +382,11 @@ class TrackerStatus:
 
     battery: int = attrs.field(converter=int)
     begin_date: datetime = attrs.field(converter=_date_converter, repr=_date_repr)
-    network_operator: str = attrs.field(converter=str)
-    state: str = attrs.field(converter=str)
+    network_operator: str = attrs.field(converter=_intern_str)
+    state: str = attrs.field(converter=_intern_str)
     stationary: int = attrs.field(converter=int)
     sub_end_date: str = attrs.field(converter=str)
-    sub_state: str = attrs.field(converter=str)
+    sub_state: str = attrs.field(converter=_intern_str)
     last_event: Optional[datetime] = attrs.field(
         converter=_date_converter,
         validator=attrs.validators.optional(attrs.validators.instance_of(datetime)),
@@ -341,13 +450,130 @@ class TrackerData:
     precision: int = attrs.field(converter=int)
     """Precision of location measurement (To be confirmed)."""
 
-    uuid: uuid.UUID = attrs.field(converter=uuid.UUID)
+    uuid: uuid.UUID = attrs.field(converter=_uuid_converter)
     """Universally unique identifier of location data."""
 
 
+_CONVERTED = object()
+"""Marker of the raw fields of LazyTrackerData already converted."""
+
+# Aliases of parameter types of LazyTrackerData, whose fields shadow the types.
+_RawDatetime = Union[str, datetime]
+_RawUuid = Union[str, uuid.UUID]
+
+
+def _lazy_field(name: str, converter: Callable[[Any], Any]) -> property:
+    """Form a property converting a raw field of LazyTrackerData on first access."""
+    slot = TrackerData.__dict__[name]
+    slot_get, slot_set = slot.__get__, slot.__set__
+    raw_get = raw_set = None
+
+    def getter(self: LazyTrackerData) -> Any:
+        nonlocal raw_get, raw_set
+        if raw_get is None:
+            raw_slot = LazyTrackerData.__dict__[f"_raw_{name}"]
+            raw_get, raw_set = raw_slot.__get__, raw_slot.__set__
+        raw = raw_get(self)
+        if raw is _CONVERTED:
+            return slot_get(self)
+        value = converter(raw)
+        slot_set(self, value)
+        raw_set(self, _CONVERTED)
+        return value
+
+    def setter(self: LazyTrackerData, value: Any):
+        slot_set(self, converter(value))
+        LazyTrackerData.__dict__[f"_raw_{name}"].__set__(self, _CONVERTED)
+
+    return property(getter, setter, doc=slot.__doc__)
+
+
+class LazyTrackerData(TrackerData):
+    """
+    Tracker location data whose costliest fields are converted on first access.
+
+    The raw values of `datetime`, `method` and `uuid` are kept as answered by
+    the API and only converted when read, the result being memoized. This
+    speeds up the decoding of locations of which only a few fields are read.
+    Lazy locations compare equal to the eager TrackerData. Unlike them, they
+    are hashed by their uuid, so that they can be deduplicated in sets: their
+    uuid must thus not be modified.
+    """
+
+    __slots__ = ("_raw_datetime", "_raw_method", "_raw_uuid")
+
+    datetime = _lazy_field("datetime", _date_converter)  # type: ignore[assignment]
+    method = _lazy_field("method", TrackerMethod)  # type: ignore[assignment]
+    uuid = _lazy_field("uuid", _uuid_converter)  # type: ignore[assignment]
+
+    def __init__(  # pylint: disable=super-init-not-called,redefined-outer-name
+        self,
+        datetime: _RawDatetime,
+        lat: float,
+        lng: float,
+        method: Union[int, TrackerMethod],
+        pkt_drop: int,
+        precision: int,
+        uuid: _RawUuid,
+    ):
+        """Store the raw values of fields converted on first access."""
+        # Set slots directly, bypassing the conversion hooks of TrackerData.
+        _RAW_DATETIME(self, datetime)
+        _RAW_METHOD(self, method)
+        _RAW_UUID(self, uuid)
+        _LAT(self, float(lat))
+        _LNG(self, float(lng))
+        _PKT_DROP(self, int(pkt_drop))
+        _PRECISION(self, int(precision))
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the fields of locations, whether they are lazy or not."""
+        if not isinstance(other, TrackerData):
+            return NotImplemented
+        return all(
+            getattr(self, field.name) == getattr(other, field.name)
+            for field in attrs.fields(TrackerData)
+        )
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        """Hash the location by its unique identifier."""
+        return hash(self.uuid)
+
+    def __reduce__(self):
+        """Pickle the location with its converted fields."""
+        fields = attrs.fields(TrackerData)
+        return self.__class__, tuple(getattr(self, field.name) for field in fields)
+
+
+_RAW_DATETIME = LazyTrackerData._raw_datetime.__set__  # type: ignore[attr-defined]
+_RAW_METHOD = LazyTrackerData._raw_method.__set__  # type: ignore[attr-defined]
+_RAW_UUID = LazyTrackerData._raw_uuid.__set__  # type: ignore[attr-defined]
+_LAT = TrackerData.__dict__["lat"].__set__
+_LNG = TrackerData.__dict__["lng"].__set__
+_PKT_DROP = TrackerData.__dict__["pkt_drop"].__set__
+_PRECISION = TrackerData.__dict__["precision"].__set__
+
+
+_SHARED_TRACKER_CONFIGS: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+"""Instances of TrackerConfig in use by trackers, by JSON representation."""
+
+
 def _tracker_config_converter(val: Dict[str, Any]) -> TrackerConfig:
-    """Converter to form a TrackerConfig from its JSON representation."""
-    return form(TrackerConfig, val)
+    """
+    Converter to form a TrackerConfig from its JSON representation.
+
+    Trackers with identical configurations share the same instance.
+    """
+    try:
+        key = frozenset(val.items())
+    except TypeError:
+        # Unhashable values cannot be shared.
+        return form(TrackerConfig, val)
+    config = _SHARED_TRACKER_CONFIGS.get(key)
+    if config is None:
+        config = form(TrackerConfig, val)
+        _SHARED_TRACKER_CONFIGS[key] = config
+    return config
 
 
 def _tracker_status_converter(val: Dict[str, Any]) -> TrackerStatus:
@@ -358,8 +584,10 @@ def _tracker_status_converter(val: Dict[str, Any]) -> TrackerStatus:
 class Tracker(Device, dtype="tracker"):
     """Base class for trackers."""
 
+    __slots__ = ()
+
 
-@attrs.define(slots=False)
+@attrs.define
 class Tracker01(Tracker, dtype="tracker_01"):
     """Definition of devices of type 'tracker_01'."""
 
@@ -370,7 +598,7 @@ class Tracker01(Tracker, dtype="tracker_01"):
     """Firmware build reference (To be confirmed)."""
 
     tracker_config: TrackerConfig = attrs.field(converter=_tracker_config_converter)
-    """Tracker configuration data."""
+    """Tracker configuration data, shared by trackers configured identically."""
 
     tracker_status: TrackerStatus = attrs.field(converter=_tracker_status_converter)
     """Tracker current status."""
@@ -0,0 +1,45 @@
+"""Decoding of JSON answers with the fastest installed backend."""
+
+from __future__ import annotations
+
+import importlib
+import json
+from typing import Any, Callable, Optional, Union
+
+JsonDecoder = Callable[[Union[str, bytes]], Any]
+"""
+Function decoding a JSON document given as text or UTF-8 bytes.
+
+Invalid documents must raise a ValueError, which is the parent of
+``json.JSONDecodeError`` and of the decoding errors of other backends.
+"""
+
+JSON_BACKENDS = ("orjson", "ujson", "json")
+"""Modules providing a JSON decoder, from the fastest one."""
+
+
+def get_json_decoder(backend: Optional[str] = None) -> JsonDecoder:
+    """
+    Return the ``loads`` function of a JSON backend.
+
+    :param backend: Name of the module providing the decoder, among
+        :data:`JSON_BACKENDS`. The fastest installed one is used if not
+        provided, falling back to the standard library.
+    :type backend: str, optional
+
+    :return: JSON decoder
+    :rtype: JsonDecoder
+
+    :raise ValueError: The backend is unknown
+    :raise ModuleNotFoundError: The backend is not installed
+    """
+    if backend is not None:
+        if backend not in JSON_BACKENDS:
+            raise ValueError(f"Unknown JSON backend {backend!r}.")
+        return importlib.import_module(backend).loads
+    for name in JSON_BACKENDS[:-1]:
+        try:
+            return importlib.import_module(name).loads
+        except ModuleNotFoundError:
+            continue
+    return json.loads
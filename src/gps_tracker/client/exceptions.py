@@ -4,14 +4,43 @@ from __future__ import annotations
 
 import json
 from importlib import metadata
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type, TypeVar, Union
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .datatypes import TrackerData
 
 _homepage: str = metadata.metadata("gps_tracker")["Home-page"]
 
+E = TypeVar("E", bound="GpsTrackerException")
+
 
 class GpsTrackerException(Exception):
     """Base class for gps-tracker exceptions."""
 
+    retryable: bool = False
+    """Whether the failed query may succeed if attempted again."""
+
+    resume_not_after: Optional[datetime] = None
+    """Value of `not_after` resuming an interrupted location extraction."""
+
+    partial_locations: Optional[List[TrackerData]] = None
+    """Locations extracted by ``get_locations`` before the failure."""
+
+
+def _copy_exception(err: E, **attributes: Any) -> E:
+    """
+    Copy an exception without calling its constructor, then set attributes.
+
+    Exceptions of coalesced queries are shared by all callers: attributes
+    specific to a caller are set on a copy, raised from the shared one.
+    """
+    copied = err.__class__.__new__(err.__class__, *err.args)
+    copied.__dict__.update(err.__dict__)
+    copied.__dict__.update(attributes)
+    return copied
+
 
 class UnknownDeviceType(GpsTrackerException):
     """Exception raised when a device of unknown type is found."""
@@ -48,6 +77,8 @@ Obfuscate any sensitive data by replacing letters by 'a' and digits by '0' if ne
 class ApiConnectionError(GpsTrackerException):
     """Exception raised if connection error occurs during API call."""
 
+    retryable = True
+
 
 class HttpException(GpsTrackerException):
     """Base class for HTTP exceptions."""
@@ -138,3 +169,39 @@ class FailedQuery(HttpException, default=True):
     def _message(self) -> Optional[str]:
         """Define message for default exception."""
         return "Query failed with unexpected exception."
+
+
+class TooManyRequests(FailedQuery, code=429):
+    """Exception raised when the API throttles queries."""
+
+    retryable = True
+
+    def _message(self) -> Optional[str]:
+        """Define message for throttled queries."""
+        return "Too many queries were sent to the API."
+
+
+class ServerError(FailedQuery):
+    """Base class for exceptions raised on transient failures of the API."""
+
+    retryable = True
+
+    def _message(self) -> Optional[str]:
+        """Define message for server errors."""
+        return "The API failed to answer the query."
+
+
+class InternalServerError(ServerError, code=500):
+    """Exception raised when the API fails with an internal error."""
+
+
+class BadGateway(ServerError, code=502):
+    """Exception raised when the API gateway gets an invalid answer."""
+
+
+class ServiceUnavailable(ServerError, code=503):
+    """Exception raised when the API is temporarily unavailable."""
+
+
+class GatewayTimeout(ServerError, code=504):
+    """Exception raised when the API gateway times out."""
@@ -0,0 +1,145 @@
+"""Pagination of tracker locations, shared by synchronous and async clients."""
+
+from __future__ import annotations
+
+import datetime
+from typing import Any, Dict, List, Optional
+
+from .datatypes import TrackerData, _epoch_seconds
+from .exceptions import UnknownAnswerScheme
+from .raw import RawAnswer
+from .url_provider import UrlProvider
+
+
+class LocationPages:
+    """
+    Cursor over the pages of tracker locations answered by the API.
+
+    The API answers locations from the most recent one, a few at a time.
+    Each page is queried with a `timestamp_max` equal to the second of
+    the oldest location of the previous page. The cursor only depends on
+    API answers: clients perform the queries and feed the received pages
+    to :meth:`advance`, which avoids decoding the locations to paginate.
+    """
+
+    __slots__ = ("_url_provider", "device_id", "not_before", "not_after", "max_count")
+
+    def __init__(
+        self,
+        url_provider: UrlProvider,
+        device_id: int,
+        not_before: Optional[datetime.datetime] = None,
+        not_after: Optional[datetime.datetime] = None,
+        max_count: Optional[int] = None,
+    ):
+        """
+        Initialize the cursor before the first page.
+
+        :param url_provider: Provider of the API urls
+        :type url_provider: UrlProvider
+
+        :param device_id: Unique identifier of the tracker
+        :type device_id: int
+
+        :param not_before: Minimum date-time of the locations to extract
+        :type not_before: datetime.datetime, optional
+
+        :param not_after: Maximum date-time of the locations to extract
+        :type not_after: datetime.datetime, optional
+
+        :param max_count: Maximum count of locations to extract
+        :type max_count: int, optional
+        """
+        self._url_provider = url_provider
+        self.device_id: int = device_id
+        self.not_before: Optional[int] = (
+            None if not_before is None else not_before.timestamp().__ceil__()
+        )
+        """Timestamp of the minimum second of the locations to extract."""
+        self.not_after: Optional[int] = (
+            None if not_after is None else not_after.timestamp().__floor__()
+        )
+        """Timestamp of the maximum second of the next page."""
+        self.max_count: Optional[int] = max_count
+        """Count of locations remaining to extract, unlimited if None."""
+
+    @property
+    def done(self) -> bool:
+        """Whether all requested locations were extracted."""
+        return self.max_count is not None and self.max_count <= 0
+
+    @property
+    def resume_not_after(self) -> Optional[datetime.datetime]:
+        """Value of `not_after` resuming the extraction from the next page."""
+        if self.not_after is None:
+            return None
+        return datetime.datetime.fromtimestamp(self.not_after, tz=datetime.timezone.utc)
+
+    def url(self) -> str:
+        """Return the URL of the next page."""
+        return self._url_provider.locations(
+            device_id=self.device_id,
+            not_after=self.not_after,
+            not_before=self.not_before,
+        )
+
+    def advance(self, page: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Move the cursor past a received page.
+
+        :param page: Raw locations answered for the URL of :meth:`url`
+        :type page: List[Dict[str, Any]]
+
+        :return: Locations of the page to extract, possibly truncated to reach
+            `max_count`
+        :rtype: List[Dict[str, Any]]
+
+        :raise UnknownAnswerScheme: The date-time of the last location of the
+            page is missing or malformed
+        """
+        if not page:
+            # No more locations: the extraction is complete.
+            self.max_count = 0
+            return page
+
+        # Keep only the results required to reach max_count.
+        if self.max_count is not None:
+            if len(page) > self.max_count:
+                page = page[: self.max_count]
+            self.max_count -= len(page)
+
+        # Continue from the second of the currently oldest location.
+        try:
+            self.not_after = _epoch_seconds(page[-1]["datetime"])
+        except KeyError as err:
+            raise UnknownAnswerScheme(
+                page[-1], f"Missing field {err.args[0]!r}.", TrackerData
+            ) from err
+        except (TypeError, ValueError) as err:
+            raise UnknownAnswerScheme(page[-1], err.args[0], TrackerData) from err
+        return page
+
+    def advance_raw(self, answer: RawAnswer) -> int:
+        """
+        Move the cursor past a received page without decoding it.
+
+        The cursor is read from the date-time of the last location of the
+        page. Raw pages cannot be truncated: the last page may hold more
+        locations than `max_count`.
+
+        :param answer: Undecoded answer for the URL of :meth:`url`
+        :type answer: RawAnswer
+
+        :return: Count of locations in the page
+        :rtype: int
+        """
+        oldest = answer.peek_oldest_datetime()
+        if oldest is None:
+            self.max_count = 0
+            return 0
+
+        count = answer.count_locations()
+        if self.max_count is not None:
+            self.max_count -= count
+        self.not_after = _epoch_seconds(oldest)
+        return count
@@ -0,0 +1,143 @@
+"""Client-side rate limitation of API requests."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+
+class RateLimiter:
+    """
+    Token bucket limiting the rate of requests sent to the API.
+
+    Up to `burst` requests can be sent at once, after which requests are
+    spaced to match `rate`. The rate adapts to the API answers: it is
+    multiplied by `backoff` each time the API throttles requests
+    (status 429) or fails (status 5xx), and progressively restored to
+    `rate` as requests succeed.
+
+    A limiter is thread-safe: the same instance can be shared by several
+    synchronous and asynchronous clients to limit their overall rate.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: int = 10,
+        min_rate: float = 0.2,
+        backoff: float = 0.5,
+        recovery: float = 0.1,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the limiter with a full bucket.
+
+        :param rate: Maximum sustained count of requests per second
+        :type rate: float
+
+        :param burst: Maximum count of requests sent at once
+        :type burst: int
+
+        :param min_rate: Minimum count of requests per second after back-offs
+        :type min_rate: float
+
+        :param backoff: Factor applied to the current rate when throttled
+        :type backoff: float
+
+        :param recovery: Fraction of `rate` restored after each successful request
+        :type recovery: float
+
+        :param timer: Function returning the current time in seconds
+        :type timer: Callable[[], float]
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate must be positive and burst at least 1.")
+        self.rate: float = rate
+        self.burst: int = burst
+        self.min_rate: float = min(min_rate, rate)
+        self.backoff: float = backoff
+        self.recovery: float = recovery
+        self.current_rate: float = rate
+        """Rate currently applied, reduced when requests are throttled."""
+
+        self._timer = timer
+        self._tokens: float = burst
+        self._updated: float = timer()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Represent the limiter with its settings."""
+        return (
+            f"{self.__class__.__name__}(rate={self.rate!r}, burst={self.burst!r}, "
+            f"current_rate={self.current_rate!r})"
+        )
+
+    def _refill(self):
+        """Add the tokens generated since last update (lock must be held)."""
+        now = self._timer()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self.current_rate
+        )
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Reserve a token and return the delay to wait before using it.
+
+        :return: Delay in seconds before the request can be sent
+        :rtype: float
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.current_rate)
+
+    def acquire(self):
+        """Wait until a request can be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Wait asynchronously until a request can be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def feedback(self, status: int, retry_after: Optional[float] = None):
+        """
+        Adapt the rate to the status of an API answer.
+
+        :param status: HTTP status code of the answer
+        :type status: int
+
+        :param retry_after: Delay requested by the API before the next request,
+            in seconds
+        :type retry_after: float, optional
+        """
+        with self._lock:
+            self._refill()
+            if status == 429 or status >= 500:
+                self.current_rate = max(self.min_rate, self.current_rate * self.backoff)
+                # Make sure the next request waits at least retry_after.
+                if retry_after is not None and retry_after > 0:
+                    self._tokens = min(
+                        self._tokens, 1 - retry_after * self.current_rate
+                    )
+            elif status < 400:
+                self.current_rate = min(
+                    self.rate, self.current_rate + self.rate * self.recovery
+                )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse the delay in seconds of a ``Retry-After`` header, if any."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        # HTTP-date values are not supported.
+        return None
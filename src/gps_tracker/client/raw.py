@@ -0,0 +1,55 @@
+"""Undecoded answers of the API, forwarded without building datatypes."""
+
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+try:
+    import attrs
+except ModuleNotFoundError:
+    # Handle attrs<21.3.0
+    import attr as attrs  # type: ignore[no-redef]
+
+_DATETIME_KEY = b'"datetime"'
+_DATETIME_PATTERN = re.compile(rb'"datetime"\s*:\s*"([^"]*)"')
+
+
+@attrs.frozen
+class RawAnswer:
+    """Undecoded answer of the API."""
+
+    status: int
+    """HTTP status code of the answer."""
+
+    content: bytes = attrs.field(repr=lambda val: f"<{len(val)} bytes>")
+    """Body of the answer, as sent by the API."""
+
+    @property
+    def view(self) -> memoryview:
+        """Memory view of the body, to slice it without copy."""
+        return memoryview(self.content)
+
+    def count_locations(self) -> int:
+        """Return the count of locations in a raw page of locations."""
+        return self.content.count(_DATETIME_KEY)
+
+    def peek_oldest_datetime(self) -> Optional[str]:
+        """
+        Return the date-time of the last location of a raw page of locations.
+
+        Only the end of the body is scanned: locations are not decoded.
+
+        :return: RFC3339 date-time of the oldest location, None if the page
+            holds no location
+        :rtype: str, optional
+
+        :raise ValueError: The date-time of the last location is malformed
+        """
+        idx = self.content.rfind(_DATETIME_KEY)
+        if idx < 0:
+            return None
+        match = _DATETIME_PATTERN.match(self.content, idx)
+        if match is None:
+            raise ValueError("Malformed datetime in the last location of the page.")
+        return match.group(1).decode("ascii")
@@ -0,0 +1,91 @@
+"""Retry policy applied to API queries failing with transient errors."""
+
+from __future__ import annotations
+
+import random
+from typing import Optional
+
+from .exceptions import GpsTrackerException
+
+try:
+    import attrs
+except ModuleNotFoundError:
+    # Handle attrs<21.3.0
+    import attr as attrs  # type: ignore[no-redef]
+
+
+@attrs.define
+class RetryPolicy:
+    """
+    Exponential back-off policy for transient query failures.
+
+    A failed query is attempted again if its exception is marked as
+    :attr:`retryable <gps_tracker.client.exceptions.GpsTrackerException.retryable>`
+    (connection errors, throttling and 5xx answers of the API). The delay
+    before attempt ``n`` is drawn from ``[0, min(max_delay, base_delay * 2**n)]``
+    when `jitter` is enabled ("full jitter"), and equal to this upper bound
+    otherwise. Clients only send GET requests, which are idempotent and can
+    thus be safely repeated.
+    """
+
+    max_attempts: int = 3
+    """Maximum count of attempts of a query, including the first one."""
+
+    base_delay: float = 0.5
+    """Delay before the first retry without jitter, in seconds."""
+
+    max_delay: float = 30.0
+    """Maximum delay between two attempts, in seconds."""
+
+    max_elapsed: Optional[float] = 60.0
+    """Maximum time spent retrying a query, in seconds (unlimited if None)."""
+
+    jitter: bool = True
+    """Draw delays randomly to spread the retries of concurrent clients."""
+
+    def __attrs_post_init__(self):
+        """Check the consistency of the policy."""
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be a positive integer.")
+        if self.base_delay < 0 or self.max_delay < 0:
+            raise ValueError("Delays must not be negative.")
+
+    def delay(self, attempt: int) -> float:
+        """
+        Return the delay to wait after a given failed attempt.
+
+        :param attempt: Index of the failed attempt, starting from 0
+        :type attempt: int
+
+        :return: Delay in seconds before the next attempt
+        :rtype: float
+        """
+        delay = min(self.max_delay, self.base_delay * 2**attempt)
+        if self.jitter:
+            return random.uniform(0, delay)
+        return delay
+
+    def next_delay(
+        self, error: GpsTrackerException, attempt: int, elapsed: float
+    ) -> Optional[float]:
+        """
+        Return the delay before retrying a failed query, None to give up.
+
+        :param error: Exception raised by the failed attempt
+        :type error: GpsTrackerException
+
+        :param attempt: Index of the failed attempt, starting from 0
+        :type attempt: int
+
+        :param elapsed: Time elapsed since the first attempt, in seconds
+        :type elapsed: float
+
+        :return: Delay in seconds before the next attempt, if any
+        :rtype: float, optional
+        """
+        if not error.retryable or attempt + 1 >= self.max_attempts:
+            return None
+        delay = self.delay(attempt)
+        if self.max_elapsed is not None and elapsed + delay > self.max_elapsed:
+            return None
+        return delay
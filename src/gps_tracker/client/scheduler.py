@@ -0,0 +1,315 @@
+"""Background polling of trackers at a cadence adapted to their mode."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import math
+import time
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+)
+
+from .datatypes import Tracker, TrackerData, TrackerMode, TrackerStatus
+from .exceptions import GpsTrackerException
+
+try:
+    import attrs
+except ModuleNotFoundError:
+    # Handle attrs<21.3.0
+    import attr as attrs  # type: ignore[no-redef]
+
+if TYPE_CHECKING:
+    from .asynchronous import AsyncClient
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_INTERVALS: Dict[TrackerMode, float] = {
+    TrackerMode.LOST: 30.0,
+    TrackerMode.LOST_PET: 30.0,
+    TrackerMode.LOST_PET_DEBUG: 30.0,
+    TrackerMode.INTENSE: 60.0,
+    TrackerMode.INTENSE_PET: 60.0,
+    TrackerMode.CHILD: 120.0,
+    TrackerMode.CHILD_PET: 120.0,
+    TrackerMode.VEHICLE_S1: 120.0,
+    TrackerMode.VEHICLE_S2: 120.0,
+    TrackerMode.VEHICLE_S3: 120.0,
+    TrackerMode.DAILY: 600.0,
+    TrackerMode.DAILY_PET: 600.0,
+    TrackerMode.KEEP_ALIVE: 1800.0,
+    TrackerMode.AIRPLANE: 3600.0,
+}
+"""Default polling interval of trackers by mode, in seconds."""
+
+
+@attrs.define
+class TrackerUpdate:
+    """Changes of a tracker detected by a poll."""
+
+    tracker: Tracker
+    """Polled tracker."""
+
+    locations: List[TrackerData] = attrs.Factory(list)
+    """Locations received since the previous poll, from the most recent."""
+
+    status: Optional[TrackerStatus] = None
+    """Current status of the tracker."""
+
+    error: Optional[GpsTrackerException] = None
+    """Exception raised by the poll, if any."""
+
+
+Subscriber = Callable[[TrackerUpdate], Optional[Awaitable[None]]]
+
+
+class PollingScheduler:
+    """
+    Poll the locations and status of trackers, each at its own cadence.
+
+    The polling interval of each tracker depends on the mode of its
+    configuration: trackers in ``LOST`` or ``INTENSE`` mode are polled
+    often while trackers in ``DAILY``, ``KEEP_ALIVE`` or ``AIRPLANE`` mode
+    are polled rarely. Only the locations received since the previous
+    poll are queried, with :meth:`AsyncClient.tail_locations
+    <gps_tracker.client.asynchronous.AsyncClient.tail_locations>`.
+    Updates are published to subscribers when new locations are received,
+    when the status changes or when a poll fails.
+    """
+
+    def __init__(
+        self,
+        client: AsyncClient,
+        trackers: Optional[Iterable[Tracker]] = None,
+        intervals: Optional[Mapping[TrackerMode, float]] = None,
+        default_interval: float = 300.0,
+        refresh_interval: float = 3600.0,
+        retry_interval: float = 60.0,
+        max_concurrency: int = 10,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the scheduler.
+
+        :param client: Client used to query the API
+        :type client: AsyncClient
+
+        :param trackers: Trackers to poll. If not provided, the trackers of the
+            account are retrieved every `refresh_interval` seconds, which also
+            updates their mode.
+        :type trackers: Iterable[Tracker], optional
+
+        :param intervals: Polling intervals by tracker mode, in seconds,
+            overriding :data:`DEFAULT_INTERVALS`
+        :type intervals: Mapping[TrackerMode, float], optional
+
+        :param default_interval: Polling interval of trackers whose mode has
+            no defined interval, in seconds
+        :type default_interval: float
+
+        :param refresh_interval: Interval between retrievals of the trackers
+            of the account, in seconds
+        :type refresh_interval: float
+
+        :param retry_interval: Delay before polling again after an unexpected
+            failure of the background task, in seconds
+        :type retry_interval: float
+
+        :param max_concurrency: Maximum count of trackers polled simultaneously
+        :type max_concurrency: int
+
+        :param timer: Function returning the current time in seconds
+        :type timer: Callable[[], float]
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer.")
+        self._client = client
+        self.intervals: Dict[TrackerMode, float] = {
+            **DEFAULT_INTERVALS,
+            **(intervals or {}),
+        }
+        self.default_interval: float = default_interval
+        self.refresh_interval: float = refresh_interval
+        self.retry_interval: float = retry_interval
+        self.max_concurrency: int = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._timer = timer
+
+        self._trackers: Dict[int, Tracker] = {}
+        self._next_poll: Dict[int, float] = {}
+        self._next_refresh: Optional[float] = None
+        self._status: Dict[int, TrackerStatus] = {}
+        self._subscribers: List[Subscriber] = []
+        self._queues: List[asyncio.Queue] = []
+        self._task: Optional[asyncio.Future] = None
+
+        if trackers is None:
+            self._next_refresh = timer()
+        else:
+            self._set_trackers(trackers)
+
+    def get_interval(self, tracker: Tracker) -> float:
+        """Return the polling interval of a tracker, in seconds."""
+        config = getattr(tracker, "tracker_config", None)
+        mode = getattr(config, "mode", None)
+        return self.intervals.get(mode, self.default_interval)  # type: ignore
+
+    def subscribe(self, callback: Subscriber):
+        """
+        Call a function on each published update.
+
+        :param callback: Function or coroutine function called with the update
+        :type callback: Callable[[TrackerUpdate], Optional[Awaitable[None]]]
+        """
+        self._subscribers.append(callback)
+
+    def updates(self, maxsize: int = 0) -> asyncio.Queue:
+        """
+        Return a queue receiving all published updates.
+
+        Polling waits for free space when the queue is full.
+
+        :param maxsize: Maximum size of the queue, unbounded if 0
+        :type maxsize: int
+
+        :return: Queue of TrackerUpdate
+        :rtype: asyncio.Queue
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._queues.append(queue)
+        return queue
+
+    def _set_trackers(self, trackers: Iterable[Tracker]):
+        """Replace the polled trackers, polling new ones immediately."""
+        now = self._timer()
+        self._trackers = {tracker.id: tracker for tracker in trackers}
+        self._next_poll = {
+            device_id: self._next_poll.get(device_id, now)
+            for device_id in self._trackers
+        }
+        for device_id in set(self._status) - set(self._trackers):
+            del self._status[device_id]
+
+    async def refresh(self):
+        """Retrieve the trackers of the account and their mode."""
+        self._set_trackers(await self._client.get_trackers())
+
+    async def poll(self, tracker: Tracker) -> TrackerUpdate:
+        """
+        Query the status and new locations of a tracker.
+
+        On the first poll of a tracker, only its most recent location is
+        returned.
+
+        :param tracker: Tracker to poll
+        :type tracker: Tracker
+
+        :return: Status and new locations of the tracker
+        :rtype: TrackerUpdate
+        """
+        update = TrackerUpdate(tracker=tracker)
+        if self._semaphore is None:
+            # Created lazily to be bound to the running event loop.
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            try:
+                update.status = await self._client.get_tracker_status(tracker)
+                update.locations = await self._client.tail_locations(
+                    tracker, initial_count=1
+                )
+            except GpsTrackerException as err:
+                update.error = err
+        return update
+
+    async def _publish(self, update: TrackerUpdate):
+        """Send an update to all subscribers and queues."""
+        for callback in self._subscribers:
+            # A failing subscriber must neither stop polling nor the others.
+            try:
+                result = callback(update)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Subscriber %r failed on update of tracker %s.",
+                    callback,
+                    update.tracker.id,
+                )
+        for queue in self._queues:
+            await queue.put(update)
+
+    async def run_once(self) -> float:
+        """
+        Poll the trackers which are due and publish their updates.
+
+        :return: Delay until the next poll is due, in seconds
+        :rtype: float
+        """
+        now = self._timer()
+        if self._next_refresh is not None and now >= self._next_refresh:
+            try:
+                await self.refresh()
+            except GpsTrackerException:
+                if not self._trackers:
+                    raise
+            self._next_refresh = now + self.refresh_interval
+
+        due = [self._trackers[id_] for id_, at in self._next_poll.items() if at <= now]
+        updates = await asyncio.gather(*[self.poll(tracker) for tracker in due])
+        for tracker, update in zip(due, updates):
+            self._next_poll[tracker.id] = self._timer() + self.get_interval(tracker)
+            status_changed = update.status is not None and update.status != (
+                self._status.get(tracker.id)
+            )
+            if update.status is not None:
+                self._status[tracker.id] = update.status
+            if update.locations or update.error is not None or status_changed:
+                await self._publish(update)
+
+        next_due = min(self._next_poll.values(), default=math.inf)
+        if self._next_refresh is not None:
+            next_due = min(next_due, self._next_refresh)
+        return max(0.0, next_due - self._timer())
+
+    async def run(self):
+        """
+        Poll trackers until cancelled.
+
+        Unexpected failures, such as the failure of the first retrieval of
+        the trackers, are logged and polling is attempted again after
+        `retry_interval` seconds.
+        """
+        while True:
+            try:
+                delay = await self.run_once()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Polling of trackers failed, retrying in %ss.", self.retry_interval
+                )
+                delay = self.retry_interval
+            await asyncio.sleep(delay)
+
+    def start(self) -> asyncio.Future:
+        """Run the scheduler in a background task and return this task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+        return self._task
+
+    async def stop(self):
+        """Cancel the background task started by :meth:`start`."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
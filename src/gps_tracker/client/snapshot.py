@@ -0,0 +1,50 @@
+"""Definition of fleet snapshots combining trackers, status and last location."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .datatypes import Tracker, TrackerData, TrackerStatus
+from .exceptions import GpsTrackerException
+
+try:
+    import attrs
+except ModuleNotFoundError:
+    # Handle attrs<21.3.0
+    import attr as attrs  # type: ignore[no-redef]
+
+
+@attrs.define
+class TrackerSnapshot:
+    """Current state of a tracker."""
+
+    tracker: Tracker
+    """Tracker as returned by the devices endpoint."""
+
+    status: Optional[TrackerStatus] = None
+    """Current status of the tracker, None if it could not be retrieved."""
+
+    location: Optional[TrackerData] = None
+    """Most recent location of the tracker, None if unknown."""
+
+    status_embedded: bool = False
+    """Whether the status was taken from the devices payload instead of queried."""
+
+    errors: List[GpsTrackerException] = attrs.Factory(list)
+    """Exceptions raised while querying the status or location of the tracker."""
+
+
+@attrs.define
+class FleetSnapshot:
+    """State of all trackers of an account at a given time."""
+
+    taken_at: datetime
+    """Date-time at which the trackers were retrieved from the API."""
+
+    trackers: Dict[int, TrackerSnapshot]
+    """State of each tracker by device id."""
+
+    def __len__(self) -> int:
+        """Return the count of trackers in the snapshot."""
+        return len(self.trackers)
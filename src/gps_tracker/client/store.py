@@ -0,0 +1,157 @@
+"""Local persistent storage of tracker locations."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Iterable, List, Mapping, Optional
+
+from .datatypes import TrackerData, _parse_rfc3339
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS locations (
+    device_id INTEGER NOT NULL,
+    uuid TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    datetime TEXT NOT NULL,
+    lat REAL NOT NULL,
+    lng REAL NOT NULL,
+    method INTEGER NOT NULL,
+    pkt_drop INTEGER NOT NULL,
+    precision INTEGER NOT NULL,
+    PRIMARY KEY (device_id, uuid)
+);
+CREATE INDEX IF NOT EXISTS locations_device_timestamp
+    ON locations (device_id, timestamp);
+"""
+
+_COLUMNS = ("datetime", "lat", "lng", "method", "pkt_drop", "precision", "uuid")
+
+
+class LocationStore:
+    """
+    SQLite storage of tracker locations.
+
+    Locations are indexed by tracker id and location uuid so that storing
+    the same location twice has no effect. The store can be shared by
+    several clients, including across threads.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Open (and create if needed) the location database.
+
+        :param path: Path of the SQLite database file, defaults to an
+            in-memory database.
+        :type path: str
+        """
+        self.path: str = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def __repr__(self) -> str:
+        """Represent the store by its path."""
+        return f"{self.__class__.__name__}(path={self.path!r})"
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def add(self, device_id: int, locations: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Store locations of a tracker.
+
+        :param device_id: Unique identifier of the tracker
+        :type device_id: int
+
+        :param locations: JSON representations of locations as returned by the API
+        :type locations: Iterable[Mapping[str, Any]]
+
+        :return: Count of locations which were not already stored
+        :rtype: int
+        """
+        rows = [
+            (
+                device_id,
+                loc["uuid"],
+                _parse_rfc3339(loc["datetime"]).timestamp(),
+                loc["datetime"],
+                float(loc["lat"]),
+                float(loc["lng"]),
+                int(loc["method"]),
+                int(loc["pkt_drop"]),
+                int(loc["precision"]),
+            )
+            for loc in locations
+        ]
+        with self._lock, self._connection:
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO locations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            return self._connection.total_changes - before
+
+    def newest(self, device_id: int) -> Optional[datetime]:
+        """
+        Return the date-time of the most recent stored location of a tracker.
+
+        :param device_id: Unique identifier of the tracker
+        :type device_id: int
+
+        :return: Date-time of the newest location, None if none is stored
+        :rtype: datetime.datetime, optional
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT datetime FROM locations WHERE device_id = ? "
+                "ORDER BY timestamp DESC LIMIT 1",
+                (device_id,),
+            ).fetchone()
+        return None if row is None else _parse_rfc3339(row[0])
+
+    def get_locations(
+        self,
+        device_id: int,
+        not_before: Optional[datetime] = None,
+        not_after: Optional[datetime] = None,
+        max_count: Optional[int] = None,
+    ) -> List[TrackerData]:
+        """
+        Return stored locations of a tracker, from the most recent to the oldest.
+
+        :param device_id: Unique identifier of the tracker
+        :type device_id: int
+
+        :param not_before: Minimum date-time of the locations to return.
+        :type not_before: datetime.datetime, optional
+
+        :param not_after: Maximum date-time of the locations to return.
+        :type not_after: datetime.datetime, optional
+
+        :param max_count: Maximum count of locations to return.
+        :type max_count: int, optional
+
+        :return: List of stored locations
+        :rtype: List[TrackerData]
+        """
+        query = f"SELECT {', '.join(_COLUMNS)} FROM locations WHERE device_id = ?"
+        params: List[Any] = [device_id]
+        if not_before is not None:
+            query += " AND timestamp >= ?"
+            params.append(not_before.timestamp())
+        if not_after is not None:
+            query += " AND timestamp <= ?"
+            params.append(not_after.timestamp())
+        query += " ORDER BY timestamp DESC"
+        if max_count is not None:
+            query += " LIMIT ?"
+            params.append(max_count)
+
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return [TrackerData(**dict(zip(_COLUMNS, row))) for row in rows]
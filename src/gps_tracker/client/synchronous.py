@@ -4,21 +4,48 @@
 from __future__ import annotations
 
 import datetime
-from json.decoder import JSONDecodeError
-from typing import TYPE_CHECKING, Any, List, Optional
+import itertools
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import requests
 
+from .backfill import merge_shards, split_time_range
+from .batch import TrackerDataBatch
+from .cache import cached
 from .datatypes import (
     Device,
+    LazyTrackerData,
     Tracker,
     TrackerConfig,
     TrackerData,
     TrackerStatus,
     User,
     form,
+    form_list,
+)
+from .exceptions import (
+    ApiConnectionError,
+    GpsTrackerException,
+    HttpException,
+    _copy_exception,
 )
-from .exceptions import ApiConnectionError, HttpException
+from .pagination import LocationPages
+from .rate_limit import parse_retry_after
+from .raw import RawAnswer
+from .tail import MemoryWatermarkStore, Watermark, WatermarkStore
 from .url_provider import UrlProvider
 
 if TYPE_CHECKING:
@@ -38,25 +65,85 @@ class Client:
         self._session.auth = requests.auth.HTTPBasicAuth(
             username=config.username, password=config.password
         )
+        # Do not block threads on a full pool: connections beyond the pool size
+        # are opened for the request and closed afterwards.
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=config.pool_per_host or config.pool_size, pool_block=False
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        if config.keepalive <= 0:
+            self._session.headers["Connection"] = "close"
+        self._timeout = (config.connect_timeout, config.read_timeout)
+
+        self._watermarks: WatermarkStore = (
+            MemoryWatermarkStore()
+            if config.watermark_store is None
+            else config.watermark_store
+        )
+
+    def _query(self, url: str, raw: bool = False) -> Any:
+        """
+        Query the API synchronously and return the decoded JSON response.
+
+        In raw mode, the undecoded answer is returned as a RawAnswer.
 
-    def _query(self, url: str) -> Any:
-        """Query the API synchronously and return the decoded JSON response."""
+        Queries failing with a transient error are attempted again
+        according to the retry policy of the configuration, if any.
+        """
+        policy = self._cfg.retry
+        if policy is None:
+            return self._send(url, raw)
+
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return self._send(url, raw)
+            except GpsTrackerException as err:
+                delay = policy.next_delay(err, attempt, time.monotonic() - start)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    def _send(self, url: str, raw: bool = False) -> Any:
+        """Send a request to the API and return the decoded JSON response."""
+        # Make the request conditional if a previous answer is cached
+        cached = None
+        if self._cfg.response_cache is not None and not raw:
+            cached = self._cfg.response_cache.get(url, account=self._cfg.username)
+        headers = None if cached is None else cached.conditional_headers()
 
         # Run the request
+        limiter = self._cfg.rate_limiter
+        if limiter is not None:
+            limiter.acquire()
         try:
-            request = self._session.get(url=url)
-        except requests.ConnectionError as err:
+            request = self._session.get(url=url, headers=headers, timeout=self._timeout)
+        except (requests.ConnectionError, requests.Timeout) as err:
             raise ApiConnectionError() from err
+        if limiter is not None:
+            limiter.feedback(
+                request.status_code,
+                retry_after=parse_retry_after(request.headers.get("Retry-After")),
+            )
 
-        # Extract JSON answer if possible
+        # Reuse cached answer if unchanged
+        if cached is not None and request.status_code == 304:
+            return cached.json_answer
+
+        # Extract JSON answer if possible, only for errors in raw mode
+        exception = HttpException.get(request.status_code)
         json_answer = None
-        try:
-            json_answer = request.json()
-        except JSONDecodeError:
-            pass
+        if not raw or exception is not None or not request.ok:
+            try:
+                json_answer = self._cfg.json_decoder(request.content)
+            except ValueError:
+                # Parent of JSONDecodeError of all backends
+                pass
 
         # Raise known exception if required
-        exception = HttpException.get(request.status_code)
         if exception is not None:
             raise exception(json_answer=json_answer)
 
@@ -69,6 +156,17 @@ class Client:
                 raise exception_class(json_answer=json_answer) from err
             raise err
 
+        if raw:
+            return RawAnswer(request.status_code, request.content)
+
+        if self._cfg.response_cache is not None:
+            self._cfg.response_cache.store(
+                url,
+                json_answer,
+                etag=request.headers.get("ETag"),
+                last_modified=request.headers.get("Last-Modified"),
+                account=self._cfg.username,
+            )
         return json_answer
 
     def get_user(self, user_id: int) -> User:
@@ -98,6 +196,7 @@ class Client:
         data = self._query(self._url_provider.users())
         return [form(User, item) for item in data]
 
+    @cached("device", key=lambda device_id: device_id)
     def get_device(self, device_id: int) -> Device:
         """
         Return a device referenced by its id.
@@ -112,6 +211,7 @@ class Client:
         data = self._query(self._url_provider.device(device_id))
         return Device.get(data)
 
+    @cached("devices", key=lambda kind=None: kind)
     def get_devices(self, kind: Optional[str] = None) -> List[Device]:
         """
         Return devices associated to credentials.
@@ -129,6 +229,7 @@ class Client:
         data = self._query(self._url_provider.devices(kind=kind))
         return [Device.get(item) for item in data]
 
+    @cached("trackers", key=lambda: None)
     def get_trackers(self) -> List[Tracker]:
         """
         Query API for the list of trackers associated to credentials.
@@ -150,6 +251,8 @@ class Client:
         not_before: Optional[datetime.datetime] = None,
         not_after: Optional[datetime.datetime] = None,
         max_count: int = 20,
+        prefetch: bool = False,
+        lazy: bool = False,
     ) -> List[TrackerData]:
         """
         Extract the list of tracker locations.
@@ -167,45 +270,356 @@ class Client:
             one API query yields 20 locations.
         :type max_count: int, optional
 
+        :param prefetch: Query the next page of locations while the current
+            one is being decoded.
+        :type prefetch: bool, optional
+
+        :param lazy: Return LazyTrackerData, whose date-time, method and uuid
+            are only converted when first read.
+        :type lazy: bool, optional
+
         :return: List of extracted locations
         :rtype: List[TrackerData]
+
+        :raises GpsTrackerException: If a query fails. The locations extracted
+            so far are stored in its `partial_locations` attribute and the
+            extraction can be resumed by passing its `resume_not_after`
+            attribute as `not_after`.
         """
-        not_before_ts: Optional[int] = (
-            None if not_before is None else not_before.timestamp().__ceil__()
-        )
+        locations: List[TrackerData] = []
+        try:
+            for location in self.iter_locations(
+                device,
+                not_before=not_before,
+                not_after=not_after,
+                max_count=max_count,
+                prefetch=prefetch,
+                lazy=lazy,
+            ):
+                locations.append(location)
+        except GpsTrackerException as err:
+            raise _copy_exception(err, partial_locations=locations) from err
+        return locations
+
+    def iter_locations(
+        self,
+        device: Tracker,
+        not_before: Optional[datetime.datetime] = None,
+        not_after: Optional[datetime.datetime] = None,
+        max_count: Optional[int] = None,
+        prefetch: bool = False,
+        lazy: bool = False,
+    ) -> Iterator[TrackerData]:
+        """
+        Iterate over tracker locations, from the most recent to the oldest.
+
+        Locations are retrieved page by page: a new API query is only
+        performed once all locations of the previous page have been consumed.
+        Stopping the iteration early thus avoids querying unused pages.
+
+        :param device: The tracker instance whose locations must be extracted.
+        :type device: Tracker
+
+        :param not_before: Minimum date-time of the locations to extract.
+        :type not_before: datetime.datetime, optional
+
+        :param not_after: Maximum date-time of the locations to extract.
+        :type not_after: datetime.datetime, optional
+
+        :param max_count: Maximum count of position to extract. All available
+            locations are extracted if not provided.
+        :type max_count: int, optional
+
+        :param prefetch: Query the next page of locations while the current
+            one is being decoded. The next page is then queried even if the
+            iteration is stopped before the end of the current page.
+        :type prefetch: bool, optional
 
-        not_after_ts: Optional[int] = (
-            None if not_after is None else not_after.timestamp().__floor__()
+        :param lazy: Yield LazyTrackerData, whose date-time, method and uuid
+            are only converted when first read.
+        :type lazy: bool, optional
+
+        :return: Iterator over extracted locations
+        :rtype: Iterator[TrackerData]
+        """
+        cls = LazyTrackerData if lazy else TrackerData
+        for page in self._iter_location_pages(
+            device,
+            not_before=not_before,
+            not_after=not_after,
+            max_count=max_count,
+            prefetch=prefetch,
+        ):
+            yield from form_list(cls, page)
+
+    def iter_raw_locations(
+        self,
+        device: Tracker,
+        not_before: Optional[datetime.datetime] = None,
+        not_after: Optional[datetime.datetime] = None,
+        max_count: Optional[int] = None,
+        prefetch: bool = False,
+    ) -> Iterator[RawAnswer]:
+        """
+        Iterate over the undecoded pages of tracker locations.
+
+        Pages are retrieved as with :meth:`iter_locations` but are not decoded:
+        only the date-time of their last location is read to query the next
+        page. This avoids decoding pages which are only forwarded, e.g. to a
+        message queue or an object storage. As pages are not truncated, the
+        last page may hold more locations than `max_count`.
+
+        :param device: The tracker instance whose locations must be extracted.
+        :type device: Tracker
+
+        :param not_before: Minimum date-time of the locations to extract.
+        :type not_before: datetime.datetime, optional
+
+        :param not_after: Maximum date-time of the locations to extract.
+        :type not_after: datetime.datetime, optional
+
+        :param max_count: Minimum count of position to extract. All available
+            locations are extracted if not provided.
+        :type max_count: int, optional
+
+        :param prefetch: Query the next page of locations while the current
+            one is being processed.
+        :type prefetch: bool, optional
+
+        :return: Iterator over the undecoded pages, with their status code
+        :rtype: Iterator[RawAnswer]
+        """
+        yield from self._iter_location_pages(
+            device,
+            not_before=not_before,
+            not_after=not_after,
+            max_count=max_count,
+            prefetch=prefetch,
+            raw=True,
         )
 
-        res = []
-        while max_count > 0:
-            data = self._query(
-                self._url_provider.locations(
-                    device_id=device.id,
-                    not_after=not_after_ts,
-                    not_before=not_before_ts,
+    def get_locations_batch(
+        self,
+        device: Tracker,
+        not_before: Optional[datetime.datetime] = None,
+        not_after: Optional[datetime.datetime] = None,
+        max_count: int = 20,
+        prefetch: bool = False,
+    ) -> TrackerDataBatch:
+        """
+        Extract tracker locations as a columnar batch.
+
+        Locations are stored as numpy arrays instead of
+        :class:`TrackerData <gps_tracker.client.datatypes.TrackerData>` instances,
+        which is faster and lighter for large location histories.
+        Requires numpy to be installed.
+
+        :param device: The tracker instance whose locations must be extracted.
+        :type device: Tracker
+
+        :param not_before: Minimum date-time of the locations to extract.
+        :type not_before: datetime.datetime, optional
+
+        :param not_after: Maximum date-time of the locations to extract.
+        :type not_after: datetime.datetime, optional
+
+        :param max_count: Maximum count of position to extract.
+        :type max_count: int, optional
+
+        :param prefetch: Query the next page of locations while the current
+            one is being decoded.
+        :type prefetch: bool, optional
+
+        :return: Batch of extracted locations
+        :rtype: TrackerDataBatch
+        """
+        return TrackerDataBatch.concatenate(
+            [
+                TrackerDataBatch.from_rows(page)
+                for page in self._iter_location_pages(
+                    device,
+                    not_before=not_before,
+                    not_after=not_after,
+                    max_count=max_count,
+                    prefetch=prefetch,
                 )
-            )  # Seems to return between 0 and 20 locations.
+            ]
+        )
 
-            # Stop if not result returned.
-            if len(data) == 0:
-                break
+    def sync_locations(self, device: Tracker) -> int:
+        """
+        Download tracker locations missing from the configured location store.
+
+        Only the locations more recent than the newest stored location
+        are queried. They are stored at once when all of them are received,
+        so that a failed synchronization can simply be run again. Stored
+        locations can then be read without any API call with
+        :meth:`gps_tracker.client.store.LocationStore.get_locations`.
+
+        :param device: The tracker instance whose locations must be synchronized.
+        :type device: Tracker
+
+        :return: Count of new locations added to the store
+        :rtype: int
+        """
+        store = self._cfg.location_store
+        if store is None:
+            raise ValueError("No location store defined in client configuration.")
+
+        newest = store.newest(device.id)
+        # Store the locations only once all pages are received: storing the
+        # most recent pages of a failed walk would skip the older locations
+        # at the next synchronization, which starts from the newest one.
+        pages = [
+            page
+            for page in self._iter_location_pages(
+                device,
+                not_before=None if newest is None else newest.replace(microsecond=0),
+            )
+        ]
+        return store.add(device.id, itertools.chain.from_iterable(pages))
+
+    def backfill_locations(
+        self,
+        device: Tracker,
+        not_before: datetime.datetime,
+        not_after: datetime.datetime,
+        shards: int = 10,
+        max_concurrency: int = 10,
+    ) -> List[TrackerData]:
+        """
+        Extract all tracker locations of a long time range in parallel threads.
 
-            # Pop returned results one by one and stop if max_count is reached.
-            while len(data) > 0:
-                tracker_data = data.pop(0)
-                res.append(form(TrackerData, tracker_data))
+        Locations are retrieved backward page by page: each query depends on
+        the previous one. To retrieve long histories faster, the time range
+        is split into `shards` contiguous shards whose pages are queried
+        concurrently on a pool of `max_concurrency` threads. Locations are
+        merged in time order and duplicates at shard bounds are dropped.
 
-                max_count -= 1
-                if max_count <= 0:
+        :param device: The tracker instance whose locations must be extracted.
+        :type device: Tracker
+
+        :param not_before: Minimum date-time of the locations to extract.
+        :type not_before: datetime.datetime
+
+        :param not_after: Maximum date-time of the locations to extract.
+        :type not_after: datetime.datetime
+
+        :param shards: Count of shards the time range is split into.
+        :type shards: int, optional
+
+        :param max_concurrency: Maximum count of shards queried simultaneously.
+        :type max_concurrency: int, optional
+
+        :return: Extracted locations, from the most recent to the oldest
+        :rtype: List[TrackerData]
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer.")
+
+        def _get_shard(bounds: Tuple[datetime.datetime, datetime.datetime]):
+            return list(
+                self.iter_locations(device, not_before=bounds[0], not_after=bounds[1])
+            )
+
+        time_shards = split_time_range(not_before, not_after, shards)
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            return merge_shards(executor.map(_get_shard, time_shards))
+
+    def tail_locations(
+        self, device: Tracker, initial_count: int = 20
+    ) -> List[TrackerData]:
+        """
+        Return the locations received since the previous call for a tracker.
+
+        The newest location returned for each tracker is remembered in the
+        watermark store of the configuration (in memory if not defined).
+        Only the locations more recent than this watermark are then queried,
+        and locations of the same second already returned are dropped.
+
+        :param device: The tracker instance whose new locations are queried.
+        :type device: Tracker
+
+        :param initial_count: Count of most recent locations returned when no
+            watermark is known for the tracker.
+        :type initial_count: int, optional
+
+        :return: New locations, from the most recent to the oldest
+        :rtype: List[TrackerData]
+        """
+        watermark = self._watermarks.get(device.id)
+        if watermark is None:
+            locations = self.get_locations(device, max_count=initial_count)
+        else:
+            locations = []
+            for location in self.iter_locations(
+                device, not_before=watermark.not_before
+            ):
+                # Locations are received from the most recent one: stop at
+                # older ones, skipping those of the watermark date-time which
+                # were already returned.
+                if location.datetime < watermark.datetime:
                     break
+                if watermark.is_new(location):
+                    locations.append(location)
 
-            # Update not_after to match the currently oldest location.
-            not_after_ts = res[-1].datetime.timestamp().__floor__()
+        new_watermark = Watermark.from_locations(locations, previous=watermark)
+        if new_watermark is not None and new_watermark != watermark:
+            self._watermarks.set(device.id, new_watermark)
+        return locations
 
-        return res
+    def _iter_location_pages(
+        self,
+        device: Tracker,
+        not_before: Optional[datetime.datetime] = None,
+        not_after: Optional[datetime.datetime] = None,
+        max_count: Optional[int] = None,
+        prefetch: bool = False,
+        raw: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Iterate over the pages of tracker locations answered by the API.
 
+        Pages are lists of locations as decoded JSON, or RawAnswer in raw mode.
+        """
+        pages = LocationPages(
+            self._url_provider, device.id, not_before, not_after, max_count
+        )
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        next_page: Optional[Future] = None
+        try:
+            while not pages.done:
+                try:
+                    if next_page is None:
+                        # Seems to return between 0 and 20 locations.
+                        data = self._query(pages.url(), raw)
+                    else:
+                        data = next_page.result()
+                        next_page = None
+                except GpsTrackerException as err:
+                    # Let the caller resume the extraction from the failed page.
+                    raise _copy_exception(
+                        err, resume_not_after=pages.resume_not_after
+                    ) from err
+
+                if raw:
+                    if not pages.advance_raw(data):
+                        break
+                else:
+                    data = pages.advance(data)
+                    if not data:
+                        break
+
+                # Start querying the next page before decoding the current one.
+                if executor is not None and not pages.done:
+                    next_page = executor.submit(self._query, pages.url(), raw)
+
+                yield data
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    @cached("tracker_status", key=lambda device: device.id)
     def get_tracker_status(self, device: Tracker) -> TrackerStatus:
         """
         Get the current status of a given tracker.
@@ -219,6 +633,7 @@ class Client:
         data = self._query(self._url_provider.tracker_status(device_id=device.id))
         return form(TrackerStatus, data)
 
+    @cached("tracker_config", key=lambda device: device.id)
     def get_tracker_config(self, device: Tracker) -> TrackerConfig:
         """
         Get the current configuration of a given tracker.
@@ -231,3 +646,113 @@ class Client:
         """
         data = self._query(self._url_provider.tracker_config(device_id=device.id))
         return form(TrackerConfig, data)
+
+    def get_multiple_locations(
+        self,
+        devices: Iterable[Tracker],
+        not_before: Optional[datetime.datetime] = None,
+        not_after: Optional[datetime.datetime] = None,
+        max_count: int = 20,
+        max_concurrency: int = 10,
+    ) -> Dict[int, Union[List[TrackerData], GpsTrackerException]]:
+        """
+        Extract the locations of several trackers in parallel threads.
+
+        Locations of each tracker are retrieved with :meth:`get_locations`
+        on a pool of `max_concurrency` threads sharing the client session.
+        A failure on one tracker does not interrupt the other ones: the
+        raised exception is returned in place of its locations.
+
+        :param devices: The tracker instances whose locations must be extracted.
+        :type devices: Iterable[Tracker]
+
+        :param not_before: Minimum date-time of the locations to extract.
+        :type not_before: datetime.datetime, optional
+
+        :param not_after: Maximum date-time of the locations to extract.
+        :type not_after: datetime.datetime, optional
+
+        :param max_count: Maximum count of position to extract per tracker.
+        :type max_count: int, optional
+
+        :param max_concurrency: Maximum count of trackers queried simultaneously.
+        :type max_concurrency: int, optional
+
+        :return: Extracted locations (or raised exception) by device id,
+            in the order of the given devices
+        :rtype: Dict[int, Union[List[TrackerData], GpsTrackerException]]
+
+        :raise ValueError: A tracker is given several times
+        """
+        return self._for_each_device(
+            self.get_locations,
+            devices,
+            max_concurrency,
+            not_before=not_before,
+            not_after=not_after,
+            max_count=max_count,
+        )
+
+    def get_multiple_tracker_status(
+        self, devices: Iterable[Tracker], max_concurrency: int = 10
+    ) -> Dict[int, Union[TrackerStatus, GpsTrackerException]]:
+        """
+        Get the current status of several trackers in parallel threads.
+
+        :param devices: The tracker instances whose status is queried.
+        :type devices: Iterable[Tracker]
+
+        :param max_concurrency: Maximum count of trackers queried simultaneously.
+        :type max_concurrency: int, optional
+
+        :return: Current status (or raised exception) by device id
+        :rtype: Dict[int, Union[TrackerStatus, GpsTrackerException]]
+
+        :raise ValueError: A tracker is given several times
+        """
+        return self._for_each_device(self.get_tracker_status, devices, max_concurrency)
+
+    def get_multiple_tracker_config(
+        self, devices: Iterable[Tracker], max_concurrency: int = 10
+    ) -> Dict[int, Union[TrackerConfig, GpsTrackerException]]:
+        """
+        Get the current configuration of several trackers in parallel threads.
+
+        :param devices: The tracker instances whose configuration is queried.
+        :type devices: Iterable[Tracker]
+
+        :param max_concurrency: Maximum count of trackers queried simultaneously.
+        :type max_concurrency: int, optional
+
+        :return: Current config (or raised exception) by device id
+        :rtype: Dict[int, Union[TrackerConfig, GpsTrackerException]]
+
+        :raise ValueError: A tracker is given several times
+        """
+        return self._for_each_device(self.get_tracker_config, devices, max_concurrency)
+
+    def _for_each_device(
+        self,
+        method: Callable[..., Any],
+        devices: Iterable[Tracker],
+        max_concurrency: int,
+        **kwargs: Any,
+    ) -> Dict[int, Any]:
+        """Call a method on several trackers in parallel, capturing failures."""
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer.")
+        devices = list(devices)
+        if len({device.id for device in devices}) < len(devices):
+            # Results are returned by device id: reject duplicates, which
+            # would silently be merged.
+            raise ValueError("Each tracker must be given only once.")
+
+        def _call(device: Tracker) -> Any:
+            try:
+                return method(device, **kwargs)
+            except GpsTrackerException as err:
+                return err
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            results = list(executor.map(_call, devices))
+        return {device.id: res for device, res in zip(devices, results)}
@@ -0,0 +1,177 @@
+"""Watermarks of the newest received locations, used to only query new ones."""
+
+from __future__ import annotations
+
+import abc
+import datetime as dt
+import json
+import os
+import threading
+import uuid
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from .datatypes import TrackerData, _date_converter, _uuid_converter
+
+try:
+    import attrs
+except ModuleNotFoundError:
+    # Handle attrs<21.3.0
+    import attr as attrs  # type: ignore[no-redef]
+
+
+def _uuids_converter(val: Iterable[uuid.UUID]) -> FrozenSet[uuid.UUID]:
+    """Convert identifiers to a frozenset of UUID."""
+    return frozenset(_uuid_converter(item) for item in val)
+
+
+@attrs.frozen
+class Watermark:
+    """Newest location received for a tracker."""
+
+    datetime: dt.datetime = attrs.field(converter=_date_converter)
+    """Date-time of the newest received location."""
+
+    uuids: FrozenSet[uuid.UUID] = attrs.field(
+        converter=_uuids_converter, factory=frozenset
+    )
+    """Identifiers of the received locations sharing this date-time."""
+
+    @classmethod
+    def from_locations(
+        cls, locations: Iterable[TrackerData], previous: Optional[Watermark] = None
+    ) -> Optional[Watermark]:
+        """
+        Form the watermark after receiving new locations.
+
+        :param locations: Received locations
+        :type locations: Iterable[TrackerData]
+
+        :param previous: Watermark before receiving the locations
+        :type previous: Watermark, optional
+
+        :return: Updated watermark, None if no location was ever received
+        :rtype: Watermark, optional
+        """
+        locations = list(locations)
+        if not locations:
+            return previous
+        newest = max(location.datetime for location in locations)
+        uuids = {location.uuid for location in locations if location.datetime == newest}
+        if previous is not None:
+            if previous.datetime > newest:
+                return previous
+            if previous.datetime == newest:
+                uuids |= previous.uuids
+        return cls(newest, uuids)
+
+    @property
+    def not_before(self) -> dt.datetime:
+        """Value of `not_before` querying the locations after this watermark."""
+        # The API filters on whole seconds: round down not to miss locations.
+        return self.datetime.replace(microsecond=0)
+
+    def is_new(self, location: TrackerData) -> bool:
+        """Return whether a location was received after this watermark."""
+        if location.datetime == self.datetime:
+            return location.uuid not in self.uuids
+        return location.datetime > self.datetime
+
+
+class WatermarkStore(abc.ABC):
+    """Base class of storages of watermarks by tracker id."""
+
+    @abc.abstractmethod
+    def get(self, device_id: int) -> Optional[Watermark]:
+        """
+        Return the watermark of a tracker.
+
+        :param device_id: Unique identifier of the tracker
+        :type device_id: int
+
+        :return: Watermark of the tracker, None if no location was received
+        :rtype: Watermark, optional
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set(self, device_id: int, watermark: Watermark):
+        """
+        Store the watermark of a tracker.
+
+        :param device_id: Unique identifier of the tracker
+        :type device_id: int
+
+        :param watermark: New watermark of the tracker
+        :type watermark: Watermark
+        """
+        raise NotImplementedError
+
+
+class MemoryWatermarkStore(WatermarkStore):
+    """Thread-safe storage of watermarks in memory."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._watermarks: Dict[int, Watermark] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Represent the store with its count of watermarks."""
+        return f"{self.__class__.__name__}(<{len(self._watermarks)} watermarks>)"
+
+    def get(self, device_id: int) -> Optional[Watermark]:
+        """Return the watermark of a tracker."""
+        with self._lock:
+            return self._watermarks.get(device_id)
+
+    def set(self, device_id: int, watermark: Watermark):
+        """Store the watermark of a tracker."""
+        with self._lock:
+            self._watermarks[device_id] = watermark
+
+
+class FileWatermarkStore(MemoryWatermarkStore):
+    """
+    Storage of watermarks persisted in a JSON file.
+
+    Watermarks are loaded from the file on creation and the file is
+    rewritten each time a watermark changes, so that polling stays
+    incremental across restarts.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store, loading persisted watermarks if any.
+
+        :param path: Path of the JSON file where watermarks are persisted
+        :type path: str
+        """
+        super().__init__()
+        self.path: str = path
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as fp:
+                for device_id, watermark in json.load(fp).items():
+                    self._watermarks[int(device_id)] = Watermark(
+                        dt.datetime.fromisoformat(watermark["datetime"]),
+                        watermark["uuids"],
+                    )
+
+    def __repr__(self) -> str:
+        """Represent the store by its path."""
+        return f"{self.__class__.__name__}(path={self.path!r})"
+
+    def set(self, device_id: int, watermark: Watermark):
+        """Store the watermark of a tracker and persist all watermarks."""
+        with self._lock:
+            self._watermarks[device_id] = watermark
+            data = {
+                str(dev_id): {
+                    "datetime": mark.datetime.isoformat(),
+                    "uuids": sorted(str(item) for item in mark.uuids),
+                }
+                for dev_id, mark in self._watermarks.items()
+            }
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fp:
+                json.dump(data, fp)
+            os.replace(tmp_path, self.path)
@@ -1,12 +1,21 @@
 """URL provider for specific Invoxia API queries."""
 
-from typing import Optional
+import urllib.parse
+from typing import Dict, Optional
+
+import yarl
 
 from .datatypes import Device
 
 
 class UrlProvider:
-    """URL provider generates the API urls used to access user data."""
+    """
+    URL provider generates the API urls used to access user data.
+
+    The prefixes of the URLs are formed once, as well as the URLs listing
+    each kind of devices, so that forming an URL only appends the device
+    id and query arguments to a prefix.
+    """
 
     def __init__(self, api_url: str = "https://labs.invoxia.io"):
         """
@@ -15,7 +24,30 @@ class UrlProvider:
         :param api_url: URL of the Invoxia API, defaults to https://labs.invoxia.io
         :type api_url: str
         """
-        self.api_url: str = api_url
+        self.api_url = api_url
+
+    @property
+    def api_url(self) -> str:
+        """URL of the Invoxia API."""
+        return self._api_url
+
+    @api_url.setter
+    def api_url(self, val: str):
+        """
+        Change the URL of the API and the prefixes formed from it.
+
+        The URL is encoded once here, so that the URLs formed from it can be
+        used as already encoded by :meth:`as_yarl`.
+
+        :raise ValueError: The URL is not an absolute HTTP(S) URL
+        """
+        url = yarl.URL(val)
+        if not url.is_absolute() or url.scheme not in ("http", "https"):
+            raise ValueError(f"Invalid API url {val!r}.")
+        self._api_url = str(url).rstrip("/")
+        self._users_url = self._form_url("users/")
+        self._devices_url = self._form_url("devices/")
+        self._kind_urls: Dict[str, str] = {}
 
     def _form_url(self, path: str) -> str:
         """
@@ -27,7 +59,24 @@ class UrlProvider:
         :return: complete url
         :rtype: str
         """
-        return f"{self.api_url}/{path}"
+        return f"{self._api_url}/{path}"
+
+    @staticmethod
+    def as_yarl(url: str) -> yarl.URL:
+        """
+        Convert an URL formed by the provider to a yarl.URL.
+
+        URLs formed by the provider are already encoded, from an API url
+        validated when set: the conversion skips their validation and aiohttp
+        uses the result without parsing it again.
+
+        :param url: URL formed by the provider
+        :type url: str
+
+        :return: URL as used by aiohttp
+        :rtype: yarl.URL
+        """
+        return yarl.URL(url, encoded=True)
 
     def users(self) -> str:
         """
@@ -36,7 +85,7 @@ class UrlProvider:
         :return: API URL
         :rtype: str
         """
-        return self._form_url("users/")
+        return self._users_url
 
     def user(self, user_id: int) -> str:
         """
@@ -48,7 +97,7 @@ class UrlProvider:
         :return: API URL
         :rtype: str
         """
-        return self._form_url(f"users/{user_id}/")
+        return f"{self._users_url}{user_id:d}/"
 
     def devices(self, kind: Optional[str] = None) -> str:
         """
@@ -60,14 +109,17 @@ class UrlProvider:
         :return: API URL
         :rtype: str
         """
-        arg = ""
-        if kind is not None:
-            if kind in Device.get_types():
-                arg = f"?type={kind}"
-            else:
-                raise KeyError(f"Device of kind '{kind}' are undefined.")
+        if kind is None:
+            return self._devices_url
 
-        return self._form_url(f"devices/{arg}")
+        url = self._kind_urls.get(kind)
+        if url is None:
+            # Device types are only registered, the URL can thus be kept.
+            if kind not in Device.get_types():
+                raise KeyError(f"Device of kind '{kind}' are undefined.")
+            url = f"{self._devices_url}?{urllib.parse.urlencode({'type': kind})}"
+            self._kind_urls[kind] = url
+        return url
 
     def device(self, device_id: int) -> str:
         """
@@ -79,7 +131,7 @@ class UrlProvider:
         :return: API URL
         :rtype: str
         """
-        return self._form_url(f"devices/{device_id}/")
+        return f"{self._devices_url}{device_id:d}/"
 
     def locations(
         self,
@@ -102,19 +154,20 @@ class UrlProvider:
         :return: API URL
         :rtype: str
         """
-        args = []
-        if not_before is not None:
-            args.append(f"timestamp={not_before}")
-        if not_after is not None:
-            args.append(f"timestamp_max={not_after}")
-        args_str = f"?{'&'.join(args)}" if args else ""
-
-        return self._form_url(f"devices/{device_id}/tracker_data/{args_str}")
+        url = f"{self._devices_url}{device_id:d}/tracker_data/"
+        # Integers formatted with 'd' never need to be escaped.
+        if not_before is None:
+            if not_after is None:
+                return url
+            return f"{url}?timestamp_max={not_after:d}"
+        if not_after is None:
+            return f"{url}?timestamp={not_before:d}"
+        return f"{url}?timestamp={not_before:d}&timestamp_max={not_after:d}"
 
     def tracker_status(self, device_id: int) -> str:
         """Form the URL to get the current tracker status."""
-        return self._form_url(f"devices/{device_id}/tracker_status/")
+        return f"{self._devices_url}{device_id:d}/tracker_status/"
 
     def tracker_config(self, device_id: int) -> str:
         """Form the URL to get the current tracker config."""
-        return self._form_url(f"devices/{device_id}/tracker_config/")
+        return f"{self._devices_url}{device_id:d}/tracker_config/"
@@ -13,7 +13,9 @@ from packaging.version import Version
 
 from gps_tracker.client.asynchronous import AsyncClient
 from gps_tracker.client.config import Config
+from gps_tracker.client.datatypes import Device
 from gps_tracker.client.synchronous import Client
+from tests.helpers import get_fixture_path
 
 
 def pytest_runtest_setup():
@@ -75,3 +77,17 @@ def json_data(request, name: str):
     path = pathlib.Path(request.fspath, "fixtures", name)
     with path.open("r") as fp:
         return json.load(fp)
+
+
+@pytest.fixture(name="rows")
+def fixture_rows():
+    """Load location rows from fixtures."""
+    with get_fixture_path("200_tracker_data_deviceid-878858.json").open("r") as fp:
+        return json.loads(json.load(fp)["content"])
+
+
+@pytest.fixture(name="tracker")
+def fixture_tracker():
+    """Load tracker from fixtures."""
+    with get_fixture_path("200_devices_type-tracker.json").open() as fp:
+        return Device.get(json.loads(json.load(fp)["content"])[0])
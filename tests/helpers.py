@@ -2,7 +2,7 @@
 import json
 import pathlib
 from importlib import import_module
-from typing import Any, Dict, Optional, Type
+from typing import Any, Dict, List, Optional, Type
 
 import aioresponses
 import attrs
@@ -21,6 +21,18 @@ def _exception_converter(val: str) -> Type[Exception]:
     return getattr(module, cls_name)
 
 
+class FakeTimer:  # pylint: disable=too-few-public-methods
+    """Timer whose time is set manually."""
+
+    def __init__(self):
+        """Start at time 0."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return current time."""
+        return self.now
+
+
 @attrs.define()
 class RequestFixture:
     """Structure of a request answer fixture."""
@@ -41,6 +53,10 @@ class RequestFixture:
         validator=attrs.validators.optional(attrs.validators.instance_of(str)),
         default=None,
     )
+    headers: Optional[Dict[str, str]] = attrs.field(
+        validator=attrs.validators.optional(attrs.validators.instance_of(dict)),
+        default=None,
+    )
 
 
 class AiohttpMock:
@@ -65,6 +81,9 @@ class AiohttpMock:
         if fixture.content is not None:
             opts["body"] = fixture.content
 
+        if fixture.headers is not None:
+            opts["headers"] = fixture.headers
+
         if fixture.exception is not None:
             msg = None if fixture.exception_msg is None else fixture.exception_msg
             opts["exception"] = fixture.exception(msg)
@@ -104,6 +123,9 @@ class RequestsMock:
         if fixture.content is not None:
             opts["text"] = fixture.content
 
+        if fixture.headers is not None:
+            opts["headers"] = fixture.headers
+
         if fixture.exception is not None:
             msg = None if fixture.exception_msg is None else fixture.exception_msg
             opts["exc"] = fixture.exception(msg)
@@ -113,8 +135,13 @@ class RequestsMock:
     def __enter__(self):
         """Mock aiohttp methods."""
         self.context.start()
+        # Answers to the same URL are returned in order, the last one repeating.
+        responses: Dict[str, List[Dict[str, Any]]] = {}
         for opt in self.opts:
-            self.context.get(**opt)
+            opt = dict(opt)
+            responses.setdefault(opt.pop("url"), []).append(opt)
+        for url, response_list in responses.items():
+            self.context.get(url, response_list)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Close mock context for aiohttp."""
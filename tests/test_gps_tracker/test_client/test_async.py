@@ -1,6 +1,8 @@
 """Test asynchronous client."""
 import asyncio
+import copy
 import datetime
+import json
 from typing import List
 from unittest.mock import patch
 
@@ -9,7 +11,9 @@ import pytest
 
 import gps_tracker.client.exceptions
 from gps_tracker.client.asynchronous import AsyncClient
+from gps_tracker.client.config import Config
 from gps_tracker.client.datatypes import Device, User
+from gps_tracker.client.decoding import get_json_decoder
 from tests.helpers import AiohttpMock
 
 
@@ -20,6 +24,23 @@ async def test_async_context(config_dummy):
         pass
 
 
+@pytest.mark.asyncio
+async def test_session_settings(config_dummy: Config):
+    """Test that connection settings of the config are applied."""
+    cfg = Config(
+        config_dummy.username,
+        config_dummy.password,
+        pool_size=20,
+        pool_per_host=5,
+        read_timeout=2,
+    )
+    async with AsyncClient(cfg) as client:
+        session = await client._get_session()
+        assert session.connector.limit == 20
+        assert session.connector.limit_per_host == 5
+        assert session.timeout.sock_read == 2
+
+
 @pytest.mark.asyncio
 async def test_get_users(async_client: AsyncClient):
     """Test users getter."""
@@ -198,6 +219,39 @@ async def test_no_connection(async_client: AsyncClient):
             await async_client._query("https://labs.invoxia.io/test/")
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+async def test_json_decoder(config_dummy: Config, backend):
+    """Test that answers are decoded with the decoder of the config."""
+    pytest.importorskip(backend)
+    decoded = []
+
+    def decoder(document):
+        decoded.append(document)
+        return get_json_decoder(backend)(document)
+
+    cfg = Config(config_dummy.username, config_dummy.password, json_decoder=decoder)
+    async with AsyncClient(cfg) as client:
+        with AiohttpMock("200_test.json"):
+            answer = await client._query("https://labs.invoxia.io/test/")
+        assert answer == {"status": "ok"}
+        assert len(decoded) == 1
+
+        with AiohttpMock("404_test.json"):
+            with pytest.raises(gps_tracker.client.exceptions.FailedQuery) as err:
+                await client._query("https://labs.invoxia.io/test/")
+        assert err.value.json_answer is None
+
+
+@pytest.mark.asyncio
+async def test_timeout(async_client: AsyncClient):
+    """Test behaviour when the API does not answer in time."""
+
+    with AiohttpMock("404_test_except-AsyncTimeoutError.json"):
+        with pytest.raises(gps_tracker.client.exceptions.ApiConnectionError):
+            await async_client._query("https://labs.invoxia.io/test/")
+
+
 @pytest.mark.asyncio
 async def test_answer_with_unexpected_field(async_client: AsyncClient):
     """Test behaviour with unhandled field returned by API."""
@@ -215,3 +269,191 @@ async def test_answer_with_missing_field(async_client: AsyncClient):
     with pytest.raises(gps_tracker.client.exceptions.UnknownAnswerScheme):
         with AiohttpMock("200_users_missing-field.json"):
             await async_client.get_users()
+
+
+@pytest.mark.asyncio
+async def test_get_multiple_locations(async_client: AsyncClient):
+    """Test getting locations of several trackers concurrently."""
+
+    with AiohttpMock("200_devices_type-tracker.json"):
+        trackers = await async_client.get_trackers()
+
+    tracker = trackers[0]
+    forbidden_tracker = copy.copy(tracker)
+    forbidden_tracker.id = 666666
+
+    with AiohttpMock(
+        "200_tracker_data_deviceid-878858.json",
+        "403_tracker_data_deviceid-666666.json",
+    ):
+        locations = await async_client.get_multiple_locations(
+            [tracker, forbidden_tracker], max_concurrency=1
+        )
+
+    assert list(locations) == [878858, 666666]
+    assert len(locations[878858]) == 20
+    assert isinstance(locations[666666], gps_tracker.client.exceptions.ForbiddenQuery)
+
+    with pytest.raises(ValueError):
+        await async_client.get_multiple_locations([tracker], max_concurrency=0)
+    with pytest.raises(ValueError):
+        await async_client.get_multiple_tracker_status([tracker, tracker])
+
+
+@pytest.mark.asyncio
+async def test_get_multiple_tracker_status(async_client: AsyncClient):
+    """Test getting status and config of several trackers concurrently."""
+
+    with AiohttpMock("200_devices_type-tracker.json"):
+        trackers = await async_client.get_trackers()
+
+    tracker = trackers[0]
+    forbidden_tracker = copy.copy(tracker)
+    forbidden_tracker.id = 666666
+
+    with AiohttpMock(
+        "200_tracker_status_deviceid-878858.json",
+        "403_tracker_status_deviceid-666666.json",
+        "200_tracker_config_deviceid-878858.json",
+    ):
+        status = await async_client.get_multiple_tracker_status(
+            [tracker, forbidden_tracker]
+        )
+        config = await async_client.get_multiple_tracker_config([tracker])
+
+    assert list(status) == [878858, 666666]
+    assert status[878858].battery == 58
+    assert isinstance(status[666666], gps_tracker.client.exceptions.ForbiddenQuery)
+    assert config[878858].mode is not None
+
+
+@pytest.mark.asyncio
+async def test_get_fleet_snapshot(config_dummy: Config):
+    """Test getting trackers with their status and last location."""
+    async with AsyncClient(config_dummy) as client:
+        with AiohttpMock(
+            "200_devices_type-tracker.json", "200_tracker_data_deviceid-878858.json"
+        ):
+            snapshot = await client.get_fleet_snapshot()
+
+        assert len(snapshot) == 1
+        assert client.stats.requests == 2
+        tracker_snapshot = snapshot.trackers[878858]
+        assert tracker_snapshot.errors == []
+        assert tracker_snapshot.status_embedded
+        assert tracker_snapshot.status is tracker_snapshot.tracker.tracker_status
+        assert tracker_snapshot.location.datetime == datetime.datetime(
+            2019, 11, 6, 22, 57, 45, 911989, tzinfo=datetime.timezone.utc
+        )
+
+        with AiohttpMock(
+            "200_devices_type-tracker.json",
+            "200_tracker_status_deviceid-878858.json",
+            "403_tracker_data_deviceid-878858.json",
+        ):
+            snapshot = await client.get_fleet_snapshot(status_max_age=None)
+
+        tracker_snapshot = snapshot.trackers[878858]
+        assert not tracker_snapshot.status_embedded
+        assert tracker_snapshot.status.battery == 58
+        assert tracker_snapshot.location is None
+        assert isinstance(
+            tracker_snapshot.errors[0], gps_tracker.client.exceptions.ForbiddenQuery
+        )
+
+
+@pytest.mark.asyncio
+async def test_iter_locations(async_client: AsyncClient):
+    """Test iterating over all tracker locations page by page."""
+
+    with AiohttpMock("200_devices_type-tracker.json"):
+        trackers = await async_client.get_trackers()
+
+    with AiohttpMock(
+        "200_tracker_data_deviceid-878858.json",
+        "200_tracker_data_page2_deviceid-878858.json",
+        "200_tracker_data_page3_deviceid-878858.json",
+    ):
+        locations = [loc async for loc in async_client.iter_locations(trackers[0])]
+
+    assert len(locations) == 71
+    assert locations[-1].datetime.timestamp() == 1572602400
+
+    with AiohttpMock("200_tracker_data_deviceid-878858.json"):
+        locations = []
+        async for location in async_client.iter_locations(trackers[0]):
+            locations.append(location)
+            if len(locations) == 5:
+                break
+
+    assert len(locations) == 5
+
+
+@pytest.mark.asyncio
+async def test_iter_raw_locations(async_client: AsyncClient):
+    """Test iterating over undecoded pages of tracker locations."""
+
+    with AiohttpMock("200_devices_type-tracker.json"):
+        trackers = await async_client.get_trackers()
+
+    with AiohttpMock(
+        "200_tracker_data_deviceid-878858.json",
+        "200_tracker_data_page2_deviceid-878858.json",
+        "200_tracker_data_page3_deviceid-878858.json",
+    ):
+        pages = [page async for page in async_client.iter_raw_locations(trackers[0])]
+
+    assert [page.status for page in pages] == [200, 200]
+    assert sum(len(json.loads(page.content)) for page in pages) == 71
+
+    with AiohttpMock("403_tracker_data_deviceid-878858.json"):
+        with pytest.raises(gps_tracker.client.exceptions.ForbiddenQuery):
+            async for _ in async_client.iter_raw_locations(trackers[0]):
+                pass
+
+
+@pytest.mark.asyncio
+async def test_get_locations_prefetch(async_client: AsyncClient):
+    """Test getting locations while prefetching next pages."""
+
+    with AiohttpMock("200_devices_type-tracker.json"):
+        trackers = await async_client.get_trackers()
+
+    with AiohttpMock(
+        "200_tracker_data_deviceid-878858.json",
+        "200_tracker_data_page2_deviceid-878858.json",
+        "200_tracker_data_page3_deviceid-878858.json",
+    ):
+        locations = await async_client.get_locations(
+            trackers[0], max_count=100, prefetch=True
+        )
+
+    assert len(locations) == 71
+    assert locations[-1].datetime.timestamp() == 1572602400
+
+
+@pytest.mark.asyncio
+async def test_query_coalescing(config_dummy):
+    """Test that concurrent identical queries share a single request."""
+
+    async with AsyncClient(config_dummy) as client:
+        with AiohttpMock("200_devices_type-tracker.json"):
+            trackers = await client.get_trackers()
+
+        with AiohttpMock("200_tracker_status_deviceid-878858.json"):
+            statuses = await asyncio.gather(
+                *[client.get_tracker_status(trackers[0]) for _ in range(3)]
+            )
+        assert all(status.battery == 58 for status in statuses)
+
+        with AiohttpMock("403_user_id-666666.json"):
+            errors = await asyncio.gather(
+                client.get_user(666666), client.get_user(666666), return_exceptions=True
+            )
+        assert all(
+            isinstance(err, gps_tracker.client.exceptions.ForbiddenQuery)
+            for err in errors
+        )
+
+    assert client.stats.requests == 3
+    assert client.stats.coalesced == 3
@@ -0,0 +1,91 @@
+"""Test parallel extraction of locations split by time range."""
+
+import datetime
+import uuid
+
+import pytest
+
+from gps_tracker.client.asynchronous import AsyncClient
+from gps_tracker.client.backfill import merge_shards, split_time_range
+from gps_tracker.client.datatypes import TrackerData
+from gps_tracker.client.synchronous import Client
+from tests.helpers import AiohttpMock, RequestsMock
+
+NOT_BEFORE = datetime.datetime.fromtimestamp(1572602400, tz=datetime.timezone.utc)
+NOT_AFTER = datetime.datetime.fromtimestamp(1572971544.5, tz=datetime.timezone.utc)
+FIXTURES = (
+    "200_tracker_data_shard-1572786972-1572971544_deviceid-878858.json",
+    "200_tracker_data_shard-1572786972-1572786972_deviceid-878858.json",
+    "200_tracker_data_shard-1572602400-1572786972_deviceid-878858.json",
+    "200_tracker_data_shard-1572602400-1572602400_deviceid-878858.json",
+)
+
+
+def _timestamps(shards):
+    """Return the bounds of shards as timestamps."""
+    return [(start.timestamp(), end.timestamp()) for start, end in shards]
+
+
+def test_split_time_range():
+    """Test splitting time ranges on whole seconds."""
+    assert _timestamps(split_time_range(NOT_BEFORE, NOT_AFTER, 2)) == [
+        (1572786972, 1572971544),
+        (1572602400, 1572786972),
+    ]
+
+    start = datetime.datetime(2022, 1, 1, 0, 0, 0, 500000, datetime.timezone.utc)
+    end = start + datetime.timedelta(seconds=2)
+    assert len(split_time_range(start, end, 10)) == 1
+    assert split_time_range(end, start, 10) == []
+
+    with pytest.raises(ValueError):
+        split_time_range(start, end, 0)
+
+
+def test_merge_shards():
+    """Test merging shards in time order without duplicates."""
+    locations = [
+        TrackerData(
+            datetime=f"2022-01-0{day}T00:00:00.000000Z",
+            lat=0,
+            lng=0,
+            method=2,
+            pkt_drop=0,
+            precision=10,
+            uuid=uuid.uuid4(),
+        )
+        for day in range(1, 5)
+    ]
+    merged = merge_shards([locations[2:], locations[:3]])
+    assert merged == locations[::-1]
+
+
+def test_backfill_locations(sync_client: Client, tracker):
+    """Test extracting locations of shards in parallel threads."""
+    with RequestsMock(*FIXTURES):
+        locations = sync_client.backfill_locations(
+            tracker, NOT_BEFORE, NOT_AFTER, shards=2
+        )
+
+    assert len(locations) == 5
+    assert locations[0].datetime.timestamp() == 1572811200
+    assert locations[-1].datetime.timestamp() == 1572602400
+
+    with pytest.raises(ValueError):
+        sync_client.backfill_locations(
+            tracker, NOT_BEFORE, NOT_AFTER, max_concurrency=0
+        )
+
+
+@pytest.mark.asyncio
+async def test_backfill_locations_async(async_client: AsyncClient, tracker):
+    """Test extracting locations of shards concurrently."""
+    with AiohttpMock(*FIXTURES):
+        locations = await async_client.backfill_locations(
+            tracker, NOT_BEFORE, NOT_AFTER, shards=2
+        )
+
+    assert len(locations) == 5
+    assert [loc.datetime for loc in locations] == sorted(
+        (loc.datetime for loc in locations), reverse=True
+    )
@@ -0,0 +1,85 @@
+"""Test columnar batches of tracker locations."""
+
+import pytest
+
+from gps_tracker.client.asynchronous import AsyncClient
+from gps_tracker.client.datatypes import TrackerData, form
+from gps_tracker.client.exceptions import UnknownAnswerScheme
+from gps_tracker.client.synchronous import Client
+from tests.helpers import AiohttpMock, RequestsMock
+
+np = pytest.importorskip("numpy")
+
+# pylint: disable=wrong-import-position
+from gps_tracker.client.batch import TrackerDataBatch  # noqa: E402
+
+
+def test_from_rows(rows):
+    """Test that batch rows match eagerly formed TrackerData."""
+    batch = TrackerDataBatch.from_rows(rows)
+
+    assert len(batch) == len(rows)
+    assert batch.datetime.dtype == np.int64
+    assert batch.lat.dtype == np.float64
+    assert batch.uuid.dtype.itemsize == 16
+    assert batch.to_list() == [form(TrackerData, row) for row in rows]
+    assert batch[-1] == form(TrackerData, rows[-1])
+
+
+def test_from_rows_missing_field(rows):
+    """Test that a location missing a field is reported as unknown scheme."""
+    rows = [dict(row) for row in rows]
+    del rows[3]["precision"]
+
+    with pytest.raises(UnknownAnswerScheme) as excinfo:
+        TrackerDataBatch.from_rows(rows)
+    assert excinfo.value.json_data is rows[3]
+
+
+def test_slice_and_concatenate(rows):
+    """Test slicing, masking and concatenation of batches."""
+    batch = TrackerDataBatch.from_rows(rows)
+
+    head, tail = batch[:10], batch[10:]
+    assert len(head) == 10
+    assert len(tail) == len(rows) - 10
+
+    joined = TrackerDataBatch.concatenate([head, tail])
+    assert np.array_equal(joined.datetime, batch.datetime)
+    assert list(joined) == list(batch)
+
+    gps_only = batch[batch.precision < 50]
+    assert all(location.precision < 50 for location in gps_only)
+
+    assert len(TrackerDataBatch.concatenate([])) == 0
+
+
+def test_get_locations_batch(sync_client: Client, rows):
+    """Test getting locations as batch with synchronous client."""
+
+    with RequestsMock("200_devices_type-tracker.json"):
+        trackers = sync_client.get_trackers()
+
+    with RequestsMock("200_tracker_data_deviceid-878858.json"):
+        batch = sync_client.get_locations_batch(trackers[0], max_count=30)
+
+    assert len(batch) == 30
+    assert batch[0] == form(TrackerData, rows[0])
+
+
+@pytest.mark.asyncio
+async def test_get_locations_batch_async(async_client: AsyncClient, rows):
+    """Test getting locations as batch with asynchronous client."""
+
+    with AiohttpMock("200_devices_type-tracker.json"):
+        trackers = await async_client.get_trackers()
+
+    with AiohttpMock(
+        "200_tracker_data_deviceid-878858.json",
+        "200_tracker_data_page2_deviceid-878858.json",
+        "200_tracker_data_page3_deviceid-878858.json",
+    ):
+        batch = await async_client.get_locations_batch(trackers[0], max_count=100)
+
+    assert len(batch) == 71
+    assert batch[-1].datetime.timestamp() == 1572602400
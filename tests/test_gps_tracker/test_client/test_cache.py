@@ -0,0 +1,230 @@
+"""Test caches of API answers."""
+
+import asyncio
+import http.server
+import json
+import threading
+
+import pytest
+
+from gps_tracker.client.asynchronous import AsyncClient
+from gps_tracker.client.cache import MISSING, ResponseCache, TTLCache
+from gps_tracker.client.config import Config
+from gps_tracker.client.synchronous import Client
+from tests.helpers import AiohttpMock, FakeTimer, RequestsMock, get_fixture_path
+
+ETAG = '"5f3a"'
+LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+
+def test_ttl_cache_expiry():
+    """Test that entries expire after their endpoint time-to-live."""
+    timer = FakeTimer()
+    cache = TTLCache(
+        ttl=10, endpoint_ttl={"tracker_status": 2, "device": 0}, timer=timer
+    )
+
+    cache.set("devices", None, "devices")
+    cache.set("tracker_status", 1, "status")
+    cache.set("device", 1, "device")
+    assert cache.get("devices", None) == "devices"
+    assert cache.get("tracker_status", 1) == "status"
+    assert cache.get("device", 1) is MISSING
+
+    timer.now = 5
+    assert cache.get("devices", None) == "devices"
+    assert cache.age("devices", None) == 5
+    assert cache.get("tracker_status", 1) is MISSING
+    assert cache.age("tracker_status", 1) is None
+
+    timer.now = 10
+    assert cache.get("devices", None) is MISSING
+    assert len(cache) == 0
+
+
+def test_ttl_cache_eviction():
+    """Test that least recently used entries are evicted first."""
+    cache = TTLCache(maxsize=2)
+
+    cache.set("device", 1, "first")
+    cache.set("device", 2, "second")
+    assert cache.get("device", 1) == "first"
+    cache.set("device", 3, "third")
+
+    assert cache.get("device", 2) is MISSING
+    assert cache.get("device", 1) == "first"
+    assert cache.get("device", 3) == "third"
+
+    cache.set("devices", None, "devices")
+    cache.invalidate("device")
+    assert len(cache) == 1
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_client_cache(config_dummy: Config):
+    """Test that cached answers do not query the API again."""
+    config = Config(config_dummy.username, config_dummy.password, cache=TTLCache())
+    client = Client(config)
+
+    with RequestsMock(
+        "200_devices_type-tracker.json", "200_tracker_config_deviceid-878858.json"
+    ):
+        trackers = client.get_trackers()
+        tracker_config = client.get_tracker_config(trackers[0])
+
+    # No mock is active anymore: any query would fail.
+    assert client.get_trackers() is trackers
+    assert client.get_tracker_config(trackers[0]) is tracker_config
+
+
+def test_client_cache_accounts(config_dummy: Config):
+    """Test that clients of different accounts do not share cached answers."""
+    cache = TTLCache()
+    client = Client(Config(config_dummy.username, config_dummy.password, cache=cache))
+    other_client = Client(Config("other@test.com", config_dummy.password, cache=cache))
+
+    with RequestsMock("200_devices_type-tracker.json"):
+        trackers = client.get_trackers()
+
+    with RequestsMock("200_devices_type-tracker.json"):
+        other_trackers = other_client.get_trackers()
+    assert other_trackers is not trackers
+    assert client.get_trackers() is trackers
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_client_cache(config_dummy: Config):
+    """Test that concurrent calls share a single query."""
+    config = Config(config_dummy.username, config_dummy.password, cache=TTLCache())
+
+    async with AsyncClient(config) as client:
+        with AiohttpMock("200_devices_type-tracker.json"):
+            trackers1, trackers2 = await asyncio.gather(
+                client.get_trackers(), client.get_trackers()
+            )
+        assert trackers1 is trackers2
+
+        with AiohttpMock("200_tracker_status_deviceid-878858.json"):
+            statuses = await asyncio.gather(
+                *[client.get_tracker_status(trackers1[0]) for _ in range(3)]
+            )
+        assert all(status is statuses[0] for status in statuses)
+        assert await client.get_tracker_status(trackers1[0]) is statuses[0]
+
+
+@pytest.mark.asyncio
+async def test_async_fleet_snapshot_cache_age(config_dummy: Config):
+    """Test that fleet snapshots account for the age of cached trackers."""
+    timer = FakeTimer()
+    config = Config(
+        config_dummy.username,
+        config_dummy.password,
+        cache=TTLCache(ttl=60, endpoint_ttl={"tracker_status": 0}, timer=timer),
+    )
+
+    async with AsyncClient(config) as client:
+        with AiohttpMock("200_devices_type-tracker.json"):
+            await client.get_trackers()
+
+        timer.now = 30
+        with AiohttpMock(
+            "200_tracker_status_deviceid-878858.json",
+            "200_tracker_data_deviceid-878858.json",
+        ):
+            snapshot = await client.get_fleet_snapshot(status_max_age=10)
+
+    assert not snapshot.trackers[878858].status_embedded
+
+
+class ConditionalHandler(http.server.BaseHTTPRequestHandler):
+    """Serve the tracker config fixture with validators."""
+
+    requests = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answer 304 if the ETag matches, the tracker config otherwise."""
+        self.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        with get_fixture_path("200_tracker_config_deviceid-878858.json").open() as fp:
+            content = json.load(fp)["content"].encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Silence server logs."""
+
+
+@pytest.fixture(name="stub_url")
+def fixture_stub_url():
+    """Run a local HTTP server answering conditional requests."""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ConditionalHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    ConditionalHandler.requests = []
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_conditional_requests(config_dummy: Config, stub_url, tracker, tmp_path):
+    """Test that unchanged answers are reused from the response cache."""
+    path = str(tmp_path.joinpath("responses.json"))
+    config = Config(
+        config_dummy.username,
+        config_dummy.password,
+        api_url=stub_url,
+        response_cache=ResponseCache(path=path),
+    )
+    client = Client(config)
+
+    tracker_config = client.get_tracker_config(tracker)
+    assert client.get_tracker_config(tracker) == tracker_config
+    assert "If-None-Match" not in ConditionalHandler.requests[0]
+    assert ConditionalHandler.requests[1]["If-None-Match"] == ETAG
+    assert ConditionalHandler.requests[1]["If-Modified-Since"] == LAST_MODIFIED
+
+    config.response_cache.save()
+    config.response_cache = ResponseCache(path=path)
+    assert len(config.response_cache) == 1
+    assert Client(config).get_tracker_config(tracker) == tracker_config
+    assert ConditionalHandler.requests[2]["If-None-Match"] == ETAG
+
+    # Answers are kept by account.
+    with open(path, "r", encoding="utf-8") as fp:
+        assert list(json.load(fp)) == [config.username]
+    other_config = Config("other@test.com", config.password, api_url=stub_url)
+    other_config.response_cache = config.response_cache
+    assert Client(other_config).get_tracker_config(tracker) == tracker_config
+    assert "If-None-Match" not in ConditionalHandler.requests[3]
+    assert len(config.response_cache) == 2
+
+    with pytest.raises(ValueError):
+        ResponseCache().save()
+
+
+@pytest.mark.asyncio
+async def test_conditional_requests_async(config_dummy: Config, stub_url, tracker):
+    """Test that unchanged answers are reused from the response cache."""
+    config = Config(
+        config_dummy.username,
+        config_dummy.password,
+        api_url=stub_url,
+        response_cache=ResponseCache(maxsize=1),
+    )
+
+    async with AsyncClient(config) as client:
+        tracker_config = await client.get_tracker_config(tracker)
+        assert await client.get_tracker_config(tracker) == tracker_config
+
+    assert ConditionalHandler.requests[1]["If-None-Match"] == ETAG
@@ -0,0 +1,207 @@
+"""Test conversion of API answers to datatypes."""
+
+import json
+import pickle
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import attrs
+import pytest
+
+from gps_tracker.client import datatypes
+from gps_tracker.client.datatypes import (
+    Device,
+    LazyTrackerData,
+    TrackerData,
+    _date_converter,
+    _epoch_seconds,
+    form,
+    form_list,
+)
+from gps_tracker.client.exceptions import UnknownAnswerScheme
+from tests.helpers import get_fixture_path
+
+
+@pytest.mark.parametrize(
+    "val,expected",
+    [
+        (None, None),
+        (
+            "2019-11-06T22:57:45.911989Z",
+            datetime(2019, 11, 6, 22, 57, 45, 911989, tzinfo=timezone.utc),
+        ),
+        (
+            "2019-11-07T14:12:13.798307",
+            datetime(2019, 11, 7, 14, 12, 13, 798307, tzinfo=timezone.utc),
+        ),
+        (
+            "2019-11-07T14:12:13.7+02:00",
+            datetime(
+                2019, 11, 7, 14, 12, 13, 700000, tzinfo=timezone(timedelta(hours=2))
+            ),
+        ),
+        (
+            "2019-11-07T14:12:13.790-0530",
+            datetime(
+                2019,
+                11,
+                7,
+                14,
+                12,
+                13,
+                790000,
+                tzinfo=timezone(-timedelta(hours=5, minutes=30)),
+            ),
+        ),
+    ],
+)
+def test_date_converter(val, expected):
+    """Test parsing of RFC3339 datetimes with and without UTC offset."""
+    assert _date_converter(val) == expected
+    if expected is not None:
+        assert _date_converter(val).utcoffset() == expected.utcoffset()
+
+
+@pytest.mark.parametrize("val", ["2019-11-07T14:12:13Z", "2019-11-07", "invalid"])
+def test_date_converter_invalid(val):
+    """Test that malformed datetimes are rejected."""
+    with pytest.raises(ValueError):
+        _date_converter(val)
+
+
+@pytest.mark.parametrize(
+    "val",
+    [
+        "2019-11-06T22:57:45.911989Z",
+        "2019-11-07T14:12:13.798307",
+        "2019-11-07T14:12:13.7+02:00",
+        "2019-11-07T14:12:13.790-0530",
+    ],
+)
+def test_epoch_seconds(val):
+    """Test that epoch seconds match the floored timestamp of the datetime."""
+    assert _epoch_seconds(val) == _date_converter(val).timestamp().__floor__()
+
+
+def test_form_list():
+    """Test that bulk decoding matches decoding items one by one."""
+    data = [
+        {
+            "datetime": f"2019-11-0{day}T10:00:00.000000Z",
+            "lat": 0,
+            "lng": 0,
+            "method": 2,
+            "pkt_drop": 0,
+            "precision": 10,
+            "uuid": f"5f0c7a1e-2b3d-4e8f-9a6b-7c1d2e3f4a5{day}",
+        }
+        for day in range(1, 4)
+    ]
+    assert form_list(TrackerData, data) == [form(TrackerData, item) for item in data]
+
+    with pytest.raises(UnknownAnswerScheme):
+        form_list(TrackerData, [*data, {"datetime": data[0]["datetime"]}])
+
+
+def test_lazy_tracker_data():
+    """Test that lazy locations convert fields on access and match eager ones."""
+    data = {
+        "datetime": "2019-11-07T10:00:00.000000Z",
+        "lat": "48.858370",
+        "lng": "2.294481",
+        "method": 2,
+        "pkt_drop": 0,
+        "precision": 75,
+        "uuid": "5f0c7a1e-2b3d-4e8f-9a6b-7c1d2e3f4a5b",
+        "battery": 42,
+    }
+    eager = form(TrackerData, data)
+    lazy = form(LazyTrackerData, data)
+
+    assert lazy._raw_uuid == data["uuid"]
+    assert lazy.lat == eager.lat
+    assert lazy.uuid == uuid.UUID(data["uuid"])
+    assert lazy.uuid is lazy.uuid
+    assert lazy.method is datatypes.TrackerMethod.GPS
+    assert lazy.datetime == eager.datetime
+
+    assert lazy == eager
+    assert eager == lazy
+    assert not lazy != eager
+    assert hash(lazy) == hash(lazy.uuid)
+    assert len({lazy, form(LazyTrackerData, data)}) == 1
+    with pytest.raises(TypeError):
+        hash(eager)
+    assert pickle.loads(pickle.dumps(lazy)) == eager
+    assert repr(lazy).startswith("LazyTrackerData(")
+
+    lazy.uuid = "5f0c7a1e-2b3d-4e8f-9a6b-7c1d2e3f4a5c"
+    assert isinstance(lazy.uuid, uuid.UUID)
+    assert lazy != eager
+
+    with pytest.raises(UnknownAnswerScheme):
+        form_list(LazyTrackerData, [{"datetime": data["datetime"]}])
+
+
+@pytest.mark.parametrize(
+    "cls",
+    [
+        datatypes.User,
+        datatypes.Android,
+        datatypes.Iphone,
+        datatypes.Tracker01,
+        datatypes.TrackerConfig,
+        datatypes.TrackerStatus,
+        datatypes.TrackerData,
+        datatypes.LazyTrackerData,
+    ],
+)
+def test_datatypes_slotted(cls):
+    """Test that datatype instances do not hold a __dict__."""
+    assert "__dict__" not in dir(cls)
+
+
+def test_device_registry():
+    """Test that registered device types are the final slotted classes."""
+    assert Device.get_types() == {"android", "iphone", "tracker", "tracker_01"}
+    assert Device._registry["tracker_01"] is datatypes.Tracker01
+    assert Device._registry["android"] is datatypes.Android
+
+
+def test_device_get_keeps_data():
+    """Test that forming a device does not modify the API answer."""
+    device_data = {
+        "id": 0,
+        "name": "Android device",
+        "type": "android",
+        "serial": "8a7c7bd2-8f1e-4ea7-9df4-4ed9d6f2b7a1",
+        "created": "2004-11-04T13:37:00.000000Z",
+        "timezone": "Asia/Tokyo",
+        "version": "0.1.2",
+    }
+
+    assert isinstance(Device.get(device_data), datatypes.Android)
+    assert device_data["type"] == "android"
+
+
+def test_tracker_config_shared():
+    """Test that identical configs are shared and repeated strings interned."""
+    with get_fixture_path("200_devices_type-tracker.json").open() as fp:
+        content = fp.read()
+    # Each decoding forms distinct string objects.
+    first, second = (
+        Device.get(json.loads(json.loads(content)["content"])[0]) for _ in range(2)
+    )
+
+    assert first.tracker_config is second.tracker_config
+    with pytest.raises(attrs.exceptions.FrozenInstanceError):
+        first.tracker_config.mode = datatypes.TrackerMode.LOST
+    assert first.timezone is second.timezone
+    assert first.tracker_status is not second.tracker_status
+    assert first.tracker_status.state is second.tracker_status.state
+
+    data = json.loads(json.loads(content)["content"])[0]
+    data["tracker_config"]["mode"] = "1"
+    third = Device.get(data)
+    assert third.tracker_config is not first.tracker_config
+    assert third.tracker_config.network is first.tracker_config.network
@@ -0,0 +1,30 @@
+"""Test selection of the JSON decoder."""
+
+import json
+
+import pytest
+
+from gps_tracker.client.config import Config
+from gps_tracker.client.decoding import get_json_decoder
+
+
+def test_get_json_decoder():
+    """Test that the fastest installed backend is selected by default."""
+    assert get_json_decoder("json") is json.loads
+    with pytest.raises(ValueError):
+        get_json_decoder("pickle")
+
+    orjson = pytest.importorskip("orjson")
+    assert get_json_decoder() is orjson.loads
+    assert Config("", "").json_decoder is orjson.loads
+
+
+@pytest.mark.parametrize("backend", ["orjson", "ujson", "json"])
+def test_json_decoder_errors(backend):
+    """Test that invalid documents raise a ValueError with all backends."""
+    pytest.importorskip(backend)
+    decoder = get_json_decoder(backend)
+    assert decoder(b'{"status": "ok"}') == {"status": "ok"}
+    for document in (b"", b"<html></html>"):
+        with pytest.raises(ValueError):
+            decoder(document)
@@ -0,0 +1,60 @@
+"""Test the cursor over pages of tracker locations."""
+
+import datetime
+
+import pytest
+
+from gps_tracker.client.exceptions import UnknownAnswerScheme
+from gps_tracker.client.pagination import LocationPages
+from gps_tracker.client.url_provider import UrlProvider
+
+NOT_BEFORE = datetime.datetime.fromtimestamp(1572602399.5, tz=datetime.timezone.utc)
+NOT_AFTER = datetime.datetime.fromtimestamp(1573081065.5, tz=datetime.timezone.utc)
+
+
+def _page(*dates: str):
+    """Form a raw page of locations at given dates."""
+    return [{"datetime": date} for date in dates]
+
+
+def test_location_pages():
+    """Test that the cursor follows the oldest location of each page."""
+    pages = LocationPages(UrlProvider(), 878858, NOT_BEFORE, NOT_AFTER)
+    assert pages.url().endswith(
+        "/devices/878858/tracker_data/?timestamp=1572602400&timestamp_max=1573081065"
+    )
+    assert pages.resume_not_after == NOT_AFTER.replace(microsecond=0)
+
+    page = _page("2019-11-06T22:57:45.911989Z", "2019-11-06T22:50:00.5+01:00")
+    assert pages.advance(page) is page
+    assert pages.not_after == 1573077000
+    assert not pages.done
+
+    assert pages.advance([]) == []
+    assert pages.done
+
+
+def test_location_pages_max_count():
+    """Test that pages are truncated to the requested count of locations."""
+    pages = LocationPages(UrlProvider(), 878858, max_count=3)
+    assert pages.url().endswith("/devices/878858/tracker_data/")
+    assert pages.resume_not_after is None
+
+    page = _page("2019-11-06T22:57:45.911989Z", "2019-11-06T22:50:00.000000Z")
+    pages.advance(page)
+    assert pages.max_count == 1
+
+    assert pages.advance(page) == page[:1]
+    assert pages.not_after == 1573081065
+    assert pages.done
+
+
+@pytest.mark.parametrize(
+    "location", [{"lat": 0}, {"datetime": "06/11/2019"}, {"datetime": None}]
+)
+def test_location_pages_unknown_scheme(location):
+    """Test that pages without a valid date-time raise UnknownAnswerScheme."""
+    pages = LocationPages(UrlProvider(), 878858)
+    with pytest.raises(UnknownAnswerScheme) as excinfo:
+        pages.advance([{"datetime": "2019-11-06T22:57:45.911989Z"}, location])
+    assert excinfo.value.json_data is location
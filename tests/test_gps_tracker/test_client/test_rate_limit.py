@@ -0,0 +1,71 @@
+"""Test client-side rate limitation."""
+
+import pytest
+
+from gps_tracker.client.asynchronous import AsyncClient
+from gps_tracker.client.config import Config
+from gps_tracker.client.exceptions import FailedQuery
+from gps_tracker.client.rate_limit import RateLimiter, parse_retry_after
+from gps_tracker.client.synchronous import Client
+from tests.helpers import AiohttpMock, FakeTimer, RequestsMock
+
+
+def test_token_bucket():
+    """Test that requests are spaced once the burst is consumed."""
+    timer = FakeTimer()
+    limiter = RateLimiter(rate=2, burst=3, timer=timer)
+
+    assert [limiter.reserve() for _ in range(3)] == [0, 0, 0]
+    assert limiter.reserve() == pytest.approx(0.5)
+    assert limiter.reserve() == pytest.approx(1.0)
+
+    timer.now = 10
+    assert limiter.reserve() == 0
+
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+
+
+def test_adaptive_rate():
+    """Test that the rate backs off when throttled and recovers on success."""
+    timer = FakeTimer()
+    limiter = RateLimiter(rate=4, burst=1, min_rate=1, timer=timer)
+
+    limiter.feedback(429)
+    assert limiter.current_rate == 2
+    limiter.feedback(503)
+    limiter.feedback(500)
+    assert limiter.current_rate == 1
+
+    limiter.feedback(404)
+    assert limiter.current_rate == 1
+    for _ in range(20):
+        limiter.feedback(200)
+    assert limiter.current_rate == 4
+
+    limiter.feedback(429, retry_after=3)
+    assert limiter.reserve() == pytest.approx(3)
+
+
+def test_parse_retry_after():
+    """Test parsing of Retry-After header values."""
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+
+
+@pytest.mark.asyncio
+async def test_shared_limiter(config_dummy: Config):
+    """Test that a limiter shared by clients adapts to their answers."""
+    limiter = RateLimiter(rate=100, burst=5)
+    config = Config(config_dummy.username, config_dummy.password, rate_limiter=limiter)
+
+    with RequestsMock("503_test.json"):
+        with pytest.raises(FailedQuery):
+            Client(config)._query("https://labs.invoxia.io/test/")
+    assert limiter.current_rate == 50
+
+    async with AsyncClient(config) as client:
+        with AiohttpMock("200_users.json"):
+            await client.get_users()
+    assert limiter.current_rate == 60
@@ -0,0 +1,26 @@
+"""Test undecoded answers of the API."""
+
+import json
+
+import pytest
+
+from gps_tracker.client.raw import RawAnswer
+from tests.helpers import get_fixture_path
+
+
+def test_raw_answer():
+    """Test reading the cursor of a raw page without decoding it."""
+    with get_fixture_path("200_tracker_data_deviceid-878858.json").open() as fp:
+        content = json.load(fp)["content"].encode()
+    rows = json.loads(content)
+
+    answer = RawAnswer(200, content)
+    assert answer.count_locations() == len(rows)
+    assert answer.peek_oldest_datetime() == rows[-1]["datetime"]
+    assert answer.view.tobytes() == content
+    assert "bytes>" in repr(answer)
+
+    assert RawAnswer(200, b"[]").peek_oldest_datetime() is None
+    assert RawAnswer(200, b"[]").count_locations() == 0
+    with pytest.raises(ValueError):
+        RawAnswer(200, b'[{"datetime": null}]').peek_oldest_datetime()
@@ -0,0 +1,194 @@
+"""Test retries of queries failing with transient errors."""
+
+import asyncio
+
+import pytest
+
+from gps_tracker.client.asynchronous import AsyncClient
+from gps_tracker.client.config import Config
+from gps_tracker.client.exceptions import (
+    ApiConnectionError,
+    FailedQuery,
+    ForbiddenQuery,
+    HttpException,
+    ServiceUnavailable,
+    TooManyRequests,
+)
+from gps_tracker.client.retry import RetryPolicy
+from gps_tracker.client.synchronous import Client
+from tests.helpers import AiohttpMock, RequestsMock
+
+TEST_URL = "https://labs.invoxia.io/test/"
+
+
+@pytest.fixture(name="retry_config")
+def fixture_retry_config(config_dummy: Config):
+    """Form a configuration retrying queries without delay."""
+    return Config(
+        config_dummy.username,
+        config_dummy.password,
+        retry=RetryPolicy(max_attempts=3, base_delay=0),
+    )
+
+
+def test_error_classification():
+    """Test that transient HTTP errors are registered as retryable."""
+    assert HttpException.get(429) is TooManyRequests
+    assert HttpException.get(503) is ServiceUnavailable
+    assert issubclass(ServiceUnavailable, FailedQuery)
+    assert ServiceUnavailable.retryable
+    assert ApiConnectionError.retryable
+    assert not ForbiddenQuery.retryable
+    assert not FailedQuery.retryable
+
+
+def test_policy_delays():
+    """Test exponential delays, capped and jittered."""
+    policy = RetryPolicy(base_delay=1, max_delay=5, jitter=False)
+    assert [policy.delay(attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+    assert all(0 <= policy.delay(3) <= 5 for _ in range(100))
+
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+def test_policy_next_delay():
+    """Test the conditions stopping retries."""
+    policy = RetryPolicy(max_attempts=3, base_delay=1, max_elapsed=10, jitter=False)
+    assert policy.next_delay(ServiceUnavailable(), 0, elapsed=0) == 1
+    assert policy.next_delay(ApiConnectionError(), 1, elapsed=0) == 2
+    assert policy.next_delay(ServiceUnavailable(), 2, elapsed=0) is None
+    assert policy.next_delay(ServiceUnavailable(), 1, elapsed=9) is None
+    assert policy.next_delay(ForbiddenQuery(), 0, elapsed=0) is None
+
+
+def test_sync_retry(retry_config: Config):
+    """Test that transient errors are retried by the synchronous client."""
+    client = Client(retry_config)
+
+    mock = RequestsMock("503_test.json", "200_test.json")
+    with mock:
+        assert client._query(TEST_URL) == {"status": "ok"}
+    assert mock.context.call_count == 2
+
+    mock = RequestsMock(
+        "404_test_except-SyncClientConnectionError.json", "200_test.json"
+    )
+    with mock:
+        assert client._query(TEST_URL) == {"status": "ok"}
+    assert mock.context.call_count == 2
+
+    mock = RequestsMock("503_test.json")
+    with mock:
+        with pytest.raises(ServiceUnavailable):
+            client._query(TEST_URL)
+    assert mock.context.call_count == 3
+
+    mock = RequestsMock("404_test.json")
+    with mock:
+        with pytest.raises(FailedQuery):
+            client._query(TEST_URL)
+    assert mock.context.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_async_retry(retry_config: Config):
+    """Test that transient errors are retried by the asynchronous client."""
+    async with AsyncClient(retry_config) as client:
+        with AiohttpMock("503_test.json", "200_test.json"):
+            assert await client._query(TEST_URL) == {"status": "ok"}
+        assert client.stats.requests == 2
+
+        with AiohttpMock(
+            "404_test_except-AsyncClientConnectionError.json", "200_test.json"
+        ):
+            assert await client._query(TEST_URL) == {"status": "ok"}
+        assert client.stats.requests == 4
+
+        with AiohttpMock("503_test.json", "503_test.json", "503_test.json"):
+            with pytest.raises(ServiceUnavailable):
+                await client._query(TEST_URL)
+        assert client.stats.requests == 7
+
+
+def test_sync_resume_locations(sync_client: Client, tracker):
+    """Test resuming the extraction of locations after a failure."""
+    with RequestsMock(
+        "200_tracker_data_deviceid-878858.json",
+        "503_tracker_data_page2_deviceid-878858.json",
+    ):
+        with pytest.raises(ServiceUnavailable) as exc_info:
+            sync_client.get_locations(tracker, max_count=100)
+
+    err = exc_info.value
+    assert len(err.partial_locations) == 68
+    assert err.resume_not_after.timestamp() == 1572971544
+
+    with RequestsMock(
+        "200_tracker_data_page2_deviceid-878858.json",
+        "200_tracker_data_page3_deviceid-878858.json",
+    ):
+        locations = sync_client.get_locations(
+            tracker,
+            not_after=err.resume_not_after,
+            max_count=100 - len(err.partial_locations),
+        )
+
+    assert len(locations) == 3
+    assert locations[-1].datetime.timestamp() == 1572602400
+
+
+@pytest.mark.asyncio
+async def test_async_resume_locations(async_client: AsyncClient, tracker):
+    """Test resuming the extraction of locations after a failure."""
+    with AiohttpMock(
+        "200_tracker_data_deviceid-878858.json",
+        "503_tracker_data_page2_deviceid-878858.json",
+    ):
+        with pytest.raises(ServiceUnavailable) as exc_info:
+            await async_client.get_locations(tracker, max_count=100)
+
+    err = exc_info.value
+    assert len(err.partial_locations) == 68
+    assert err.resume_not_after.timestamp() == 1572971544
+
+    with AiohttpMock(
+        "200_tracker_data_page2_deviceid-878858.json",
+        "200_tracker_data_page3_deviceid-878858.json",
+    ):
+        locations = await async_client.get_locations(
+            tracker,
+            not_after=err.resume_not_after,
+            max_count=100 - len(err.partial_locations),
+        )
+
+    assert len(locations) == 3
+
+
+@pytest.mark.asyncio
+async def test_async_resume_coalesced_locations(async_client: AsyncClient, tracker):
+    """Test that callers sharing a failed query get their own exception."""
+    with AiohttpMock(
+        "200_tracker_data_deviceid-878858.json",
+        "503_tracker_data_page2_deviceid-878858.json",
+    ):
+        errors = await asyncio.gather(
+            async_client.get_locations(tracker, max_count=100),
+            async_client.get_locations(tracker, max_count=10),
+            async_client.get_locations(tracker, max_count=100),
+            return_exceptions=True,
+        )
+
+    assert async_client.stats.coalesced == 3
+    first, locations, second = errors
+    assert len(locations) == 10
+    assert isinstance(first, ServiceUnavailable)
+    assert isinstance(second, ServiceUnavailable)
+    assert first is not second
+    assert first.partial_locations is not second.partial_locations
+    assert len(first.partial_locations) == len(second.partial_locations) == 68
+    assert first.resume_not_after.timestamp() == 1572971544
+    assert first.__cause__.__cause__ is second.__cause__.__cause__
+    assert first.__cause__.__cause__.partial_locations is None
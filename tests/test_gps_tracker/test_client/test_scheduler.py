@@ -0,0 +1,148 @@
+"""Test polling of trackers at a cadence adapted to their mode."""
+
+import asyncio
+import json
+
+import pytest
+
+from gps_tracker.client.asynchronous import AsyncClient
+from gps_tracker.client.config import Config
+from gps_tracker.client.datatypes import Device, TrackerMode
+from gps_tracker.client.scheduler import PollingScheduler, TrackerUpdate
+from tests.helpers import AiohttpMock, FakeTimer, get_fixture_path
+
+
+@pytest.mark.asyncio
+async def test_intervals(async_client: AsyncClient):
+    """Test that polling intervals depend on tracker mode."""
+    with AiohttpMock("200_devices_type-tracker.json"):
+        tracker = (await async_client.get_trackers())[0]
+
+    scheduler = PollingScheduler(async_client, trackers=[tracker])
+    assert tracker.tracker_config.mode == TrackerMode.AIRPLANE
+    assert scheduler.get_interval(tracker) == 3600
+
+    with get_fixture_path("200_devices_type-tracker.json").open() as fp:
+        data = json.loads(json.load(fp)["content"])[0]
+    data["tracker_config"]["mode"] = TrackerMode.LOST.value
+    lost_tracker = Device.get(data)
+    assert scheduler.get_interval(lost_tracker) == 30
+
+    scheduler = PollingScheduler(
+        async_client, intervals={TrackerMode.LOST: 5}, default_interval=42
+    )
+    assert scheduler.get_interval(lost_tracker) == 5
+    scheduler.intervals.pop(TrackerMode.AIRPLANE)
+    assert scheduler.get_interval(tracker) == 42
+
+
+@pytest.mark.asyncio
+async def test_polling(config_dummy: Config):
+    """Test that only new locations and status changes are published."""
+    timer = FakeTimer()
+    async with AsyncClient(config_dummy) as client:
+        scheduler = PollingScheduler(client, timer=timer)
+        queue = scheduler.updates()
+        received = []
+        scheduler.subscribe(received.append)
+
+        # First poll retrieves trackers, status and last location.
+        with AiohttpMock(
+            "200_devices_type-tracker.json",
+            "200_tracker_status_deviceid-878858.json",
+            "200_tracker_data_deviceid-878858.json",
+        ):
+            assert await scheduler.run_once() == 3600
+        update: TrackerUpdate = queue.get_nowait()
+        assert update.error is None
+        assert update.status.battery == 58
+        assert len(update.locations) == 1
+        assert received == [update]
+
+        # Nothing is due before the polling interval.
+        timer.now = 1000
+        requests = client.stats.requests
+        assert await scheduler.run_once() == 2600
+        assert client.stats.requests == requests
+
+        # Already received locations are filtered out.
+        timer.now = 3600
+        with AiohttpMock(
+            "200_tracker_data_since-1573081065_deviceid-878858.json",
+            "200_tracker_data_since-1573081065_page2_deviceid-878858.json",
+            "200_tracker_status_deviceid-878858.json",
+        ):
+            assert await scheduler.run_once() == 3600
+        update = queue.get_nowait()
+        assert [str(loc.uuid) for loc in update.locations] == [
+            "5f0c7a1e-2b3d-4e8f-9a6b-7c1d2e3f4a5b"
+        ]
+
+        # Nothing is published without new location nor status change.
+        timer.now = 7200
+        with AiohttpMock(
+            "200_tracker_data_since-1573120800_deviceid-878858.json",
+            "200_tracker_data_since-1573120800_page2_deviceid-878858.json",
+            "200_tracker_status_deviceid-878858.json",
+        ):
+            await scheduler.run_once()
+        assert queue.empty()
+        assert len(received) == 2
+
+        # Failures are published.
+        timer.now = 10800
+        with AiohttpMock("404_test.json"):
+            await scheduler.run_once()
+        assert queue.get_nowait().error is not None
+
+
+@pytest.mark.asyncio
+async def test_start_stop(async_client: AsyncClient):
+    """Test running the scheduler in background."""
+    scheduler = PollingScheduler(async_client, trackers=[])
+    task = scheduler.start()
+    assert scheduler.start() is task
+    await asyncio.sleep(0)
+    await scheduler.stop()
+    assert task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_run_failures(config_dummy: Config, caplog):
+    """Test that failures are logged without stopping the background task."""
+
+    def failing_callback(update: TrackerUpdate):
+        raise RuntimeError(f"Cannot handle {update}")
+
+    async def wait_for(condition):
+        for _ in range(100):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+
+    timer = FakeTimer()
+    async with AsyncClient(config_dummy) as client:
+        scheduler = PollingScheduler(client, retry_interval=0, timer=timer)
+        received = []
+        scheduler.subscribe(failing_callback)
+        scheduler.subscribe(received.append)
+
+        # Trackers cannot be retrieved: polling is attempted again.
+        with AiohttpMock("404_test.json"):
+            task = scheduler.start()
+            await wait_for(lambda: len(caplog.records) > 1)
+        assert "Polling of trackers failed" in caplog.records[0].message
+        assert not task.done()
+
+        # A failing subscriber does not prevent the others to get updates.
+        with AiohttpMock(
+            "200_devices_type-tracker.json",
+            "200_tracker_status_deviceid-878858.json",
+            "200_tracker_data_deviceid-878858.json",
+        ):
+            await wait_for(lambda: received)
+        assert len(received) == 1
+        assert "Subscriber" in caplog.records[-1].message
+        assert not task.done()
+
+        await scheduler.stop()
@@ -0,0 +1,156 @@
+"""Test local storage of tracker locations."""
+
+import datetime
+
+import pytest
+
+from gps_tracker.client.asynchronous import AsyncClient
+from gps_tracker.client.config import Config
+from gps_tracker.client.datatypes import TrackerData, form
+from gps_tracker.client.exceptions import ServiceUnavailable
+from gps_tracker.client.store import LocationStore
+from gps_tracker.client.synchronous import Client
+from tests.helpers import AiohttpMock, RequestsMock
+
+
+def test_store_locations(tmp_path, rows):
+    """Test storing and reading locations."""
+    path = str(tmp_path.joinpath("locations.db"))
+    store = LocationStore(path)
+
+    assert store.newest(878858) is None
+    assert store.add(878858, rows) == len(rows)
+    assert store.add(878858, rows[:10]) == 0
+    store.close()
+
+    store = LocationStore(path)
+    expected = sorted(
+        (form(TrackerData, row) for row in rows),
+        key=lambda loc: loc.datetime,
+        reverse=True,
+    )
+    assert store.get_locations(878858) == expected
+    assert store.get_locations(111111) == []
+    assert store.newest(878858) == expected[0].datetime
+
+    not_before = datetime.datetime(2019, 11, 8, tzinfo=datetime.timezone.utc)
+    not_after = datetime.datetime(2019, 11, 10, tzinfo=datetime.timezone.utc)
+    assert (
+        store.get_locations(
+            878858, not_before=not_before, not_after=not_after, max_count=5
+        )
+        == [loc for loc in expected if not_before <= loc.datetime <= not_after][:5]
+    )
+    store.close()
+
+
+def test_sync_locations(config_dummy: Config):
+    """Test incremental synchronization of locations with synchronous client."""
+    with pytest.raises(ValueError):
+        Client(config_dummy).sync_locations(None)
+
+    config = Config(
+        config_dummy.username, config_dummy.password, location_store=LocationStore()
+    )
+    client = Client(config)
+
+    with RequestsMock("200_devices_type-tracker.json"):
+        tracker = client.get_trackers()[0]
+
+    with RequestsMock(
+        "200_tracker_data_deviceid-878858.json",
+        "200_tracker_data_page2_deviceid-878858.json",
+        "200_tracker_data_page3_deviceid-878858.json",
+    ):
+        assert client.sync_locations(tracker) == 71
+
+    with RequestsMock(
+        "200_tracker_data_since_deviceid-878858.json",
+        "200_tracker_data_since_page2_deviceid-878858.json",
+    ):
+        assert client.sync_locations(tracker) == 1
+
+    locations = config.location_store.get_locations(tracker.id)
+    assert len(locations) == 72
+    assert locations[0].datetime.isoformat() == "2019-11-12T07:02:11.120000+00:00"
+
+
+def test_sync_locations_failure(config_dummy: Config):
+    """Test that a failed synchronization leaves no gap in stored locations."""
+    config = Config(
+        config_dummy.username, config_dummy.password, location_store=LocationStore()
+    )
+    client = Client(config)
+
+    with RequestsMock("200_devices_type-tracker.json"):
+        tracker = client.get_trackers()[0]
+
+    with RequestsMock(
+        "200_tracker_data_deviceid-878858.json",
+        "503_tracker_data_page2_deviceid-878858.json",
+    ):
+        with pytest.raises(ServiceUnavailable):
+            client.sync_locations(tracker)
+    assert config.location_store.newest(tracker.id) is None
+
+    with RequestsMock(
+        "200_tracker_data_deviceid-878858.json",
+        "200_tracker_data_page2_deviceid-878858.json",
+        "200_tracker_data_page3_deviceid-878858.json",
+    ):
+        assert client.sync_locations(tracker) == 71
+    assert len(config.location_store.get_locations(tracker.id)) == 71
+
+
+@pytest.mark.asyncio
+async def test_sync_locations_async(config_dummy: Config):
+    """Test incremental synchronization of locations with asynchronous client."""
+    config = Config(
+        config_dummy.username, config_dummy.password, location_store=LocationStore()
+    )
+    async with AsyncClient(config) as client:
+        with AiohttpMock("200_devices_type-tracker.json"):
+            tracker = (await client.get_trackers())[0]
+
+        with AiohttpMock(
+            "200_tracker_data_deviceid-878858.json",
+            "200_tracker_data_page2_deviceid-878858.json",
+            "200_tracker_data_page3_deviceid-878858.json",
+        ):
+            assert await client.sync_locations(tracker) == 71
+
+        with AiohttpMock(
+            "200_tracker_data_since_deviceid-878858.json",
+            "200_tracker_data_since_page2_deviceid-878858.json",
+        ):
+            assert await client.sync_locations(tracker) == 1
+
+    assert len(config.location_store.get_locations(tracker.id)) == 72
+
+
+@pytest.mark.asyncio
+async def test_sync_locations_failure_async(config_dummy: Config):
+    """Test that a failed asynchronous synchronization leaves no gap."""
+    config = Config(
+        config_dummy.username, config_dummy.password, location_store=LocationStore()
+    )
+    async with AsyncClient(config) as client:
+        with AiohttpMock("200_devices_type-tracker.json"):
+            tracker = (await client.get_trackers())[0]
+
+        with AiohttpMock(
+            "200_tracker_data_deviceid-878858.json",
+            "503_tracker_data_page2_deviceid-878858.json",
+        ):
+            with pytest.raises(ServiceUnavailable):
+                await client.sync_locations(tracker)
+        assert config.location_store.newest(tracker.id) is None
+
+        with AiohttpMock(
+            "200_tracker_data_deviceid-878858.json",
+            "200_tracker_data_page2_deviceid-878858.json",
+            "200_tracker_data_page3_deviceid-878858.json",
+        ):
+            assert await client.sync_locations(tracker) == 71
+
+    assert len(config.location_store.get_locations(tracker.id)) == 71
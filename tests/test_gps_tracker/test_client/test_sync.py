@@ -1,6 +1,9 @@
 """Test synchronous client."""
 
+import copy
 import datetime
+import itertools
+import json
 from typing import List
 from unittest.mock import patch
 
@@ -9,7 +12,8 @@ import requests
 
 import gps_tracker
 from gps_tracker.client.config import Config
-from gps_tracker.client.datatypes import Device, User
+from gps_tracker.client.datatypes import Device, LazyTrackerData, User
+from gps_tracker.client.decoding import get_json_decoder
 from gps_tracker.client.synchronous import Client
 from tests.helpers import RequestsMock
 
@@ -22,6 +26,22 @@ def test_client_init():
     Client(cfg)
 
 
+def test_client_pool_settings():
+    """Test that connection settings of the config are applied."""
+    cfg = Config("", "", pool_size=20, keepalive=0, connect_timeout=1, read_timeout=2)
+    client = Client(cfg)
+
+    adapter = client._session.get_adapter("https://labs.invoxia.io")
+    assert adapter._pool_maxsize == 20
+    assert not adapter._pool_block
+    assert client._session.headers["Connection"] == "close"
+
+    mock = RequestsMock("200_users.json")
+    with mock:
+        client.get_users()
+    assert mock.context.request_history[0].timeout == (1, 2)
+
+
 def test_get_users(sync_client: Client):
     """Test users getter."""
 
@@ -168,6 +188,27 @@ def test_page_not_found(sync_client: Client):
             sync_client._query("https://labs.invoxia.io/test/")
 
 
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+def test_json_decoder(backend):
+    """Test that answers are decoded with the decoder of the config."""
+    pytest.importorskip(backend)
+    decoded = []
+
+    def decoder(document):
+        decoded.append(document)
+        return get_json_decoder(backend)(document)
+
+    client = Client(Config("", "", json_decoder=decoder))
+    with RequestsMock("200_test.json"):
+        assert client._query("https://labs.invoxia.io/test/") == {"status": "ok"}
+    assert len(decoded) == 1
+
+    with RequestsMock("404_test.json"):
+        with pytest.raises(gps_tracker.client.exceptions.FailedQuery) as err:
+            client._query("https://labs.invoxia.io/test/")
+    assert err.value.json_answer is None
+
+
 def test_no_connection(sync_client: Client):
     """Test behaviour with no connection."""
 
@@ -176,6 +217,14 @@ def test_no_connection(sync_client: Client):
             sync_client._query("https://labs.invoxia.io/test/")
 
 
+def test_timeout(sync_client: Client):
+    """Test behaviour when the API does not answer in time."""
+
+    with RequestsMock("404_test_except-SyncReadTimeout.json"):
+        with pytest.raises(gps_tracker.client.exceptions.ApiConnectionError):
+            sync_client._query("https://labs.invoxia.io/test/")
+
+
 def test_answer_with_unexpected_field(sync_client: Client):
     """Test behaviour with unhandled field returned by API."""
     with RequestsMock("200_users_unknown-field.json"):
@@ -191,3 +240,148 @@ def test_answer_with_missing_field(sync_client: Client):
     with pytest.raises(gps_tracker.client.exceptions.UnknownAnswerScheme):
         with RequestsMock("200_users_missing-field.json"):
             sync_client.get_users()
+
+
+def test_get_multiple_locations(sync_client: Client):
+    """Test getting locations of several trackers in parallel threads."""
+
+    with RequestsMock("200_devices_type-tracker.json"):
+        trackers = sync_client.get_trackers()
+
+    tracker = trackers[0]
+    forbidden_tracker = copy.copy(tracker)
+    forbidden_tracker.id = 666666
+
+    with RequestsMock(
+        "200_tracker_data_deviceid-878858.json",
+        "403_tracker_data_deviceid-666666.json",
+    ):
+        locations = sync_client.get_multiple_locations(
+            [forbidden_tracker, tracker], max_concurrency=2
+        )
+
+    assert list(locations) == [666666, 878858]
+    assert len(locations[878858]) == 20
+    assert isinstance(locations[666666], gps_tracker.client.exceptions.ForbiddenQuery)
+
+    # An unexpected answer for one tracker does not interrupt the others.
+    with RequestsMock(
+        "200_tracker_data_deviceid-878858.json",
+        "200_tracker_data_no-datetime_deviceid-666666.json",
+    ):
+        locations = sync_client.get_multiple_locations([forbidden_tracker, tracker])
+
+    assert len(locations[878858]) == 20
+    assert isinstance(
+        locations[666666], gps_tracker.client.exceptions.UnknownAnswerScheme
+    )
+
+    with pytest.raises(ValueError):
+        sync_client.get_multiple_locations([tracker], max_concurrency=0)
+    with pytest.raises(ValueError):
+        sync_client.get_multiple_tracker_status([tracker, tracker])
+
+
+def test_get_multiple_tracker_status(sync_client: Client):
+    """Test getting status and config of several trackers in parallel threads."""
+
+    with RequestsMock("200_devices_type-tracker.json"):
+        trackers = sync_client.get_trackers()
+
+    tracker = trackers[0]
+    forbidden_tracker = copy.copy(tracker)
+    forbidden_tracker.id = 666666
+
+    with RequestsMock(
+        "200_tracker_status_deviceid-878858.json",
+        "403_tracker_status_deviceid-666666.json",
+        "200_tracker_config_deviceid-878858.json",
+    ):
+        status = sync_client.get_multiple_tracker_status([tracker, forbidden_tracker])
+        config = sync_client.get_multiple_tracker_config([tracker])
+        assert status[878858] == sync_client.get_tracker_status(tracker)
+
+    assert list(status) == [878858, 666666]
+    assert isinstance(status[666666], gps_tracker.client.exceptions.ForbiddenQuery)
+    assert config[878858].mode is not None
+
+
+def test_iter_locations(sync_client: Client):
+    """Test iterating over all tracker locations page by page."""
+
+    with RequestsMock("200_devices_type-tracker.json"):
+        trackers = sync_client.get_trackers()
+
+    with RequestsMock(
+        "200_tracker_data_deviceid-878858.json",
+        "200_tracker_data_page2_deviceid-878858.json",
+        "200_tracker_data_page3_deviceid-878858.json",
+    ):
+        locations = list(sync_client.iter_locations(trackers[0]))
+
+    assert len(locations) == 71
+    assert locations[-1].datetime.timestamp() == 1572602400
+
+    mock = RequestsMock(
+        "200_tracker_data_deviceid-878858.json",
+        "200_tracker_data_page2_deviceid-878858.json",
+    )
+    with mock:
+        locations = list(itertools.islice(sync_client.iter_locations(trackers[0]), 5))
+
+    assert len(locations) == 5
+    assert mock.context.call_count == 1
+
+
+def test_get_locations_lazy(sync_client: Client):
+    """Test that lazy locations equal eagerly decoded ones."""
+
+    with RequestsMock("200_devices_type-tracker.json"):
+        trackers = sync_client.get_trackers()
+
+    with RequestsMock("200_tracker_data_deviceid-878858.json"):
+        eager = sync_client.get_locations(trackers[0])
+        lazy = sync_client.get_locations(trackers[0], lazy=True)
+
+    assert all(isinstance(location, LazyTrackerData) for location in lazy)
+    assert lazy == eager
+
+
+def test_iter_raw_locations(sync_client: Client):
+    """Test iterating over undecoded pages of tracker locations."""
+
+    with RequestsMock("200_devices_type-tracker.json"):
+        trackers = sync_client.get_trackers()
+
+    mock = RequestsMock(
+        "200_tracker_data_deviceid-878858.json",
+        "200_tracker_data_page2_deviceid-878858.json",
+        "200_tracker_data_page3_deviceid-878858.json",
+    )
+    with mock:
+        pages = list(sync_client.iter_raw_locations(trackers[0]))
+
+    assert [page.status for page in pages] == [200, 200]
+    assert sum(len(json.loads(page.content)) for page in pages) == 71
+    assert mock.context.call_count == 3
+
+    with RequestsMock("403_tracker_data_deviceid-878858.json"):
+        with pytest.raises(gps_tracker.client.exceptions.ForbiddenQuery):
+            list(sync_client.iter_raw_locations(trackers[0]))
+
+
+def test_get_locations_prefetch(sync_client: Client):
+    """Test getting locations while prefetching next pages."""
+
+    with RequestsMock("200_devices_type-tracker.json"):
+        trackers = sync_client.get_trackers()
+
+    with RequestsMock(
+        "200_tracker_data_deviceid-878858.json",
+        "200_tracker_data_page2_deviceid-878858.json",
+        "200_tracker_data_page3_deviceid-878858.json",
+    ):
+        locations = sync_client.get_locations(trackers[0], max_count=100, prefetch=True)
+
+    assert len(locations) == 71
+    assert locations[-1].datetime.timestamp() == 1572602400
@@ -0,0 +1,144 @@
+"""Test polling of new locations from watermarks."""
+
+import datetime
+import uuid
+
+import pytest
+
+from gps_tracker.client.asynchronous import AsyncClient
+from gps_tracker.client.config import Config
+from gps_tracker.client.datatypes import TrackerData
+from gps_tracker.client.synchronous import Client
+from gps_tracker.client.tail import FileWatermarkStore, Watermark, WatermarkStore
+from tests.helpers import AiohttpMock, RequestsMock
+
+NEW_UUID = uuid.UUID("5f0c7a1e-2b3d-4e8f-9a6b-7c1d2e3f4a5b")
+SAME_UUID = uuid.UUID("8c2e4b6a-1d3f-4a5b-8c7d-9e0f1a2b3c4d")
+
+
+def _location(date: str, uid: uuid.UUID) -> TrackerData:
+    """Form a location at a given date."""
+    return TrackerData(
+        datetime=date, lat=0, lng=0, method=2, pkt_drop=0, precision=10, uuid=uid
+    )
+
+
+def test_watermark():
+    """Test watermark updates and filtering of received locations."""
+    first = _location("2019-11-07T10:00:00.000000Z", uuid.uuid4())
+    same_time = _location("2019-11-07T10:00:00.000000Z", uuid.uuid4())
+    older = _location("2019-11-07T09:00:00.500000Z", uuid.uuid4())
+
+    assert Watermark.from_locations([]) is None
+    watermark = Watermark.from_locations([older, first])
+    assert watermark.datetime == first.datetime
+    assert watermark.uuids == {first.uuid}
+    assert not watermark.is_new(first)
+    assert not watermark.is_new(older)
+    assert watermark.is_new(same_time)
+
+    watermark = Watermark.from_locations([same_time], previous=watermark)
+    assert watermark.uuids == {first.uuid, same_time.uuid}
+    assert Watermark.from_locations([older], previous=watermark) is watermark
+
+    partial = Watermark.from_locations([older])
+    assert partial.not_before == older.datetime.replace(microsecond=0)
+
+
+def test_file_store(tmp_path):
+    """Test that watermarks persist across store instances."""
+    path = str(tmp_path / "watermarks.json")
+    store = FileWatermarkStore(path)
+    assert store.get(1) is None
+
+    watermark = Watermark(
+        datetime.datetime(2019, 11, 7, 10, 0, 0, 123456, datetime.timezone.utc),
+        [NEW_UUID],
+    )
+    store.set(1, watermark)
+    assert FileWatermarkStore(path).get(1) == watermark
+
+
+def test_incomplete_store():
+    """Test that stores must define all methods to be created."""
+
+    class GetOnlyStore(WatermarkStore):  # pylint: disable=abstract-method
+        """Store without set method."""
+
+        def get(self, device_id: int):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnlyStore()
+
+
+def test_tail_locations(config_dummy: Config, tracker, tmp_path):
+    """Test that only new locations are returned by successive calls."""
+    path = str(tmp_path / "watermarks.json")
+    config = Config(
+        config_dummy.username,
+        config_dummy.password,
+        watermark_store=FileWatermarkStore(path),
+    )
+    client = Client(config)
+
+    with RequestsMock("200_tracker_data_deviceid-878858.json"):
+        locations = client.tail_locations(tracker, initial_count=1)
+    assert len(locations) == 1
+
+    # Restart with the persisted watermarks.
+    config.watermark_store = FileWatermarkStore(path)
+    client = Client(config)
+
+    mock = RequestsMock(
+        "200_tracker_data_since-1573081065_deviceid-878858.json",
+        "200_tracker_data_since-1573081065_page2_deviceid-878858.json",
+    )
+    with mock:
+        locations = client.tail_locations(tracker)
+    assert [loc.uuid for loc in locations] == [NEW_UUID]
+    # The second of the watermark is fully walked to find new locations.
+    assert mock.context.call_count == 2
+
+    with RequestsMock(
+        "200_tracker_data_since-1573120800_deviceid-878858.json",
+        "200_tracker_data_since-1573120800_page2_deviceid-878858.json",
+    ):
+        assert client.tail_locations(tracker) == []
+
+    # New locations of the watermark second are returned, even after seen ones.
+    with RequestsMock(
+        "200_tracker_data_since-1573120800_same-second_deviceid-878858.json",
+        "200_tracker_data_since-1573120800_page2_deviceid-878858.json",
+    ):
+        assert [loc.uuid for loc in client.tail_locations(tracker)] == [SAME_UUID]
+        assert client.tail_locations(tracker) == []
+
+
+@pytest.mark.asyncio
+async def test_tail_locations_async(config_dummy: Config, tracker):
+    """Test that only new locations are returned by successive calls."""
+    async with AsyncClient(config_dummy) as client:
+        with AiohttpMock("200_tracker_data_deviceid-878858.json"):
+            locations = await client.tail_locations(tracker, initial_count=1)
+        assert len(locations) == 1
+
+        with AiohttpMock(
+            "200_tracker_data_since-1573081065_deviceid-878858.json",
+            "200_tracker_data_since-1573081065_page2_deviceid-878858.json",
+        ):
+            locations = await client.tail_locations(tracker)
+        assert [loc.uuid for loc in locations] == [NEW_UUID]
+
+        with AiohttpMock(
+            "200_tracker_data_since-1573120800_deviceid-878858.json",
+            "200_tracker_data_since-1573120800_page2_deviceid-878858.json",
+        ):
+            assert await client.tail_locations(tracker) == []
+
+        with AiohttpMock(
+            "200_tracker_data_since-1573120800_same-second_deviceid-878858.json",
+            "200_tracker_data_since-1573120800_page2_deviceid-878858.json",
+        ):
+            locations = await client.tail_locations(tracker)
+        assert [loc.uuid for loc in locations] == [SAME_UUID]
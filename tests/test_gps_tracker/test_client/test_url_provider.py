@@ -0,0 +1,84 @@
+"""Test forming of the API urls."""
+
+import pytest
+import yarl
+
+from gps_tracker.client.url_provider import UrlProvider
+
+API_URL = "https://labs.invoxia.io"
+
+
+def test_urls():
+    """Test the urls of each endpoint."""
+    provider = UrlProvider(API_URL)
+    assert provider.users() == f"{API_URL}/users/"
+    assert provider.user(3) == f"{API_URL}/users/3/"
+    assert provider.devices() == f"{API_URL}/devices/"
+    assert provider.devices("tracker") == f"{API_URL}/devices/?type=tracker"
+    assert provider.devices("tracker") is provider.devices("tracker")
+    assert provider.device(42) == f"{API_URL}/devices/42/"
+    assert provider.tracker_status(42) == f"{API_URL}/devices/42/tracker_status/"
+    assert provider.tracker_config(42) == f"{API_URL}/devices/42/tracker_config/"
+
+    with pytest.raises(KeyError):
+        provider.devices("tracker&type=android")
+
+
+@pytest.mark.parametrize(
+    "not_before,not_after,query",
+    [
+        (None, None, ""),
+        (1572602400, None, "?timestamp=1572602400"),
+        (None, 1572971544, "?timestamp_max=1572971544"),
+        (1572602400, 1572971544, "?timestamp=1572602400&timestamp_max=1572971544"),
+    ],
+)
+def test_locations_url(not_before, not_after, query):
+    """Test the query arguments of the locations url."""
+    provider = UrlProvider(API_URL)
+    assert (
+        provider.locations(42, not_before=not_before, not_after=not_after)
+        == f"{API_URL}/devices/42/tracker_data/{query}"
+    )
+
+
+def test_api_url_change():
+    """Test that changing the API url changes all urls."""
+    provider = UrlProvider(API_URL)
+    provider.devices("tracker")
+    provider.api_url = "http://localhost"
+    assert provider.device(42) == "http://localhost/devices/42/"
+    assert provider.devices("tracker") == "http://localhost/devices/?type=tracker"
+
+
+@pytest.mark.parametrize(
+    "api_url,expected",
+    [
+        ("https://labs.invoxia.io/", API_URL),
+        ("http://127.0.0.1:8080", "http://127.0.0.1:8080"),
+        ("https://exämple.com/a b", "https://xn--exmple-cua.com/a%20b"),
+    ],
+)
+def test_api_url_encoding(api_url, expected):
+    """Test that the API url is encoded once when set."""
+    provider = UrlProvider(api_url)
+    assert provider.api_url == expected
+    assert str(provider.as_yarl(provider.users())) == f"{expected}/users/"
+
+
+@pytest.mark.parametrize(
+    "api_url", ["labs.invoxia.io", "://", "https://", "ftp://x.io"]
+)
+def test_invalid_api_url(api_url):
+    """Test that invalid API urls are rejected when set."""
+    with pytest.raises(ValueError):
+        UrlProvider(api_url)
+
+
+def test_as_yarl():
+    """Test the conversion of urls to yarl.URL."""
+    provider = UrlProvider(API_URL)
+    url = provider.as_yarl(provider.locations(42, not_before=1572602400))
+    assert isinstance(url, yarl.URL)
+    assert url.query["timestamp"] == "1572602400"
+    assert str(url) == provider.locations(42, not_before=1572602400)